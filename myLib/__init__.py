@@ -0,0 +1,12 @@
+"""
+Trading library: brokers, indicators, strategies and candle storage.
+
+Subpackages are imported on first access, so `import myLib` is cheap and
+does no I/O.
+"""
+
+from ._lazy import lazy_exports
+
+__all__ = ["brokers", "indicators", "storage", "strategies"]
+
+__getattr__, __dir__ = lazy_exports(__name__, {name: f".{name}" for name in __all__})
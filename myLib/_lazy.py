@@ -0,0 +1,43 @@
+"""Lazy package attributes (PEP 562)."""
+
+import importlib
+import sys
+from typing import Callable
+
+__all__ = ["lazy_exports"]
+
+
+def lazy_exports(
+    package: str, exports: dict[str, str]
+) -> tuple[Callable[[str], object], Callable[[], list[str]]]:
+    """
+    Returns module-level __getattr__ and __dir__ importing exports on first access.
+
+    Heavy submodules (network clients, pandas, numba) are imported only when
+    one of their names is used, the imported value is stored in the package
+    namespace, so later lookups do not reach __getattr__.
+
+    Args:
+        package: __name__ of the package
+        exports: Relative module by exported name, for example {"Alor": ".alor"};
+          a name equal to its module, like {"brokers": ".brokers"}, exports
+          the submodule itself
+
+    Example:
+        __getattr__, __dir__ = lazy_exports(__name__, {"Alor": ".alor"})
+    """
+    namespace = sys.modules[package].__dict__
+
+    def __getattr__(name: str) -> object:
+        module_name = exports.get(name)
+        if module_name is None:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+        module = importlib.import_module(module_name, package)
+        value = module if module_name == f".{name}" else getattr(module, name)
+        namespace[name] = value
+        return value
+
+    def __dir__() -> list[str]:
+        return sorted(set(namespace) | set(exports))
+
+    return __getattr__, __dir__
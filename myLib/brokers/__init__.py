@@ -1,10 +1,20 @@
-"""Main module for all brokers."""
+"""
+Main module for all brokers.
 
-from .alor import Alor
-from .demo import DemoBroker
+The broker types are imported eagerly, the brokers themselves on first
+access: Alor and Tinkoff pull in HTTP and websocket clients, strategies and
+offline backtests only need the types and DemoBroker.
+"""
+
+from typing import TYPE_CHECKING
+from myLib._lazy import lazy_exports
 from .types.broker import BrokerAbstractClass
 from .types.orders import LimitOrderTypedDict, MarketOrderTypedDict, OrderType
-from .tinkoff import Tinkoff
+
+if TYPE_CHECKING:
+    from .alor import Alor
+    from .demo import DemoBroker
+    from .tinkoff import Tinkoff, AsyncTinkoff
 
 __all__ = [
     "BrokerAbstractClass",
@@ -14,4 +24,15 @@ __all__ = [
     "Alor",
     "DemoBroker",
     "Tinkoff",
+    "AsyncTinkoff",
 ]
+
+__getattr__, __dir__ = lazy_exports(
+    __name__,
+    {
+        "Alor": ".alor",
+        "DemoBroker": ".demo",
+        "Tinkoff": ".tinkoff",
+        "AsyncTinkoff": ".tinkoff",
+    },
+)
@@ -4,9 +4,6 @@ import logging
 import os
 from datetime import datetime
 import requests
-from dotenv import load_dotenv
-
-load_dotenv()
 
 logger = logging.getLogger("AlorToken")
 
@@ -16,6 +16,7 @@ Example usage:
 import logging
 import os
 from typing import Dict, Optional, Union
+from dotenv import load_dotenv
 
 
 from .api import get_access_token
@@ -28,6 +29,7 @@ class AlorToken:
 
     def get_token(self) -> Optional[Dict[str, Union[str, int]]]:
         """Get a JWT token from ALOR by using refresh token."""
+        load_dotenv()  # Read .env on first use, not on import
         if not os.getenv("ALOR_TOKEN") or not os.getenv("ALOR_URL_OAUTH"):
             logger.error("ALOR configuration is missing or incomplete.")
             return None
@@ -1,16 +1,20 @@
 """This class manages API for Alor brocker."""
 
+import asyncio
 import json
 import logging
 import os
 import uuid
-from datetime import datetime, timedelta, timezone
+from contextlib import AsyncExitStack
+from datetime import datetime
+from typing import AsyncIterator
 import pandas as pd
 import websockets
 from dotenv import load_dotenv
 from ..__token import AlorToken
-
-load_dotenv()
+from .bars import BarsBuffer
+from .session import BarsSession, bars_request
+from .stream import BarsStream
 
 logger = logging.getLogger("AlorAPI")
 
@@ -23,10 +27,16 @@ class AlorAPI:
     """
 
     def __init__(self):
-        token = AlorToken()  # Load token service
+        load_dotenv()  # Read .env on construction, not on import
+        self._token = AlorToken()  # Load token service
 
         self.ws_url = os.getenv("ALOR_WEBSOCKET_URL")  # Get websocket url
-        self.access_token = token.get_token()["access_token"]  # Get access token
+        self.access_token = self._token.get_token()["access_token"]  # Get access token
+
+    def refresh_access_token(self) -> str:
+        """Requests a new access token, the previous one expires after a while."""
+        self.access_token = self._token.get_token()["access_token"]
+        return self.access_token
 
     async def get_ticker_data(
         self, ticker: str, start_date: datetime, tf: int
@@ -37,24 +47,12 @@ class AlorAPI:
         bar data for the specified ticker and timeframe, and returns it as a
         Pandas DataFrame.
         """
-        df = pd.DataFrame(
-            columns=["TICKER", "DATE", "OPEN", "HIGH", "LOW", "CLOSE", "VOLUME"],
-        )  # Create quotes DataFrame
+        bars = BarsBuffer(ticker)  # Collect quotes, the DataFrame is built once
 
         async with websockets.connect(self.ws_url) as websocket:  # connect to websocket
-            message = {
-                "opcode": "BarsGetAndSubscribe",
-                "code": ticker,
-                "tf": tf,
-                "from": start_date.timestamp(),
-                "delayed": False,
-                "skipHistory": False,
-                "exchange": "MOEX",
-                "format": "Simple",
-                "frequency": 100,
-                "guid": uuid.uuid4().hex,
-                "token": self.access_token,
-            }
+            message = bars_request(
+                ticker, start_date, tf, uuid.uuid4().hex, self.access_token
+            )
             await websocket.send(json.dumps(message))  # send message
             # receive response
             while True:
@@ -67,27 +65,81 @@ class AlorAPI:
                     if (
                         "httpCode" in response_dict
                     ):  # check if response contains 'httpCode'
-                        return df  # return responses because httpCode is last field in response
-
-                    json_item = json.loads(response)["data"]  # convert item to json
-                    date = (
-                        datetime.fromtimestamp(json_item["time"], timezone.utc)
-                        .astimezone(timezone(offset=timedelta(hours=3)))
-                        .strftime("%Y%m%d %H:%M:%S")
-                    )  # convert timestamp to datetime, then to local time (UTC+3)
-
-                    df.loc[len(df)] = [
-                        ticker,
-                        date,
-                        json_item["open"],
-                        json_item["high"],
-                        json_item["low"],
-                        json_item["close"],
-                        json_item["volume"],
-                    ]  # add row to df
+                        return bars.to_frame()  # httpCode is last field in response
+
+                    bars.add(response_dict["data"])  # add bar to buffer
 
                 except websockets.ConnectionClosed as e:
                     logger.error("WebSocket connection closed: %s", e)
                     break
 
-        return df
+        return bars.to_frame()
+
+    async def iter_tickers_data(
+        self,
+        tickers: list[str],
+        start_date: datetime,
+        tf: int,
+        connections: int = 1,
+        max_concurrency: int = 10,
+    ) -> AsyncIterator[tuple[str, pd.DataFrame]]:
+        """Retrieves data of many tickers over shared WebSocket connections.
+
+        Requests are spread over the connections and answers are routed by
+        guid, so tickers download concurrently instead of one connection each.
+
+        Args:
+            tickers: Tickers to download
+            start_date: Start of the history
+            tf: Timeframe in seconds
+            connections: Number of WebSocket connections to open
+            max_concurrency: Maximum number of requests in flight
+
+        Yields:
+            tuple[str, pd.DataFrame]: Ticker and its quotes, in order of completion
+        """
+        if not tickers:
+            return
+
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async with AsyncExitStack() as stack:
+            sessions = []
+            for _ in range(min(connections, len(tickers))):
+                websocket = await stack.enter_async_context(
+                    websockets.connect(self.ws_url)
+                )
+                session = BarsSession(websocket, self.access_token)
+                stack.push_async_callback(session.close)
+                sessions.append(session)
+
+            async def fetch(number: int, ticker: str) -> tuple[str, pd.DataFrame]:
+                async with semaphore:
+                    session = sessions[number % len(sessions)]
+                    return ticker, await session.get_bars(ticker, start_date, tf)
+
+            tasks = [
+                asyncio.create_task(fetch(number, ticker))
+                for number, ticker in enumerate(tickers)
+            ]
+            try:
+                for task in asyncio.as_completed(tasks):
+                    yield await task
+            finally:
+                for task in tasks:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+
+    def stream_bars(
+        self, ticker: str, tf: int, start_date: datetime | None = None
+    ) -> BarsStream:
+        """Returns a live async iterator of completed bars of the ticker.
+
+        Args:
+            ticker: Ticker to subscribe to
+            tf: Timeframe in seconds
+            start_date: First bar to yield, None starts from the bar that is forming now
+        """
+        return BarsStream(
+            self.ws_url, self.refresh_access_token, ticker, tf, start_date
+        )
@@ -0,0 +1,69 @@
+"""Buffering of Alor bars received over the websocket."""
+
+from datetime import datetime, timedelta, timezone
+import numpy as np
+import pandas as pd
+
+# Alor bars are converted to Moscow time
+MSK = timezone(timedelta(hours=3))
+
+COLUMNS = ["TICKER", "DATE", "OPEN", "HIGH", "LOW", "CLOSE", "VOLUME"]
+
+
+class BarsBuffer:
+    """Collects bars in column lists and builds the quotes DataFrame once."""
+
+    def __init__(self, ticker: str):
+        self.ticker = ticker
+        self._time: list[int] = []
+        self._open: list[float] = []
+        self._high: list[float] = []
+        self._low: list[float] = []
+        self._close: list[float] = []
+        self._volume: list[int] = []
+
+    def __len__(self) -> int:
+        return len(self._time)
+
+    def add(self, bar: dict) -> None:
+        """Adds the 'data' object of a bar message."""
+        self._time.append(bar["time"])
+        self._open.append(bar["open"])
+        self._high.append(bar["high"])
+        self._low.append(bar["low"])
+        self._close.append(bar["close"])
+        self._volume.append(bar["volume"])
+
+    def to_frame(self) -> pd.DataFrame:
+        """Returns collected bars with DATE in local time (UTC+3) as '%Y%m%d %H:%M:%S'."""
+        # Shift UTC timestamps to local time before formatting, formatting
+        # naive datetimes is much faster than tz-aware ones
+        local_time = np.array(self._time, dtype=np.int64) + int(
+            MSK.utcoffset(None).total_seconds()
+        )
+        dates = pd.to_datetime(local_time, unit="s").strftime("%Y%m%d %H:%M:%S")
+        return pd.DataFrame(
+            {
+                "TICKER": np.full(len(self._time), self.ticker, dtype=object),
+                "DATE": np.asarray(dates, dtype=object),
+                "OPEN": np.array(self._open, dtype=np.float64),
+                "HIGH": np.array(self._high, dtype=np.float64),
+                "LOW": np.array(self._low, dtype=np.float64),
+                "CLOSE": np.array(self._close, dtype=np.float64),
+                "VOLUME": np.array(self._volume, dtype=np.int64),
+            },
+            columns=COLUMNS,
+        )
+
+
+def bar_to_candle(ticker: str, bar: dict) -> dict:
+    """Converts the 'data' object of a bar message to a row of the quotes DataFrame."""
+    return {
+        "TICKER": ticker,
+        "DATE": datetime.fromtimestamp(bar["time"], MSK).strftime("%Y%m%d %H:%M:%S"),
+        "OPEN": float(bar["open"]),
+        "HIGH": float(bar["high"]),
+        "LOW": float(bar["low"]),
+        "CLOSE": float(bar["close"]),
+        "VOLUME": int(bar["volume"]),
+    }
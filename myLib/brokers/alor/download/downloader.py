@@ -7,11 +7,26 @@ import pandas as pd
 
 
 from .api import AlorAPI
-
+from .stream import BarsStream
 
 logger = logging.getLogger("AlorDownloader")
 
-alor_api = AlorAPI()
+_alor_api: AlorAPI | None = None
+
+
+def get_alor_api() -> AlorAPI:
+    """Returns the shared AlorAPI, created on first use because it requests a token"""
+    global _alor_api
+    if _alor_api is None:
+        _alor_api = AlorAPI()
+    return _alor_api
+
+
+def __getattr__(name: str):
+    # alor_api used to be created at import, keep it importable
+    if name == "alor_api":
+        return get_alor_api()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 class AlorDownloader:
@@ -20,5 +35,39 @@ class AlorDownloader:
     def get_quotes(self, ticker: str, start_date: datetime, tf: int) -> pd.DataFrame:
         """method return"""
         return asyncio.run(
-            alor_api.get_ticker_data(ticker=ticker, start_date=start_date, tf=tf)
+            get_alor_api().get_ticker_data(ticker=ticker, start_date=start_date, tf=tf)
         )
+
+    def get_quotes_many(
+        self,
+        tickers: list[str],
+        start_date: datetime,
+        tf: int,
+        connections: int = 1,
+        max_concurrency: int = 10,
+    ) -> dict[str, pd.DataFrame]:
+        """Downloads quotes of many tickers concurrently over shared connections.
+
+        Returns:
+            dict[str, pd.DataFrame]: Quotes by ticker, in order of completion
+        """
+
+        async def collect() -> dict[str, pd.DataFrame]:
+            return {
+                ticker: df
+                async for ticker, df in get_alor_api().iter_tickers_data(
+                    tickers,
+                    start_date,
+                    tf,
+                    connections=connections,
+                    max_concurrency=max_concurrency,
+                )
+            }
+
+        return asyncio.run(collect())
+
+    def stream_bars(
+        self, ticker: str, tf: int, start_date: datetime | None = None
+    ) -> BarsStream:
+        """Returns a live async iterator of completed bars, see AlorAPI.stream_bars"""
+        return get_alor_api().stream_bars(ticker=ticker, tf=tf, start_date=start_date)
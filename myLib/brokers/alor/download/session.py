@@ -0,0 +1,120 @@
+"""Multiplexing of Alor bar requests over one websocket connection."""
+
+import asyncio
+import json
+import logging
+import uuid
+from datetime import datetime
+import pandas as pd
+import websockets
+from .bars import BarsBuffer
+
+logger = logging.getLogger("AlorBarsSession")
+
+
+def bars_request(
+    ticker: str, start_date: datetime, tf: int, guid: str, token: str
+) -> dict:
+    """Returns a BarsGetAndSubscribe message."""
+    return {
+        "opcode": "BarsGetAndSubscribe",
+        "code": ticker,
+        "tf": tf,
+        "from": start_date.timestamp(),
+        "delayed": False,
+        "skipHistory": False,
+        "exchange": "MOEX",
+        "format": "Simple",
+        "frequency": 100,
+        "guid": guid,
+        "token": token,
+    }
+
+
+class BarsSession:
+    """Sends many bar requests over one connection and routes the answers by guid.
+
+    Bar messages carry the 'guid' of their subscription, the final message of
+    the history carries it as 'requestGuid' together with 'httpCode'.
+    """
+
+    def __init__(self, websocket, access_token: str):
+        self._websocket = websocket
+        self._access_token = access_token
+        self._pending: dict[str, tuple[BarsBuffer, asyncio.Future]] = {}
+        self._reader = asyncio.create_task(self._read())
+
+    async def get_bars(
+        self, ticker: str, start_date: datetime, tf: int
+    ) -> pd.DataFrame:
+        """Returns the bar history of the ticker from start_date."""
+        guid = uuid.uuid4().hex
+        bars = BarsBuffer(ticker)
+        future = asyncio.get_running_loop().create_future()
+        self._pending[guid] = (bars, future)
+
+        try:
+            if self._reader.done():  # connection is already closed
+                return bars.to_frame()
+            await self._websocket.send(
+                json.dumps(
+                    bars_request(ticker, start_date, tf, guid, self._access_token)
+                )
+            )
+            return await future
+        except websockets.ConnectionClosed as e:
+            logger.error("WebSocket connection closed: %s", e)
+            return bars.to_frame()
+        finally:
+            del self._pending[guid]
+            await self._unsubscribe(guid)
+
+    async def close(self) -> None:
+        """Stops reading the connection."""
+        self._reader.cancel()
+        try:
+            await self._reader
+        except asyncio.CancelledError:
+            pass
+
+    async def _unsubscribe(self, guid: str) -> None:
+        """Stops live updates of a subscription, history is all we need."""
+        if self._reader.done():
+            return
+        try:
+            await self._websocket.send(
+                json.dumps(
+                    {"opcode": "unsubscribe", "guid": guid, "token": self._access_token}
+                )
+            )
+        except websockets.ConnectionClosed:
+            pass
+
+    async def _read(self) -> None:
+        try:
+            async for response in self._websocket:
+                response_dict = json.loads(response)
+
+                if "httpCode" in response_dict:  # end of a history
+                    entry = self._pending.get(response_dict.get("requestGuid"))
+                    if entry is None or entry[1].done():
+                        continue  # unsubscribe answers and unknown requests
+                    bars, future = entry
+                    if response_dict["httpCode"] != 200:
+                        logger.error(
+                            "Request for %s failed: %s", bars.ticker, response_dict
+                        )
+                    future.set_result(bars.to_frame())
+                    continue
+
+                entry = self._pending.get(response_dict.get("guid"))
+                if entry is not None and not entry[1].done():
+                    entry[0].add(response_dict["data"])  # add bar to buffer
+
+        except websockets.ConnectionClosed as e:
+            logger.error("WebSocket connection closed: %s", e)
+        finally:
+            # Return what was received to requests that are still waiting
+            for bars, future in self._pending.values():
+                if not future.done():
+                    future.set_result(bars.to_frame())
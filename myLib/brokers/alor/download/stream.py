@@ -0,0 +1,138 @@
+"""Live stream of completed Alor bars."""
+
+import asyncio
+import json
+import logging
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Callable
+import websockets
+from .bars import bar_to_candle
+from .session import bars_request
+
+logger = logging.getLogger("AlorBarsStream")
+
+
+class BarsStream:
+    """Async iterator of completed bars of one ticker.
+
+    BarsGetAndSubscribe keeps sending updates of the bar that is forming.
+    A bar is complete when a bar with a newer time arrives, only then it is
+    yielded. When the connection is closed the stream reconnects and requests
+    bars again from the bar that was forming, bars that were already yielded
+    are skipped. Every subscription is sent with a new access token, a
+    subscription the server refuses (an expired token) is sent again.
+
+    Example:
+        async for candle in alor_api.stream_bars("SBER", tf=300):
+            ...  # {"TICKER": "SBER", "DATE": "20250101 10:05:00", "OPEN": ...}
+    """
+
+    def __init__(
+        self,
+        ws_url: str,
+        get_access_token: Callable[[], str],
+        ticker: str,
+        tf: int,
+        start_date: datetime | None = None,
+        reconnect_delay: float = 1.0,
+        max_failures: int = 5,
+    ):
+        """
+        Args:
+            ws_url: Alor WebSocket url
+            get_access_token: Returns a valid Alor access token, it is called
+              for every subscription
+            ticker: Ticker to subscribe to
+            tf: Timeframe in seconds
+            start_date: First bar to yield, None starts from the bar that is forming now
+            reconnect_delay: Seconds to wait before reconnecting
+            max_failures: Refused subscriptions in a row before the stream
+              raises ConnectionError
+        """
+        self.ws_url = ws_url
+        self.get_access_token = get_access_token
+        self.ticker = ticker
+        self.tf = tf
+        self.reconnect_delay = reconnect_delay
+        self.max_failures = max_failures
+        if start_date is None:
+            start_date = datetime.now(timezone.utc) - timedelta(seconds=tf)
+        self._start_date = start_date
+        self._last_time: int | None = None  # time of the last yielded bar
+        self._forming: dict | None = None  # bar that is not complete yet
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        failures = 0  # refused subscriptions in a row
+        while True:
+            try:
+                async with websockets.connect(self.ws_url) as websocket:
+                    await websocket.send(
+                        json.dumps(
+                            bars_request(
+                                self.ticker,
+                                self._resume_date(),
+                                self.tf,
+                                uuid.uuid4().hex,
+                                self.get_access_token(),
+                            )
+                        )
+                    )
+                    async for response in websocket:
+                        response_dict = json.loads(response)
+                        if "httpCode" in response_dict:
+                            if response_dict["httpCode"] == 200:
+                                failures = 0
+                                continue  # end of the history, updates follow
+                            # No updates follow, subscribe again
+                            failures += 1
+                            logger.error(
+                                "Subscription to %s failed: %s",
+                                self.ticker,
+                                response_dict,
+                            )
+                            break
+
+                        completed = self._update(response_dict["data"])
+                        if completed is not None:
+                            yield bar_to_candle(self.ticker, completed)
+
+            except (
+                websockets.ConnectionClosed,
+                websockets.InvalidHandshake,
+                OSError,
+            ) as e:
+                logger.error("WebSocket connection closed: %s", e)
+
+            if failures >= self.max_failures:
+                raise ConnectionError(
+                    f"Subscription to {self.ticker} failed {failures} times in a row"
+                )
+            await asyncio.sleep(self.reconnect_delay)
+
+    def _update(self, bar: dict) -> dict | None:
+        """Stores a bar update and returns the bar it completed, if any."""
+        if self._last_time is not None and bar["time"] <= self._last_time:
+            return None  # repeated after reconnect
+
+        forming = self._forming
+        if forming is None or bar["time"] == forming["time"]:
+            self._forming = bar
+            return None
+        if bar["time"] < forming["time"]:
+            return None  # late update of a bar that was already replaced
+
+        self._forming = bar
+        self._last_time = forming["time"]
+        return forming
+
+    def _resume_date(self) -> datetime:
+        """Returns the date to request bars from."""
+        if self._forming is not None:
+            return datetime.fromtimestamp(self._forming["time"], timezone.utc)
+        if self._last_time is not None:
+            return datetime.fromtimestamp(self._last_time, timezone.utc)
+        return self._start_date
@@ -0,0 +1,88 @@
+"""Local stand-in for the Alor websocket API and recorded bars to replay."""
+
+import asyncio
+import json
+import numpy as np
+import websockets
+
+# 2024-01-01 10:00 in Moscow
+START_TIME = 1_704_092_400
+
+
+def recorded_bars(n: int, tf: int = 60, seed: int = 0) -> list[dict]:
+    """Bars as the 'data' objects of Alor 'Simple' bar messages"""
+    rng = np.random.default_rng(seed)
+    close = np.round(100 + np.cumsum(rng.normal(0, 0.2, n)), 2)
+    return [
+        {
+            "time": START_TIME + tf * i,
+            "open": float(close[i - 1] if i else close[0]),
+            "high": float(close[i] + 0.25),
+            "low": float(close[i] - 0.25),
+            "close": float(close[i]),
+            "volume": int(volume),
+        }
+        for i, volume in enumerate(rng.integers(1, 10_000, n))
+    ]
+
+
+class AlorStandIn:
+    """
+    Replays recorded bars the way the Alor websocket API sends them.
+
+    A BarsGetAndSubscribe request is answered with the bars of its ticker from
+    its 'from' time, tagged with its guid, and then the closing message with
+    'requestGuid' and 'httpCode'. Requests on one connection are answered
+    concurrently, so their bars are interleaved.
+    """
+
+    def __init__(self, bars: dict[str, list[dict]]) -> None:
+        self.bars = bars
+        self.connections = 0
+        self.requests: list[dict] = []
+
+    async def handler(self, websocket) -> None:
+        self.connections += 1
+        replays = []
+        try:
+            async for message in websocket:
+                request = json.loads(message)
+                self.requests.append(request)
+                if request["opcode"] == "BarsGetAndSubscribe":
+                    replays.append(asyncio.create_task(self.replay(websocket, request)))
+                else:
+                    await self.answer(websocket, request, 200)
+        except websockets.ConnectionClosed:
+            pass
+        finally:
+            for replay in replays:
+                replay.cancel()
+
+    async def replay(self, websocket, request: dict) -> None:
+        for bar in self.bars.get(request["code"], []):
+            if bar["time"] >= request["from"]:
+                await websocket.send(json.dumps({"data": bar, "guid": request["guid"]}))
+                await asyncio.sleep(0)  # let other requests send theirs
+        await self.answer(websocket, request, 200)
+
+    @staticmethod
+    async def answer(websocket, request: dict, http_code: int) -> None:
+        await websocket.send(
+            json.dumps(
+                {
+                    "requestGuid": request["guid"],
+                    "httpCode": http_code,
+                    "message": "Handled successfully" if http_code == 200 else "Error",
+                }
+            )
+        )
+
+
+class FakeToken:
+    """AlorToken without the OAuth request, every token is new: token-1, token-2, ..."""
+
+    issued = 0
+
+    def get_token(self) -> dict:
+        FakeToken.issued += 1
+        return {"access_token": f"token-{FakeToken.issued}", "created_at": 0}
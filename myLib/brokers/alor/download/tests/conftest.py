@@ -0,0 +1,34 @@
+"""Fixtures running the Alor stand-in on a local port."""
+
+from contextlib import asynccontextmanager
+import pytest
+import websockets
+from alor_stand_in import AlorStandIn, FakeToken
+from myLib.brokers.alor.download import api
+
+
+@pytest.fixture
+def serve():
+    """Returns serve(stand_in), an async context manager running it on a free port"""
+
+    @asynccontextmanager
+    async def serve(stand_in: AlorStandIn):
+        async with websockets.serve(
+            stand_in.handler, "127.0.0.1", 0, max_size=None
+        ) as server:
+            host, port = server.sockets[0].getsockname()[:2]
+            yield f"ws://{host}:{port}"
+
+    return serve
+
+
+@pytest.fixture
+def alor_api(monkeypatch):
+    """Returns a factory of AlorAPI connected to the given url"""
+    monkeypatch.setattr(api, "AlorToken", FakeToken)
+
+    def make(url: str) -> api.AlorAPI:
+        monkeypatch.setenv("ALOR_WEBSOCKET_URL", url)
+        return api.AlorAPI()
+
+    return make
@@ -0,0 +1,148 @@
+"""Live bar stream against the local Alor stand-in: reconnects, resume and refused tokens."""
+
+import asyncio
+import json
+from contextlib import aclosing
+from datetime import datetime, timezone
+import pytest
+from alor_stand_in import START_TIME, AlorStandIn, recorded_bars
+from myLib.brokers.alor.download.bars import bar_to_candle
+from myLib.brokers.alor.download.stream import BarsStream
+
+TF = 60
+BARS = recorded_bars(30, tf=TF)
+START_DATE = datetime.fromtimestamp(START_TIME, timezone.utc)
+
+
+def updates(bar: dict) -> list[dict]:
+    """Updates of a forming bar, the last one is the completed bar"""
+    return [
+        {**bar, "high": bar["high"] - 0.1 * step, "volume": bar["volume"] - step}
+        for step in (2, 1, 0)
+    ]
+
+
+class LiveStandIn(AlorStandIn):
+    """
+    Sends the history up to the forming bar, then live updates of the bars.
+
+    drops maps a connection number to the bar after which that connection
+    is closed, normally ("close") or abnormally ("abort"). Subscriptions
+    with a token in refused are answered with httpCode 401 and nothing else.
+    """
+
+    def __init__(self, drops: dict[int, tuple[int, str]] = (), refused=()) -> None:
+        super().__init__({"SBER": BARS})
+        self.drops = dict(drops)
+        self.refused = set(refused)
+
+    async def replay(self, websocket, request: dict) -> None:
+        if request["token"] in self.refused:
+            return await self.answer(websocket, request, 401)
+
+        connection = self.connections
+        first = next(i for i, bar in enumerate(BARS) if bar["time"] >= request["from"])
+        for bar in BARS[first : first + 3]:
+            await websocket.send(json.dumps({"data": bar, "guid": request["guid"]}))
+        await self.answer(websocket, request, 200)
+
+        for number in range(first + 2, len(BARS)):
+            await asyncio.sleep(0.001)  # live bars come one after another
+            for update in updates(BARS[number]):
+                await websocket.send(
+                    json.dumps({"data": update, "guid": request["guid"]})
+                )
+            drop = self.drops.get(connection)
+            if drop == (number, "close"):
+                return await websocket.close()
+            if drop == (number, "abort"):
+                websocket.transport.abort()
+                return
+        await asyncio.Future()  # the subscription stays open
+
+
+async def collect(stream: BarsStream, count: int) -> list[dict]:
+    async with aclosing(aiter(stream)) as candles:
+        result = []
+        async for candle in candles:
+            result.append(candle)
+            if len(result) == count:
+                return result
+
+
+def bars_stream(url: str, get_access_token, **kwargs) -> BarsStream:
+    return BarsStream(
+        url, get_access_token, "SBER", TF, START_DATE, reconnect_delay=0.01, **kwargs
+    )
+
+
+def test_reconnects_resume_without_repeating_bars(serve, alor_api):
+    stand_in = LiveStandIn(drops={1: (10, "close"), 2: (20, "abort")})
+
+    async def run():
+        async with serve(stand_in) as url:
+            stream = alor_api(url).stream_bars("SBER", TF, START_DATE)
+            stream.reconnect_delay = 0.01
+            return await asyncio.wait_for(collect(stream, 29), timeout=10)
+
+    candles = asyncio.run(run())
+    # Every completed bar once, with its final values
+    assert candles == [bar_to_candle("SBER", bar) for bar in BARS[:29]]
+    assert stand_in.connections == 3
+
+    # Resubscribed from the bar that was forming, every time with a new token
+    assert [request["from"] for request in stand_in.requests] == [
+        START_DATE.timestamp(),
+        BARS[10]["time"],
+        BARS[20]["time"],
+    ]
+    tokens = [request["token"] for request in stand_in.requests]
+    assert len(set(tokens)) == len(tokens)
+
+
+def test_refused_subscription_is_sent_again_with_a_new_token(serve):
+    # The first two tokens are expired, the server keeps the connection open
+    stand_in = LiveStandIn(refused={"token-1", "token-2"})
+    issued = iter(f"token-{number}" for number in range(1, 100))
+
+    async def run():
+        async with serve(stand_in) as url:
+            stream = bars_stream(url, lambda: next(issued))
+            return await asyncio.wait_for(collect(stream, 5), timeout=10)
+
+    assert asyncio.run(run()) == [bar_to_candle("SBER", bar) for bar in BARS[:5]]
+    assert [request["token"] for request in stand_in.requests] == [
+        "token-1",
+        "token-2",
+        "token-3",
+    ]
+
+
+def test_stream_raises_after_max_failures(serve):
+    stand_in = LiveStandIn(refused={"expired"})
+
+    async def run():
+        async with serve(stand_in) as url:
+            stream = bars_stream(url, lambda: "expired", max_failures=3)
+            await asyncio.wait_for(collect(stream, 1), timeout=10)
+
+    with pytest.raises(ConnectionError, match="failed 3 times"):
+        asyncio.run(run())
+    assert len(stand_in.requests) == 3
+
+
+def test_update_completes_bars_once():
+    stream = BarsStream("ws://unused", lambda: "token", "SBER", TF, START_DATE)
+    first, second, third = BARS[:3]
+
+    assert stream._update(updates(first)[0]) is None
+    assert stream._update(first) is None
+    assert stream._update(updates(second)[0]) == first
+    assert stream._update(first) is None  # late update of a completed bar
+    assert stream._update(second) is None
+
+    # After a reconnect the history repeats the completed and the forming bar
+    assert stream._update(first) is None
+    assert stream._update(second) is None
+    assert stream._update(third) == second
+    assert stream._resume_date() == datetime.fromtimestamp(third["time"], timezone.utc)
@@ -0,0 +1,118 @@
+"""History download of one ticker replayed through the local Alor stand-in."""
+
+import asyncio
+import json
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+import pandas as pd
+import pytest
+import websockets
+from alor_stand_in import START_TIME, AlorStandIn, recorded_bars
+
+START_DATE = datetime.fromtimestamp(START_TIME, timezone.utc)
+
+
+async def reference_get_ticker_data(
+    ws_url: str, ticker: str, start_date: datetime, tf: int
+) -> pd.DataFrame:
+    """get_ticker_data as it was before BarsBuffer, appending a row per message"""
+    df = pd.DataFrame(
+        columns=["TICKER", "DATE", "OPEN", "HIGH", "LOW", "CLOSE", "VOLUME"],
+    )
+
+    async with websockets.connect(ws_url, max_size=None) as websocket:
+        message = {
+            "opcode": "BarsGetAndSubscribe",
+            "code": ticker,
+            "tf": tf,
+            "from": start_date.timestamp(),
+            "delayed": False,
+            "skipHistory": False,
+            "exchange": "MOEX",
+            "format": "Simple",
+            "frequency": 100,
+            "guid": uuid.uuid4().hex,
+            "token": "token",
+        }
+        await websocket.send(json.dumps(message))
+        while True:
+            response = await websocket.recv()
+            response_dict = json.loads(response)
+            if "httpCode" in response_dict:
+                return df
+
+            json_item = json.loads(response)["data"]
+            date = (
+                datetime.fromtimestamp(json_item["time"], timezone.utc)
+                .astimezone(timezone(offset=timedelta(hours=3)))
+                .strftime("%Y%m%d %H:%M:%S")
+            )
+            df.loc[len(df)] = [
+                ticker,
+                date,
+                json_item["open"],
+                json_item["high"],
+                json_item["low"],
+                json_item["close"],
+                json_item["volume"],
+            ]
+
+
+def assert_same_quotes(result: pd.DataFrame, reference: pd.DataFrame) -> None:
+    """The reference keeps object columns, compare the values"""
+    assert list(result.columns) == list(reference.columns)
+    pd.testing.assert_frame_equal(result, reference.astype(result.dtypes.to_dict()))
+
+
+@pytest.mark.parametrize("start", [0, 150])
+def test_history_matches_reference(serve, alor_api, start):
+    stand_in = AlorStandIn({"SBER": recorded_bars(300, tf=300)})
+    start_date = START_DATE + timedelta(seconds=300 * start)
+
+    async def download():
+        async with serve(stand_in) as url:
+            result = await alor_api(url).get_ticker_data("SBER", start_date, 300)
+            reference = await reference_get_ticker_data(url, "SBER", start_date, 300)
+        return result, reference
+
+    result, reference = asyncio.run(download())
+    assert len(result) == 300 - start
+    assert result["DATE"].iloc[0] == (
+        datetime(2024, 1, 1, 10, 0) + timedelta(seconds=300 * start)
+    ).strftime("%Y%m%d %H:%M:%S")
+    assert_same_quotes(result, reference)
+
+
+def test_closed_connection_returns_received_bars(serve, alor_api):
+    class Dropping(AlorStandIn):
+        async def replay(self, websocket, request):
+            for bar in self.bars["SBER"][:10]:
+                await websocket.send(json.dumps({"data": bar, "guid": request["guid"]}))
+            await websocket.close()
+
+    async def download():
+        async with serve(Dropping({"SBER": recorded_bars(20)})) as url:
+            return await alor_api(url).get_ticker_data("SBER", START_DATE, 60)
+
+    assert len(asyncio.run(download())) == 10
+
+
+def test_replay_is_faster_than_row_appends(serve, alor_api):
+    stand_in = AlorStandIn({"SBER": recorded_bars(2000)})
+
+    async def replay():
+        async with serve(stand_in) as url:
+            api = alor_api(url)
+            start = time.perf_counter()
+            result = await api.get_ticker_data("SBER", START_DATE, 60)
+            current = time.perf_counter() - start
+
+            start = time.perf_counter()
+            reference = await reference_get_ticker_data(url, "SBER", START_DATE, 60)
+            return result, reference, current, time.perf_counter() - start
+
+    result, reference, current, before = asyncio.run(replay())
+    assert_same_quotes(result, reference)
+    # ~1 ms per bar before, mostly socket reads now
+    assert before / current >= 5
@@ -0,0 +1,104 @@
+"""Many tickers over shared connections to the local Alor stand-in."""
+
+import asyncio
+import json
+from datetime import datetime, timezone
+import pandas as pd
+import pytest
+from alor_stand_in import START_TIME, AlorStandIn, recorded_bars
+from myLib.brokers.alor.download import AlorDownloader, downloader
+
+START_DATE = datetime.fromtimestamp(START_TIME, timezone.utc)
+TICKERS = [f"T{number:02}" for number in range(12)]
+
+
+def tickers_bars() -> dict[str, list[dict]]:
+    return {
+        ticker: recorded_bars(100 + 25 * number, seed=number)
+        for number, ticker in enumerate(TICKERS)
+    }
+
+
+@pytest.mark.parametrize("connections, max_concurrency", [(1, 12), (3, 4)])
+def test_frames_match_single_downloads(serve, alor_api, connections, max_concurrency):
+    stand_in = AlorStandIn(tickers_bars())
+
+    async def download():
+        async with serve(stand_in) as url:
+            api = alor_api(url)
+            frames = {
+                ticker: df
+                async for ticker, df in api.iter_tickers_data(
+                    TICKERS,
+                    START_DATE,
+                    60,
+                    connections=connections,
+                    max_concurrency=max_concurrency,
+                )
+            }
+            opened = stand_in.connections
+            singles = {
+                ticker: await api.get_ticker_data(ticker, START_DATE, 60)
+                for ticker in TICKERS
+            }
+        return frames, opened, singles
+
+    frames, opened, singles = asyncio.run(download())
+    assert opened == connections
+    assert sorted(frames) == TICKERS
+    for ticker in TICKERS:
+        pd.testing.assert_frame_equal(frames[ticker], singles[ticker])
+
+    # Every shared history was unsubscribed once it was complete, the single
+    # downloads close their connections instead
+    requests = stand_in.requests
+    subscribed = {r["guid"] for r in requests if r["opcode"] == "BarsGetAndSubscribe"}
+    unsubscribed = [r["guid"] for r in requests if r["opcode"] == "unsubscribe"]
+    assert len(subscribed) == 2 * len(TICKERS)
+    assert len(set(unsubscribed)) == len(TICKERS) and set(unsubscribed) <= subscribed
+
+
+def test_failed_request_returns_received_bars(serve, alor_api):
+    class Failing(AlorStandIn):
+        async def replay(self, websocket, request):
+            if request["code"] != "BAD":
+                return await super().replay(websocket, request)
+            for bar in self.bars["SBER"][:5]:
+                await websocket.send(json.dumps({"data": bar, "guid": request["guid"]}))
+            await self.answer(websocket, request, 400)
+
+    stand_in = Failing({"SBER": recorded_bars(50)})
+
+    async def download():
+        async with serve(stand_in) as url:
+            return {
+                ticker: df
+                async for ticker, df in alor_api(url).iter_tickers_data(
+                    ["SBER", "BAD", "NONE"], START_DATE, 60
+                )
+            }
+
+    frames = asyncio.run(download())
+    assert {ticker: len(df) for ticker, df in frames.items()} == {
+        "SBER": 50,
+        "BAD": 5,
+        "NONE": 0,
+    }
+
+
+def test_get_quotes_many(serve, alor_api, monkeypatch):
+    stand_in = AlorStandIn(tickers_bars())
+
+    def download(url: str) -> dict[str, pd.DataFrame]:
+        monkeypatch.setattr(downloader, "_alor_api", alor_api(url))
+        return AlorDownloader().get_quotes_many(TICKERS, START_DATE, 60)
+
+    async def serve_and_download():
+        async with serve(stand_in) as url:
+            # get_quotes_many runs its own event loop
+            return await asyncio.to_thread(download, url)
+
+    frames = asyncio.run(serve_and_download())
+    assert {ticker: len(df) for ticker, df in frames.items()} == {
+        ticker: len(bars) for ticker, bars in tickers_bars().items()
+    }
@@ -3,14 +3,26 @@
 import pandas as pd
 from myLib.brokers.types import LimitOrderTypedDict, MarketOrderTypedDict
 from myLib.brokers.types import BrokerAbstractClass
-from .positions import Positions
+from .positions import Positions, DEFAULT_INSTRUMENT
 from .orders import Orders
+from .backtest import RowView
 
-__all__ = ["DemoBroker"]
+__all__ = ["DemoBroker", "DEFAULT_INSTRUMENT"]
 
 
 class DemoBroker(BrokerAbstractClass):
-    """Class that imitates the work of the broker"""
+    """
+    Class that imitates the work of the broker.
+
+    One broker can trade many instruments: orders are routed by their
+    instrument_id, orders without it belong to DEFAULT_INSTRUMENT, and run
+    accepts either one bar or a cross-section of bars of many instruments.
+
+    Example:
+        broker.run(row, index)  # one instrument
+        broker.run(bars, index)  # DataFrame of bars indexed by instrument id
+        broker.get_portfolio()  # positions and PnL of all instruments
+    """
 
     def __init__(self) -> None:
 
@@ -21,23 +33,56 @@ class DemoBroker(BrokerAbstractClass):
     def name(self) -> str:
         return "DemoBroker"
 
-    def run(self, row: pd.DataFrame, index: int) -> None:
+    def run(self, row: pd.Series | pd.DataFrame, index: int) -> None:
+        """
+        Fills the orders crossed by the bar and marks the positions to market.
+
+        Args:
+            row: Bar of DEFAULT_INSTRUMENT, or a DataFrame with one bar per
+              instrument indexed by instrument id
+            index: Index of the bar
+        """
+        if isinstance(row, pd.DataFrame):
+            columns = {col: values.to_numpy().tolist() for col, values in row.items()}
+            for position, instrument_id in enumerate(row.index.tolist()):
+                self.__orders.run(
+                    row=RowView(columns, position),
+                    index=index,
+                    positions=self.__positions,
+                    instrument_id=instrument_id,
+                )
+            self.__positions.mark_to_market(row.index, columns["CLOSE"])
+            return
+
         self.__orders.run(row=row, index=index, positions=self.__positions)
+        self.__positions.mark(self.__positions.slot(), row["CLOSE"])
+
+    def get_positions(self, instrument_id: str = DEFAULT_INSTRUMENT) -> dict:
+        return self.__positions.get_position(instrument_id)
+
+    def get_portfolio(self) -> pd.DataFrame:
+        """
+        Returns positions of all instruments.
 
-    def get_positions(self) -> int:
-        return self.__positions.get_position()
+        Returns:
+            pd.DataFrame: size, average_price, realized_pnl, last_price and
+              unrealized_pnl indexed by instrument id
+        """
+        return self.__positions.summary()
 
-    def get_orders_log(self) -> pd.DataFrame:
-        return self.__orders.get_log()
+    def get_orders_log(self, instrument_id: str = DEFAULT_INSTRUMENT) -> pd.DataFrame:
+        return self.__orders.get_log(instrument_id)
 
     def create_order(self, order: LimitOrderTypedDict | MarketOrderTypedDict) -> None:
         self.__orders.create(order)
 
-    def get_orders(self) -> list[LimitOrderTypedDict | MarketOrderTypedDict]:
-        return self.__orders.get_orders()
+    def get_orders(
+        self, instrument_id: str | None = None
+    ) -> list[LimitOrderTypedDict | MarketOrderTypedDict]:
+        return self.__orders.get_orders(instrument_id)
 
     def cancel_order(self, order_id: float) -> None:
         self.__orders.delete_order(order_id)
 
-    def cancel_all_orders(self) -> None:
-        self.__orders.delete_all_orders()
+    def cancel_all_orders(self, instrument_id: str | None = None) -> None:
+        self.__orders.delete_all_orders(instrument_id)
@@ -0,0 +1,96 @@
+"""
+Bar by bar backtest of a strategy against the demo broker.
+
+The candles are split into plain Python lists once, every bar is passed to
+the broker and the strategy as a RowView instead of a pandas Series, which
+costs a few hundred nanoseconds instead of tens of microseconds per bar.
+"""
+
+import pandas as pd
+
+__all__ = ["RowView", "backtest"]
+
+
+class RowView:
+    """
+    Read-only view of one bar of column lists.
+
+    Supports the parts of the pandas Series interface the strategies and the
+    demo broker use: row["CLOSE"], row.get("EMA 50") and row.name.
+    """
+
+    __slots__ = ("_columns", "name")
+
+    def __init__(self, columns: dict[str, list], index: int) -> None:
+        self._columns = columns
+        self.name = index
+
+    def __getitem__(self, key: str):
+        return self._columns[key][self.name]
+
+    def get(self, key: str, default=None):
+        column = self._columns.get(key)
+        return default if column is None else column[self.name]
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._columns
+
+    def keys(self):
+        return self._columns.keys()
+
+    def to_dict(self) -> dict:
+        return {key: column[self.name] for key, column in self._columns.items()}
+
+    def __repr__(self) -> str:
+        return f"RowView({self.name}, {self.to_dict()})"
+
+
+def row_columns(data: pd.DataFrame) -> dict[str, list]:
+    """
+    Converts the frame to column lists for RowView.
+
+    Datetime columns, and a DATE column of strings, become pd.Timestamp
+    values, the other columns become Python scalars.
+    """
+    columns = {}
+    for col in data.columns:
+        series = data[col]
+        if col == "DATE" and not pd.api.types.is_datetime64_any_dtype(series):
+            series = pd.to_datetime(series)  # parse once instead of on every bar
+        if pd.api.types.is_datetime64_any_dtype(series):
+            columns[col] = list(series)
+        else:
+            columns[col] = series.to_numpy().tolist()
+    return columns
+
+
+def backtest(strategy, broker, data: pd.DataFrame) -> pd.DataFrame:
+    """
+    Runs the strategy bar by bar against the demo broker.
+
+    On every bar the broker first fills the orders left by the previous bar,
+    then the strategy sees the bar and the previous one and places new orders.
+
+    Args:
+        strategy: Strategy with run(current, previous), for example WithDoubleTrend
+        broker: DemoBroker the strategy was created with
+        data: Candles with the indicator columns the strategy needs
+
+    Returns:
+        pd.DataFrame: data with a positional index, joined with the orders log
+    """
+    columns = row_columns(data)
+    previous = None
+
+    for index in range(len(data)):
+        current = RowView(columns, index)
+        broker.run(current, index)
+        if previous is not None:
+            strategy.run(current=current, previous=previous)
+        previous = current
+
+    result = data.reset_index(drop=True)
+    log = broker.get_orders_log()
+    if len(log.columns) == 0:
+        return result
+    return result.join(log.drop(columns=result.columns, errors="ignore"))
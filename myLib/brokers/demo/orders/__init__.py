@@ -8,6 +8,7 @@ including limit orders and market orders. It supports operations such as:
 - Executing market buy orders
 - Managing market stop orders
 - Tracking order history and positions
+- Keeping the orders of many instruments
 
 The module integrates with position management and maintains a log of all order executions.
 """
@@ -18,7 +19,9 @@ from myLib.brokers.types.orders import (
     MarketOrderTypedDict,
     OrderType,
 )
-from ..positions import Positions
+from ..positions import Positions, DEFAULT_INSTRUMENT
+from .book import OrderBook
+from .log import ExecutionLog
 from .order_methods.limit_buy import limit_buy
 from .order_methods.limit_sell import limit_sell
 from .order_methods.market_buy import market_buy
@@ -29,24 +32,42 @@ __all__ = ["Orders"]
 
 
 class Orders:
-    """Class for managing orders."""
+    """Class for managing orders of many instruments.
+
+    Every instrument has its own order book and execution log, orders without
+    an instrument_id belong to DEFAULT_INSTRUMENT. Order ids are unique across
+    all instruments.
+    """
 
     def __init__(self):
-        self.__orders: list[LimitOrderTypedDict | MarketOrderTypedDict] = []
-        self.__log = pd.DataFrame()
+        self.__books: dict[str, OrderBook] = {}
+        self.__logs: dict[str, ExecutionLog] = {}
+        self.__instruments: dict[float, str] = {}  # order id -> instrument
 
     def create(self, order: LimitOrderTypedDict | MarketOrderTypedDict):
         """
-        Create a new order and add it to the orders list.
+        Create a new order and add it to the order book of its instrument.
 
         Args:
             order (LimitOrderTypedDict | MarketOrderTypedDict): The order to be created and added
-              to the orders list.
-        """
+              to the order book. A duplicate id is replaced with the next free one.
 
-        self.__orders.append(order)
+        Raises:
+            ValueError: If the order type is not supported.
+        """
 
-    def run(self, row: pd.DataFrame, index: int, positions: Positions):
+        instrument_id = order.get("instrument_id", DEFAULT_INSTRUMENT)
+        # Ids of all instruments are taken, the book moves a duplicate id
+        order_id = self.__book(instrument_id).add(order, taken=self.__instruments)
+        self.__instruments[order_id] = instrument_id
+
+    def run(
+        self,
+        row: pd.DataFrame,
+        index: int,
+        positions: Positions,
+        instrument_id: str = DEFAULT_INSTRUMENT,
+    ):
         """
         Execute trading orders and manage position closing for a given market data row.
 
@@ -56,56 +77,79 @@ class Orders:
         Args:
             row (pd.DataFrame): Current market data row for order processing.
             index (int): Index of the current market data row.
+            positions (Positions): Positions of all instruments.
+            instrument_id (str): Instrument of the row.
         """
 
-        # Processing of orders
-        if len(self.__orders) > 0:
-            for order in self.__orders:
-                if order["order"] == OrderType.LIMIT_BUY:
-                    limit_buy(order, row, index, positions, self.__log, self.__orders)
-
-                elif (
-                    order["order"] == OrderType.LIMIT_SELL
-                    or order["order"] == OrderType.LONG_TP
-                    or order["order"] == OrderType.LONG_SL
-                ):
-                    if order["order"] == OrderType.LONG_TP:
-                        self.__log.loc[index, "TAKE_PROFIT"] = order["price"]
-
-                    elif order["order"] == OrderType.LONG_SL:
-                        self.__log.loc[index, "STOP_LOSS"] = order["price"]
-
-                    limit_sell(order, row, index, positions, self.__log, self.__orders)
-
-                elif order["order"] == OrderType.MARKET_BUY:
-                    market_buy(order, row, index, positions, self.__log, self.__orders)
-
-                elif order["order"] == OrderType.MARKET_SELL:
-                    market_sell(order, row, index, positions, self.__log, self.__orders)
-                else:
-                    raise ValueError(
-                        f"Unknown order type: {order['order']}. Supported types are: LIMIT_BUY, LIMIT_SELL, MARKET_BUY, MARKET_SELL."
-                    )
-
-    def get_log(self) -> pd.DataFrame:
+        book = self.__books.get(instrument_id)
+        if not book:
+            return
+        log = self.__log(instrument_id)
+        position = positions.instrument(instrument_id)
+
+        # Take profit and stop loss levels resting at the start of the bar
+        take_profit = book.last_take_profit()
+        if take_profit is not None:
+            log.record(index, TAKE_PROFIT=take_profit["price"])
+        stop_loss = book.last_stop_loss()
+        if stop_loss is not None:
+            log.record(index, STOP_LOSS=stop_loss["price"])
+
+        # Processing of orders crossed by the bar, in creation order
+        for order in book.crossed(low=row["LOW"], high=row["HIGH"]):
+            if order["order"] == OrderType.LIMIT_BUY:
+                limit_buy(order, row, index, position, log, book)
+
+            elif (
+                order["order"] == OrderType.LIMIT_SELL
+                or order["order"] == OrderType.LONG_TP
+                or order["order"] == OrderType.LONG_SL
+            ):
+                limit_sell(order, row, index, position, log, book)
+
+            elif order["order"] == OrderType.MARKET_BUY:
+                market_buy(order, row, index, position, log, book)
+
+            elif order["order"] == OrderType.MARKET_SELL:
+                market_sell(order, row, index, position, log, book)
+
+            if order["id"] not in book:  # filled
+                del self.__instruments[order["id"]]
+
+    def get_log(self, instrument_id: str = DEFAULT_INSTRUMENT) -> pd.DataFrame:
         """
         Retrieve the log of orders and their execution details.
 
+        Args:
+            instrument_id (str): Instrument of the log.
+
         Returns:
-            pd.DataFrame: A DataFrame containing the log of order activities.
+            pd.DataFrame: A DataFrame containing the log of order activities, built from the
+              columnar log on the first call after a change.
         """
 
-        return self.__log
+        return self.__log(instrument_id).to_frame()
 
-    def get_orders(self) -> list[LimitOrderTypedDict | MarketOrderTypedDict]:
+    def get_orders(
+        self, instrument_id: str | None = None
+    ) -> list[LimitOrderTypedDict | MarketOrderTypedDict]:
         """
         Retrieve the current list of active orders.
 
+        Args:
+            instrument_id (str | None): Instrument of the orders, None for all instruments.
+
         Returns:
-            list[LimitOrderTypedDict | MarketOrderTypedDict]: A list containing the current active orders.
+            list[LimitOrderTypedDict | MarketOrderTypedDict]: A copy of the active orders in creation
+              order by instrument, orders can be cancelled while iterating it.
         """
 
-        return self.__orders
+        if instrument_id is not None:
+            book = self.__books.get(instrument_id)
+            return book.orders() if book is not None else []
+        if len(self.__books) == 1:
+            return next(iter(self.__books.values())).orders()
+        return [order for book in self.__books.values() for order in book.orders()]
 
     def delete_order(self, order_id: float) -> None:
         """
@@ -117,16 +161,39 @@ class Orders:
         Raises:
             ValueError: If no order with the specified ID is found.
         """
-        for order in self.__orders:
-            if order["id"] == order_id:
-                self.__orders.remove(order)
-                return
-
-        # If we get here, no order with the specified ID was found
-        raise ValueError(f"Order with ID {order_id} not found")
+        instrument_id = self.__instruments.get(order_id)
+        if instrument_id is None:
+            raise ValueError(f"Order with ID {order_id} not found")
+        self.__books[instrument_id].remove(order_id)
+        del self.__instruments[order_id]
 
-    def delete_all_orders(self) -> None:
+    def delete_all_orders(self, instrument_id: str | None = None) -> None:
         """
         Delete all active orders.
+
+        Args:
+            instrument_id (str | None): Instrument of the orders, None for all instruments.
         """
-        self.__orders = []
+        if instrument_id is None:
+            for book in self.__books.values():
+                book.clear()
+            self.__instruments.clear()
+            return
+
+        book = self.__books.get(instrument_id)
+        if book is not None:
+            for order in book.orders():
+                del self.__instruments[order["id"]]
+            book.clear()
+
+    def __book(self, instrument_id: str) -> OrderBook:
+        book = self.__books.get(instrument_id)
+        if book is None:
+            book = self.__books[instrument_id] = OrderBook()
+        return book
+
+    def __log(self, instrument_id: str) -> ExecutionLog:
+        log = self.__logs.get(instrument_id)
+        if log is None:
+            log = self.__logs[instrument_id] = ExecutionLog()
+        return log
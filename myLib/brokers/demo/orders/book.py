@@ -0,0 +1,215 @@
+"""
+Indexed order book of the demo broker.
+
+Orders are kept in a hash map by id, limit orders are also kept in two
+price-sorted sides, so the orders crossed by a bar are found by bisecting
+the [LOW, HIGH] range instead of scanning every resting order.
+"""
+
+import math
+from bisect import bisect_left, bisect_right, insort
+from typing import Container
+from myLib.brokers.types.orders import (
+    LimitOrderTypedDict,
+    MarketOrderTypedDict,
+    OrderType,
+)
+
+__all__ = ["OrderBook"]
+
+BUY_TYPES = frozenset({OrderType.LIMIT_BUY})
+SELL_TYPES = frozenset({OrderType.LIMIT_SELL, OrderType.LONG_TP, OrderType.LONG_SL})
+MARKET_TYPES = frozenset({OrderType.MARKET_BUY, OrderType.MARKET_SELL})
+
+# Cancelled entries are left in the sorted sides and skipped, the side is
+# rebuilt when they outnumber the live ones
+COMPACT_MIN = 64
+
+
+class _BookSide:
+    """Limit orders of one side sorted by (price, sequence)"""
+
+    def __init__(self) -> None:
+        self.entries: list[tuple[float, int, float]] = []  # (price, seq, id)
+        self.dead = 0
+
+    def add(self, price: float, seq: int, order_id: float) -> None:
+        insort(self.entries, (price, seq, order_id))
+
+    def crossed(self, low: float, high: float) -> list[tuple[float, int, float]]:
+        """Returns the entries with low <= price <= high"""
+        start = bisect_left(self.entries, (low,))
+        end = bisect_right(self.entries, (high, math.inf))
+        return self.entries[start:end]
+
+    def discard(self) -> None:
+        """Counts a cancelled entry, compaction is done by the book"""
+        self.dead += 1
+
+    def needs_compaction(self) -> bool:
+        return self.dead > COMPACT_MIN and self.dead * 2 > len(self.entries)
+
+
+class OrderBook:
+    """
+    Active orders of the demo broker.
+
+    Orders are stored by id in creation order. LIMIT_BUY orders form the buy
+    side, LIMIT_SELL, LONG_TP and LONG_SL orders the sell side, both sorted by
+    price. Market orders and orders without a price are kept only in the map.
+
+    Cancel is O(1): the order is removed from the map, its entry in the side
+    is skipped by later queries and dropped on compaction.
+
+    Example:
+        book = OrderBook()
+        book.add(order)
+        book.crossed(low=row["LOW"], high=row["HIGH"])  # limit orders to fill
+        book.remove(order["id"])
+    """
+
+    def __init__(self) -> None:
+        self._orders: dict[float, LimitOrderTypedDict | MarketOrderTypedDict] = {}
+        self._sequence: dict[float, int] = {}
+        self._next_sequence = 0
+        self._buy = _BookSide()
+        self._sell = _BookSide()
+        self._market: dict[float, MarketOrderTypedDict] = {}
+        self._take_profit: dict[float, LimitOrderTypedDict] = {}
+        self._stop_loss: dict[float, LimitOrderTypedDict] = {}
+
+    def __len__(self) -> int:
+        return len(self._orders)
+
+    def __contains__(self, order_id: float) -> bool:
+        return order_id in self._orders
+
+    def add(
+        self,
+        order: LimitOrderTypedDict | MarketOrderTypedDict,
+        taken: Container[float] = (),
+    ) -> float:
+        """
+        Adds an order to the book.
+
+        Ids are timestamps and orders created within the same microsecond get
+        the same one, a taken id is moved to the next float up and written to
+        order["id"], so cancel_order always finds the right order.
+
+        Args:
+            order: Order to add
+            taken: Ids used outside this book, for example by the books of
+              other instruments
+
+        Returns:
+            float: Id of the order in the book
+
+        Raises:
+            ValueError: If the order type is not supported
+        """
+        order_type = order["order"]
+        if order_type in BUY_TYPES:
+            side = self._buy
+        elif order_type in SELL_TYPES:
+            side = self._sell
+        elif order_type in MARKET_TYPES:
+            side = None
+        else:
+            raise ValueError(
+                f"Unknown order type: {order_type}. Supported types are: LIMIT_BUY, LIMIT_SELL, MARKET_BUY, MARKET_SELL."
+            )
+
+        order_id = order["id"]
+        while order_id in self._orders or order_id in taken:
+            order_id = math.nextafter(order_id, math.inf)
+        order["id"] = order_id
+
+        seq = self._next_sequence
+        self._next_sequence += 1
+        self._orders[order_id] = order
+        self._sequence[order_id] = seq
+
+        if side is None:
+            self._market[order_id] = order
+        elif not math.isnan(order["price"]):  # a NaN price is never crossed
+            side.add(order["price"], seq, order_id)
+
+        if order_type == OrderType.LONG_TP:
+            self._take_profit[order_id] = order
+        elif order_type == OrderType.LONG_SL:
+            self._stop_loss[order_id] = order
+        return order_id
+
+    def remove(self, order_id: float) -> None:
+        """
+        Removes an order from the book.
+
+        Raises:
+            ValueError: If no order with the specified ID is found.
+        """
+        order = self._orders.pop(order_id, None)
+        if order is None:
+            raise ValueError(f"Order with ID {order_id} not found")
+        del self._sequence[order_id]
+
+        order_type = order["order"]
+        if order_type in MARKET_TYPES:
+            del self._market[order_id]
+            return
+        if order_type == OrderType.LONG_TP:
+            del self._take_profit[order_id]
+        elif order_type == OrderType.LONG_SL:
+            del self._stop_loss[order_id]
+        if not math.isnan(order["price"]):
+            side = self._buy if order_type in BUY_TYPES else self._sell
+            side.discard()
+            if side.needs_compaction():
+                self._compact(side)
+
+    def clear(self) -> None:
+        """Removes all orders"""
+        self.__init__()
+
+    def get(self, order_id: float) -> LimitOrderTypedDict | MarketOrderTypedDict:
+        return self._orders[order_id]
+
+    def orders(self) -> list[LimitOrderTypedDict | MarketOrderTypedDict]:
+        """Returns the active orders in creation order"""
+        return list(self._orders.values())
+
+    def crossed(
+        self, low: float, high: float
+    ) -> list[LimitOrderTypedDict | MarketOrderTypedDict]:
+        """
+        Returns the orders a bar fills, in creation order.
+
+        Args:
+            low: LOW of the bar
+            high: HIGH of the bar
+
+        Returns:
+            list: Limit orders with low <= price <= high and all market orders
+        """
+        found = [(self._sequence[order_id], order_id) for order_id in self._market]
+        if not low <= high:  # NaN bar, limit orders are not filled
+            return [self._orders[order_id] for _, order_id in found]
+        for side in (self._buy, self._sell):
+            for _, seq, order_id in side.crossed(low, high):
+                if self._sequence.get(order_id) == seq:  # skip cancelled entries
+                    found.append((seq, order_id))
+        found.sort()
+        return [self._orders[order_id] for _, order_id in found]
+
+    def last_take_profit(self) -> LimitOrderTypedDict | None:
+        """Returns the most recent LONG_TP order"""
+        return next(reversed(self._take_profit.values()), None)
+
+    def last_stop_loss(self) -> LimitOrderTypedDict | None:
+        """Returns the most recent LONG_SL order"""
+        return next(reversed(self._stop_loss.values()), None)
+
+    def _compact(self, side: _BookSide) -> None:
+        side.entries = [
+            entry for entry in side.entries if self._sequence.get(entry[2]) == entry[1]
+        ]
+        side.dead = 0
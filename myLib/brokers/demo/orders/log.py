@@ -0,0 +1,113 @@
+"""
+Execution log of the demo broker.
+
+The log is written cell by cell on every fill, growing a DataFrame with
+log.loc[index, column] reallocates it whenever a new row or column appears.
+ExecutionLog keeps one preallocated NumPy array per column instead, grown by
+doubling, and builds the DataFrame only when it is requested.
+"""
+
+import numbers
+import numpy as np
+import pandas as pd
+
+__all__ = ["ExecutionLog"]
+
+INITIAL_CAPACITY = 1024
+
+
+class ExecutionLog:
+    """
+    Append-only columnar log of order executions.
+
+    Rows are bar indices in order of their first record, columns appear in
+    order of their first value. A column holding only numbers is a float64
+    array, other columns are object arrays. Writing the same cell again
+    replaces its value, like log.loc[index, column] = value did.
+
+    Example:
+        log = ExecutionLog()
+        log.record(index, SIGNAL="LONG_BUY", BUY_PRICE=101.5)
+        log.to_frame()  # pd.DataFrame indexed by bar index
+    """
+
+    def __init__(self) -> None:
+        self._rows: dict[int, int] = {}  # bar index -> row position
+        self._index = np.empty(INITIAL_CAPACITY, dtype=np.int64)
+        self._columns: dict[str, np.ndarray] = {}
+        self._frame: pd.DataFrame | None = None
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def record(self, index: int, **values) -> None:
+        """
+        Writes values of one bar.
+
+        Args:
+            index: Index of the bar
+            **values: Values by column name, for example SIGNAL=..., SELL_PRICE=...
+        """
+        position = self._rows.get(index)
+        if position is None:
+            position = self._add_row(index)
+
+        columns = self._columns
+        for column, value in values.items():
+            array = columns.get(column)
+            if array is None:
+                array = columns[column] = self._new_column(value)
+            elif array.dtype != object and not _is_number(value):
+                array = columns[column] = array.astype(object)
+            array[position] = value
+        self._frame = None
+
+    def to_frame(self) -> pd.DataFrame:
+        """
+        Builds the log DataFrame, the result is reused until the next record.
+
+        Returns:
+            pd.DataFrame: One row per logged bar, NaN where nothing was written
+        """
+        if self._frame is None:
+            size = len(self._rows)
+            if size == 0:
+                self._frame = pd.DataFrame()
+            else:
+                self._frame = pd.DataFrame(
+                    {
+                        column: (
+                            array[:size].tolist()
+                            if array.dtype == object
+                            else array[:size].copy()
+                        )
+                        for column, array in self._columns.items()
+                    },
+                    index=pd.Index(self._index[:size].copy()),
+                )
+        return self._frame
+
+    def _add_row(self, index: int) -> int:
+        position = len(self._rows)
+        if position == len(self._index):
+            self._grow(2 * position)
+        self._index[position] = index
+        self._rows[index] = position
+        return position
+
+    def _grow(self, capacity: int) -> None:
+        index = np.empty(capacity, dtype=np.int64)
+        index[: len(self._index)] = self._index
+        self._index = index
+        for column, array in self._columns.items():
+            grown = np.full(capacity, np.nan, dtype=array.dtype)
+            grown[: len(array)] = array
+            self._columns[column] = grown
+
+    def _new_column(self, value) -> np.ndarray:
+        dtype = np.float64 if _is_number(value) else object
+        return np.full(len(self._index), np.nan, dtype=dtype)
+
+
+def _is_number(value) -> bool:
+    return isinstance(value, numbers.Real) and not isinstance(value, bool)
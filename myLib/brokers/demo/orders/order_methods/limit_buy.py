@@ -1,16 +1,18 @@
 import pandas as pd
 
-from myLib.brokers.types import LimitOrderTypedDict, MarketOrderTypedDict
-from myLib.brokers.demo.positions import Positions
+from myLib.brokers.types import LimitOrderTypedDict
+from myLib.brokers.demo.positions import InstrumentPosition
+from myLib.brokers.demo.orders.book import OrderBook
+from myLib.brokers.demo.orders.log import ExecutionLog
 
 
 def limit_buy(
     order: LimitOrderTypedDict,
     row: pd.DataFrame,
     index: int,
-    position: Positions,
-    log: pd.DataFrame,
-    orders: list[LimitOrderTypedDict | MarketOrderTypedDict],
+    position: InstrumentPosition,
+    log: ExecutionLog,
+    orders: OrderBook,
 ):
     """
     Execute a buy limit order based on current market conditions.
@@ -19,9 +21,9 @@ def limit_buy(
         order (LimitOrderTypedDict): Details of the limit order to execute
         row (pd.DataFrame): Current market data row
         index (int): Index of the current market data row
-        position (Positions): Current trading position object
-        log (pd.DataFrame): Logging DataFrame to record trade signals
-        orders (list): List of pending orders
+        position (InstrumentPosition): Current position of the instrument
+        log (ExecutionLog): Log to record trade signals
+        orders (OrderBook): Book of pending orders
 
     Performs the following actions:
     - Checks if order price is within current market high and low
@@ -33,6 +35,5 @@ def limit_buy(
 
     if order["price"] <= row["HIGH"] and order["price"] >= row["LOW"]:
         position.increase(quantity=order["size"], price=order["price"])
-        log.loc[index, "SIGNAL"] = order["signal"]
-        log.loc[index, "BUY_PRICE"] = order["price"]
-        orders[:] = [item for item in orders if item["id"] != order["id"]]
+        log.record(index, SIGNAL=order["signal"], BUY_PRICE=order["price"])
+        orders.remove(order["id"])
@@ -10,23 +10,24 @@ The main function:
 
 The module works with the following data structures:
 - LimitOrderTypedDict: Dictionary containing limit order details
-- MarketOrderTypedDict: Dictionary containing market order details
-- Positions: Class managing trading positions
+- InstrumentPosition: Position of one instrument
 - DataFrame: Pandas DataFrame for price data and logging
 """
 
 import pandas as pd
-from myLib.brokers.types import LimitOrderTypedDict, MarketOrderTypedDict
-from myLib.brokers.demo.positions import Positions
+from myLib.brokers.types import LimitOrderTypedDict
+from myLib.brokers.demo.positions import InstrumentPosition
+from myLib.brokers.demo.orders.book import OrderBook
+from myLib.brokers.demo.orders.log import ExecutionLog
 
 
 def limit_sell(
     order: LimitOrderTypedDict,
     row: pd.DataFrame,
     index: int,
-    position: Positions,
-    log: pd.DataFrame,
-    orders: list[LimitOrderTypedDict | MarketOrderTypedDict],
+    position: InstrumentPosition,
+    log: ExecutionLog,
+    orders: OrderBook,
 ):
     """
     Execute a sell limit order when the current price is within the specified price range.
@@ -35,19 +36,18 @@ def limit_sell(
         order (LimitOrderTypedDict): The limit sell order details.
         row (pd.DataFrame): The current price data row.
         index (int): The current index in the data.
-        position (Positions): The current trading positions.
-        log (pd.DataFrame): The trading log to record signals and prices.
-        orders (list[LimitOrderTypedDict | MarketOrderTypedDict]): The list of active orders.
+        position (InstrumentPosition): The current position of the instrument.
+        log (ExecutionLog): The trading log to record signals and prices.
+        orders (OrderBook): The book of active orders.
 
     Performs the following actions:
     - Checks if the order price is within the current price range (HIGH and LOW)
     - Decreases the position size if the order conditions are met
     - Logs the sell signal and sell price
-    - Removes the executed order from the active orders list
+    - Removes the executed order from the order book
     """
 
     if order["price"] <= row["HIGH"] and order["price"] >= row["LOW"]:
         position.decrease(quantity=order["size"], price=order["price"])
-        log.loc[index, "SIGNAL"] = order["signal"]
-        log.loc[index, "SELL_PRICE"] = order["price"]
-        orders[:] = [item for item in orders if item["id"] != order["id"]]
+        log.record(index, SIGNAL=order["signal"], SELL_PRICE=order["price"])
+        orders.remove(order["id"])
@@ -6,24 +6,26 @@ The module provides functionality to:
 - Execute market buy orders at current market prices
 - Update position sizes
 - Log trade signals and execution prices
-- Manage active order lists
+- Remove executed orders from the order book
 
 The market_buy function is used as part of the demo broker implementation to simulate
 real market order execution for buy-side trades.
 """
 
 import pandas as pd
-from myLib.brokers.types.orders import LimitOrderTypedDict, MarketOrderTypedDict
-from myLib.brokers.demo.positions import Positions
+from myLib.brokers.types.orders import MarketOrderTypedDict
+from myLib.brokers.demo.positions import InstrumentPosition
+from myLib.brokers.demo.orders.book import OrderBook
+from myLib.brokers.demo.orders.log import ExecutionLog
 
 
 def market_buy(
     order: MarketOrderTypedDict,
     row: pd.DataFrame,
     index: int,
-    position: Positions,
-    log: pd.DataFrame,
-    orders: list[LimitOrderTypedDict | MarketOrderTypedDict],
+    position: InstrumentPosition,
+    log: ExecutionLog,
+    orders: OrderBook,
 ):
     """
     Execute a market buy order for a given position.
@@ -32,16 +34,15 @@ def market_buy(
         order (MarketOrderTypedDict): The market order details to be executed.
         row (pd.DataFrame): The current market data row.
         index (int): The current index in the dataset.
-        position (Positions): The current trading position object.
-        log (pd.DataFrame): The trading log to record order details.
-        orders (list[LimitOrderTypedDict | MarketOrderTypedDict]): List of active orders.
+        position (InstrumentPosition): The current position of the instrument.
+        log (ExecutionLog): The trading log to record order details.
+        orders (OrderBook): Book of active orders.
 
     Performs the following actions:
     - Increases the trading position by the order size
     - Logs the buy signal and buy price
-    - Removes the executed order from the active orders list
+    - Removes the executed order from the order book
     """
-    position.increase(order["size"])
-    log.loc[index, "SIGNAL"] = order["message"]
-    log.loc[index, "BUY_PRICE"] = row["OPEN"].iloc[0]
-    orders[:] = [item for item in orders if item["id"] != order["id"]]
+    position.increase(quantity=order["size"], price=row["OPEN"])
+    log.record(index, SIGNAL=order["signal"], BUY_PRICE=row["OPEN"])
+    orders.remove(order["id"])
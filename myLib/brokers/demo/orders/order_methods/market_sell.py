@@ -1,17 +1,18 @@
 import pandas as pd
-from myLib.brokers.types import LimitOrderTypedDict, MarketOrderTypedDict
-from myLib.brokers.demo.positions import Positions
+from myLib.brokers.types import LimitOrderTypedDict
+from myLib.brokers.demo.positions import InstrumentPosition
+from myLib.brokers.demo.orders.book import OrderBook
+from myLib.brokers.demo.orders.log import ExecutionLog
 
 
 def market_sell(
     order: LimitOrderTypedDict,
     row: pd.DataFrame,
     index: int,
-    position: Positions,
-    log: pd.DataFrame,
-    orders: MarketOrderTypedDict,
+    position: InstrumentPosition,
+    log: ExecutionLog,
+    orders: OrderBook,
 ):
     position.decrease(quantity=order["size"], price=row["CLOSE"])
-    log.loc[index, "SIGNAL"] = order["signal"]
-    log.loc[index, "SELL_PRICE"] = row["CLOSE"]
-    orders[:] = [item for item in orders if item["id"] != order["id"]]
+    log.record(index, SIGNAL=order["signal"], SELL_PRICE=row["CLOSE"])
+    orders.remove(order["id"])
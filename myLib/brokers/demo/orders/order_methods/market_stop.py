@@ -12,18 +12,23 @@ Functions:
     market_stop: Executes market stop orders to close positions at day end.
 """
 
+from typing import TYPE_CHECKING
 import pandas as pd
 
-from myLib.brokers.types import LimitOrderTypedDict, MarketOrderTypedDict
-from myLib.brokers.demo.positions import Positions
+from myLib.brokers.demo.positions import InstrumentPosition
+from myLib.brokers.demo.orders.log import ExecutionLog
+
+if TYPE_CHECKING:
+    from myLib.brokers.demo.orders import Orders
 
 
 def market_stop(
     row: pd.DataFrame,
     index: int,
-    position: Positions,
-    log: pd.DataFrame,
-    orders: list[LimitOrderTypedDict | MarketOrderTypedDict],
+    position: InstrumentPosition,
+    log: ExecutionLog,
+    orders: "Orders",
+    instrument_id: str,
 ):
     """
     Execute a market stop order at the end of the trading day.
@@ -34,9 +39,10 @@ def market_stop(
     Args:
         row (pd.DataFrame): Current row of trading data.
         index (int): Current index in the log DataFrame.
-        position (Positions): Position management object.
-        log (pd.DataFrame): Logging DataFrame to record trade signals.
-        orders (list[LimitOrderTypedDict | MarketOrderTypedDict]): List of active orders.
+        position (InstrumentPosition): Position of the instrument.
+        log (ExecutionLog): Log to record trade signals.
+        orders (Orders): Active orders of all instruments.
+        instrument_id (str): Instrument of the row, its orders are deleted.
     """
 
     positions = position.get_position()["size"]
@@ -45,6 +51,6 @@ def market_stop(
         and pd.to_datetime(row["DATE"]).time() == pd.Timestamp("23:45:00").time()
     ):
         position.decrease(quantity=positions, price=row["OPEN"])
-        log.loc[index, "SIGNAL"] = "MARKET_STOP"
-        log.loc[index, "SELL_PRICE"] = row["OPEN"]
-        orders.clear()
+        log.record(index, SIGNAL="MARKET_STOP", SELL_PRICE=row["OPEN"])
+        # Through Orders, so the order id -> instrument map is cleared too
+        orders.delete_all_orders(instrument_id)
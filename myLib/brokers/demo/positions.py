@@ -1,64 +1,212 @@
 """
 The module contains the Positions class to manage positions.
 
-Positions class provides methods for obtaining a current position,
-And also to increase or decrease it by a given amount.
+Positions class keeps the positions of many instruments in parallel NumPy
+arrays (size, average price, realized PnL, last price) indexed by the slot
+of the instrument, provides methods for obtaining a position, to increase or
+decrease it by a given amount and to mark all positions to market at once.
 """
 
+import numpy as np
+import pandas as pd
+
+__all__ = ["Positions", "InstrumentPosition", "DEFAULT_INSTRUMENT"]
+
+# Instrument of orders and bars without an instrument_id
+DEFAULT_INSTRUMENT = "DEFAULT"
+
+INITIAL_CAPACITY = 16
+
 
 class Positions:
-    """Class for managing and tracking positions"""
+    """Class for managing and tracking positions of many instruments"""
 
     def __init__(self):
-        self.__position = {"size": 0, "average_price": 0}
+        self.__instruments: dict[str, int] = {}
+        self.__index: pd.Index | None = None  # instruments by slot, for lookups
+        self.__size = np.zeros(INITIAL_CAPACITY, dtype=np.int64)
+        self.__average_price = np.zeros(INITIAL_CAPACITY, dtype=np.float64)
+        self.__realized_pnl = np.zeros(INITIAL_CAPACITY, dtype=np.float64)
+        self.__last_price = np.full(INITIAL_CAPACITY, np.nan, dtype=np.float64)
 
-    def get_position(self) -> dict:
+    def slot(self, instrument_id: str = DEFAULT_INSTRUMENT) -> int:
+        """Returns the array index of the instrument, adding it when it is new"""
+        slot = self.__instruments.get(instrument_id)
+        if slot is None:
+            slot = self.__instruments[instrument_id] = len(self.__instruments)
+            if slot == len(self.__size):
+                self.__grow(2 * slot)
+        return slot
+
+    def slots(self, instrument_ids) -> np.ndarray:
+        """Returns the array indices of many instruments, adding the new ones"""
+        if self.__index is None or len(self.__index) != len(self.__instruments):
+            self.__index = pd.Index(list(self.__instruments))
+        slots = self.__index.get_indexer(instrument_ids)
+        if (slots < 0).any():
+            for instrument_id in instrument_ids:
+                self.slot(instrument_id)
+            self.__index = pd.Index(list(self.__instruments))
+            slots = self.__index.get_indexer(instrument_ids)
+        return slots
+
+    def instrument(
+        self, instrument_id: str = DEFAULT_INSTRUMENT
+    ) -> "InstrumentPosition":
+        """Returns the position of one instrument with the single-position interface"""
+        return InstrumentPosition(self, self.slot(instrument_id))
+
+    def get_position(self, instrument_id: str = DEFAULT_INSTRUMENT) -> dict:
         """Returns the current value of the position.
 
+        Args:
+            instrument_id (str): Instrument of the position.
+
         Returns:
             dict: Current position with size and average_price.
         """
-        return self.__position
+        return self.position_at(self.slot(instrument_id))
 
-    def increase(self, quantity: int, price: float):
+    def position_at(self, slot: int) -> dict:
+        """Returns the position of an instrument slot, see get_position"""
+        return {
+            "size": int(self.__size[slot]),
+            "average_price": float(self.__average_price[slot]),
+        }
+
+    def increase(
+        self, quantity: int, price: float, instrument_id: str = DEFAULT_INSTRUMENT
+    ):
         """Increases the position on a given amount.
 
         Args:
             quantity (int): the quantity for which the position is increasing.
             price (float): the price at which the position is increasing.
+            instrument_id (str): Instrument of the position.
         """
-        if self.__position["size"] == 0:
-            self.__position["size"] += quantity
-            self.__position["average_price"] = price
-        elif self.__position["size"] + quantity == 0:
-            self.__position["size"] = 0
-            self.__position["average_price"] = 0
-        elif self.__position["size"] > 0:
-            total_value = self.__position["size"] * self.__position["average_price"]
-            total_value += quantity * price
-            new_size = self.__position["size"] + quantity
-            self.__position["average_price"] = total_value / new_size
-            self.__position["size"] = new_size
-        else:
-            self.__position["size"] += quantity
+        self.trade(self.slot(instrument_id), quantity, price)
 
-    def decrease(self, quantity: int, price: float):
+    def decrease(
+        self, quantity: int, price: float, instrument_id: str = DEFAULT_INSTRUMENT
+    ):
         """Reduces the position on a given amount.
 
         Args:
             quantity (int): The quantity for which the position is reduced.
+            price (float): The price at which the position is reduced.
+            instrument_id (str): Instrument of the position.
+        """
+        self.trade(self.slot(instrument_id), -quantity, price)
+
+    def trade(self, slot: int, quantity: int, price: float):
+        """Changes the position of a slot by a signed quantity.
+
+        Adding to the position moves the average price, reducing it realizes
+        PnL against the average price, a position turned over opens its
+        remainder at price.
+
+        Args:
+            slot (int): Instrument slot, see slot().
+            quantity (int): Positive to buy, negative to sell.
+            price (float): The price of the trade.
         """
-        if self.__position["size"] == 0:
-            self.__position["size"] -= quantity
-            self.__position["average_price"] = price
-        elif self.__position["size"] - quantity == 0:
-            self.__position["size"] = 0
-            self.__position["average_price"] = 0
-        elif self.__position["size"] < 0:
-            total_value = self.__position["size"] * self.__position["average_price"]
-            total_value -= quantity * price
-            new_size = self.__position["size"] - quantity
-            self.__position["average_price"] = total_value / new_size
-            self.__position["size"] = new_size
+        size = int(self.__size[slot])
+        average_price = float(self.__average_price[slot])
+        new_size = size + quantity
+
+        if size == 0:
+            self.__average_price[slot] = price
+        elif new_size == 0:
+            self.__realized_pnl[slot] += size * (price - average_price)
+            self.__average_price[slot] = 0
+        elif (size > 0) == (quantity > 0):
+            total_value = size * average_price
+            total_value += quantity * price
+            self.__average_price[slot] = total_value / new_size
+        elif (size > 0) == (new_size > 0):
+            self.__realized_pnl[slot] -= quantity * (price - average_price)
         else:
-            self.__position["size"] -= quantity
+            self.__realized_pnl[slot] += size * (price - average_price)
+            self.__average_price[slot] = price
+        self.__size[slot] = new_size
+
+    def mark_to_market(self, instrument_ids, prices) -> float:
+        """Updates the last prices of the instruments.
+
+        Args:
+            instrument_ids: Instruments of the prices, for example the index of a cross-section.
+            prices: Last prices, NaN prices keep the previous ones.
+
+        Returns:
+            float: Unrealized PnL of all positions.
+        """
+        slots = self.slots(instrument_ids)
+        prices = np.asarray(prices, dtype=np.float64)
+        known = ~np.isnan(prices)
+        self.__last_price[slots[known]] = prices[known]
+        return float(self.unrealized_pnl().sum())
+
+    def mark(self, slot: int, price: float) -> None:
+        """Updates the last price of one instrument slot"""
+        if price == price:  # not NaN
+            self.__last_price[slot] = price
+
+    def unrealized_pnl(self) -> np.ndarray:
+        """Returns the unrealized PnL by slot, 0 for flat or not marked instruments"""
+        count = len(self.__instruments)
+        size = self.__size[:count]
+        pnl = size * (self.__last_price[:count] - self.__average_price[:count])
+        return np.where((size == 0) | np.isnan(pnl), 0.0, pnl)
+
+    def summary(self) -> pd.DataFrame:
+        """Returns all positions.
+
+        Returns:
+            pd.DataFrame: size, average_price, realized_pnl, last_price and
+              unrealized_pnl indexed by instrument id.
+        """
+        count = len(self.__instruments)
+        return pd.DataFrame(
+            {
+                "size": self.__size[:count].copy(),
+                "average_price": self.__average_price[:count].copy(),
+                "realized_pnl": self.__realized_pnl[:count].copy(),
+                "last_price": self.__last_price[:count].copy(),
+                "unrealized_pnl": self.unrealized_pnl(),
+            },
+            index=pd.Index(list(self.__instruments), name="instrument_id"),
+        )
+
+    def __grow(self, capacity: int):
+        self.__size = _grown(self.__size, capacity, 0)
+        self.__average_price = _grown(self.__average_price, capacity, 0)
+        self.__realized_pnl = _grown(self.__realized_pnl, capacity, 0)
+        self.__last_price = _grown(self.__last_price, capacity, np.nan)
+
+
+class InstrumentPosition:
+    """Position of one instrument of Positions, used by the order methods"""
+
+    __slots__ = ("_positions", "_slot")
+
+    def __init__(self, positions: Positions, slot: int):
+        self._positions = positions
+        self._slot = slot
+
+    def get_position(self) -> dict:
+        return self._positions.position_at(self._slot)
+
+    def increase(self, quantity: int, price: float):
+        self._positions.trade(self._slot, quantity, price)
+
+    def decrease(self, quantity: int, price: float):
+        self._positions.trade(self._slot, -quantity, price)
+
+    def mark(self, price: float) -> None:
+        self._positions.mark(self._slot, price)
+
+
+def _grown(array: np.ndarray, capacity: int, fill) -> np.ndarray:
+    grown = np.full(capacity, fill, dtype=array.dtype)
+    grown[: len(array)] = array
+    return grown
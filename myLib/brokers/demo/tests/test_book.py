@@ -0,0 +1,108 @@
+"""OrderBook against a plain list of orders scanned on every query."""
+
+import math
+import random
+import pytest
+from myLib.brokers.demo.orders.book import COMPACT_MIN, OrderBook
+from myLib.brokers.types.orders import OrderType
+
+ORDER_TYPES = list(OrderType)
+
+
+class ListBook:
+    """Orders in a list in creation order, as Orders kept them before the book"""
+
+    def __init__(self) -> None:
+        self.orders: list[dict] = []
+
+    def add(self, order: dict) -> None:
+        self.orders.append(order)
+
+    def remove(self, order_id: float) -> None:
+        for order in self.orders:
+            if order["id"] == order_id:
+                self.orders.remove(order)
+                return
+        raise ValueError(f"Order with ID {order_id} not found")
+
+    def crossed(self, low: float, high: float) -> list[dict]:
+        return [
+            order
+            for order in self.orders
+            if order["order"] in (OrderType.MARKET_BUY, OrderType.MARKET_SELL)
+            or low <= order["price"] <= high  # False for NaN
+        ]
+
+    def last(self, order_type: OrderType) -> dict | None:
+        found = [order for order in self.orders if order["order"] == order_type]
+        return found[-1] if found else None
+
+
+def random_order(rng: random.Random, step: int) -> dict:
+    order_type = rng.choice(ORDER_TYPES)
+    order = {
+        # Few distinct ids, so duplicates are frequent
+        "id": float(rng.randrange(step // 4 + 1)),
+        "strategy": "test",
+        "signal": "TEST",
+        "size": 1,
+        "order": order_type,
+    }
+    if order_type not in (OrderType.MARKET_BUY, OrderType.MARKET_SELL):
+        order["price"] = math.nan if rng.random() < 0.02 else rng.randrange(90, 111)
+    return order
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_book_matches_list_of_orders(seed):
+    rng = random.Random(seed)
+    book, reference = OrderBook(), ListBook()
+
+    for step in range(5000):
+        action = rng.random()
+        if action < 0.45 or not reference.orders:
+            order = random_order(rng, step)
+            order_id = book.add(order)
+            assert order_id == order["id"]
+            assert all(order_id != other["id"] for other in reference.orders)
+            reference.add(order)
+        elif action < 0.8:
+            order_id = rng.choice(reference.orders)["id"]
+            book.remove(order_id)
+            reference.remove(order_id)
+        else:
+            low = rng.randrange(85, 116)
+            high = low + rng.randrange(-2, 8)
+            if rng.random() < 0.05:
+                low = math.nan
+            # A NaN or empty bar crosses only the market orders
+            assert book.crossed(low, high) == reference.crossed(low, high)
+
+        assert len(book) == len(reference.orders)
+        assert book.orders() == reference.orders
+        assert book.last_take_profit() == reference.last(OrderType.LONG_TP)
+        assert book.last_stop_loss() == reference.last(OrderType.LONG_SL)
+
+
+def test_cancelled_entries_are_compacted():
+    book = OrderBook()
+    orders = [
+        {"id": float(i), "order": OrderType.LIMIT_BUY, "price": 100.0, "size": 1}
+        for i in range(4 * COMPACT_MIN)
+    ]
+    for order in orders:
+        book.add(order)
+    for order in orders[:-1]:
+        book.remove(order["id"])
+
+    assert len(book._buy.entries) < 2 * COMPACT_MIN
+    assert book.crossed(99, 101) == [orders[-1]]
+
+
+def test_unknown_order_is_rejected():
+    book = OrderBook()
+    with pytest.raises(ValueError):
+        book.add({"id": 1.0, "order": "STOP", "price": 100.0})
+    with pytest.raises(ValueError):
+        book.remove(1.0)
+    assert len(book) == 0
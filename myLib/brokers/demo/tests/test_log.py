@@ -0,0 +1,66 @@
+"""ExecutionLog against a DataFrame written cell by cell with log.loc."""
+
+import random
+import numpy as np
+import pandas as pd
+import pytest
+from myLib.brokers.demo.orders.log import INITIAL_CAPACITY, ExecutionLog
+
+SIGNALS = ["LONG_BUY", "TAKE_PROFIT", "STOP_LOSS", "MARKET_STOP"]
+PRICES = ["BUY_PRICE", "SELL_PRICE", "TAKE_PROFIT", "STOP_LOSS"]
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_log_matches_loc_writes(seed):
+    rng = random.Random(seed)
+    log, reference = ExecutionLog(), pd.DataFrame()
+    index = 0
+
+    # Past two doublings of the initial capacity
+    while len(log) <= 2 * INITIAL_CAPACITY:
+        index += rng.randrange(1, 4)
+        # Now and then a cell of an earlier bar is written again
+        bar = index if rng.random() < 0.9 else rng.randrange(1, index + 1)
+        values = {"SIGNAL": rng.choice(SIGNALS)} if rng.random() < 0.5 else {}
+        for column in rng.sample(PRICES, rng.randrange(1, 3)):
+            values[column] = round(rng.uniform(90, 110), 2)
+
+        log.record(bar, **values)
+        for column, value in values.items():
+            reference.loc[bar, column] = value
+
+    assert len(log) == len(reference)
+    pd.testing.assert_frame_equal(log.to_frame(), reference)
+    assert log.to_frame().index.dtype == np.int64
+
+
+def test_column_added_after_growth_is_nan_before_it():
+    log = ExecutionLog()
+    for index in range(INITIAL_CAPACITY + 1):
+        log.record(index, BUY_PRICE=float(index))
+    log.record(INITIAL_CAPACITY + 1, SIGNAL="MARKET_STOP")
+
+    frame = log.to_frame()
+    assert frame["SIGNAL"].isna().sum() == INITIAL_CAPACITY + 1
+    assert frame["SIGNAL"].iloc[-1] == "MARKET_STOP"
+    np.testing.assert_array_equal(
+        frame["BUY_PRICE"].to_numpy()[:-1], np.arange(INITIAL_CAPACITY + 1.0)
+    )
+
+
+def test_number_column_turns_to_objects_on_text():
+    log = ExecutionLog()
+    log.record(0, PRICE=1.5)
+    log.record(1, PRICE="n/a")
+    assert log.to_frame()["PRICE"].tolist() == [1.5, "n/a"]
+
+
+def test_frame_is_reused_until_next_record():
+    log = ExecutionLog()
+    assert log.to_frame().empty
+    log.record(5, BUY_PRICE=100.0)
+    frame = log.to_frame()
+    assert log.to_frame() is frame
+    log.record(5, SELL_PRICE=101.0)
+    assert log.to_frame() is not frame
+    assert log.to_frame().loc[5].tolist() == [100.0, 101.0]
@@ -0,0 +1,147 @@
+"""Positions against the single dict position it replaced."""
+
+import math
+import random
+import numpy as np
+import pandas as pd
+import pytest
+from myLib.brokers.demo.orders import Orders
+from myLib.brokers.demo.orders.log import ExecutionLog
+from myLib.brokers.demo.orders.order_methods.market_stop import market_stop
+from myLib.brokers.demo.positions import INITIAL_CAPACITY, DEFAULT_INSTRUMENT, Positions
+from myLib.brokers.types.orders import OrderType
+
+
+class DictPosition:
+    """Position as it was kept before Positions, one dict per broker"""
+
+    def __init__(self):
+        self.position = {"size": 0, "average_price": 0}
+
+    def increase(self, quantity: int, price: float):
+        if self.position["size"] == 0:
+            self.position["size"] += quantity
+            self.position["average_price"] = price
+        elif self.position["size"] + quantity == 0:
+            self.position["size"] = 0
+            self.position["average_price"] = 0
+        elif self.position["size"] > 0:
+            total_value = self.position["size"] * self.position["average_price"]
+            total_value += quantity * price
+            new_size = self.position["size"] + quantity
+            self.position["average_price"] = total_value / new_size
+            self.position["size"] = new_size
+        else:
+            self.position["size"] += quantity
+
+    def decrease(self, quantity: int, price: float):
+        if self.position["size"] == 0:
+            self.position["size"] -= quantity
+            self.position["average_price"] = price
+        elif self.position["size"] - quantity == 0:
+            self.position["size"] = 0
+            self.position["average_price"] = 0
+        elif self.position["size"] < 0:
+            total_value = self.position["size"] * self.position["average_price"]
+            total_value -= quantity * price
+            new_size = self.position["size"] - quantity
+            self.position["average_price"] = total_value / new_size
+            self.position["size"] = new_size
+        else:
+            self.position["size"] -= quantity
+
+
+def random_quantity(rng: random.Random, size: int) -> int:
+    """Signed quantity that closes the position or keeps its side, never turns it over"""
+    if size != 0 and rng.random() < 0.4:
+        return int(-math.copysign(rng.randint(1, abs(size)), size))
+    side = rng.choice([1, -1]) if size == 0 else math.copysign(1, size)
+    return int(side * rng.randint(1, 10))
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_positions_match_dict_positions(seed):
+    rng = random.Random(seed)
+    # More instruments than the initial arrays hold
+    instruments = [f"I{i}" for i in range(2 * INITIAL_CAPACITY + 1)]
+    positions = Positions()
+    references = {instrument_id: DictPosition() for instrument_id in instruments}
+    cash = dict.fromkeys(instruments, 0.0)
+    last = {}
+
+    for _ in range(5000):
+        instrument_id = rng.choice(instruments)
+        reference = references[instrument_id]
+        quantity = random_quantity(rng, reference.position["size"])
+        price = round(rng.uniform(90, 110), 2)
+        if quantity > 0:
+            positions.increase(quantity, price, instrument_id)
+            reference.increase(quantity, price)
+        else:
+            positions.decrease(-quantity, price, instrument_id)
+            reference.decrease(-quantity, price)
+        cash[instrument_id] -= quantity * price
+
+        position = positions.get_position(instrument_id)
+        assert position["size"] == reference.position["size"]
+        assert position["average_price"] == pytest.approx(
+            reference.position["average_price"]
+        )
+        last[instrument_id] = price
+
+    # Realized plus unrealized PnL is the cash flow plus the marked positions
+    prices = [last.get(instrument_id, np.nan) for instrument_id in instruments]
+    positions.mark_to_market(pd.Index(instruments), prices)
+    summary = positions.summary()
+    assert sorted(summary.index) == sorted(instruments)
+    for instrument_id in instruments:
+        row = summary.loc[instrument_id]
+        marked = row["size"] * last.get(instrument_id, 0.0)
+        assert row["realized_pnl"] + row["unrealized_pnl"] == pytest.approx(
+            cash[instrument_id] + marked
+        )
+
+
+def test_turned_over_position_opens_remainder_at_trade_price():
+    positions = Positions()
+    positions.increase(3, 100.0)
+    positions.decrease(5, 110.0)
+    assert positions.get_position() == {"size": -2, "average_price": 110.0}
+    assert positions.summary()["realized_pnl"].tolist() == [30.0]
+
+
+def test_mark_to_market_keeps_price_on_nan():
+    positions = Positions()
+    positions.increase(2, 100.0, "A")
+    positions.decrease(1, 50.0, "B")
+    assert positions.mark_to_market(["A", "B"], [105.0, 40.0]) == 20.0
+    assert positions.mark_to_market(["B", "A", "C"], [np.nan, 101.0, 7.0]) == 12.0
+    assert positions.summary().loc["B", "last_price"] == 40.0
+
+
+def test_market_stop_deletes_orders_of_the_instrument():
+    orders, positions = Orders(), Positions()
+    for order_id, instrument_id in [(1.0, "A"), (2.0, "A"), (3.0, "B")]:
+        orders.create(
+            {
+                "id": order_id,
+                "order": OrderType.LIMIT_SELL,
+                "price": 120.0,
+                "size": 1,
+                "instrument_id": instrument_id,
+            }
+        )
+    position = positions.instrument("A")
+    position.increase(2, 100.0)
+    row = {"DATE": "2024-01-03 23:45:00", "OPEN": 101.0}
+
+    market_stop(row, 7, position, ExecutionLog(), orders, "A")
+
+    assert position.get_position()["size"] == 0
+    assert orders.get_orders("A") == []
+    assert [order["id"] for order in orders.get_orders()] == [3.0]
+    # The ids of deleted orders are free, a stale id would be moved up
+    orders.create({"id": 1.0, "order": OrderType.LIMIT_BUY, "price": 90.0, "size": 1})
+    assert orders.get_orders(DEFAULT_INSTRUMENT)[0]["id"] == 1.0
+    with pytest.raises(ValueError):
+        orders.delete_order(2.0)
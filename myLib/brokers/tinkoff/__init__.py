@@ -1,7 +1,7 @@
 import pandas as pd
 import os
+from dotenv import load_dotenv
 
-from .methods.get_history import get_history
 from .methods.get_candles import get_candles
 from .methods.get_positions import get_positions
 from .methods.get_orders import get_orders
@@ -11,15 +11,37 @@ from .methods.cancel_order import cancel_order
 from .methods.post_stop_order import post_stop_order
 from .methods.get_portfolio import get_portfolio
 from .methods.get_operations import get_operations
+from .session import TinkoffSession
+from .rate_limit import RateLimiter
+from .snapshot import AccountSnapshot
+from .async_client import AsyncTinkoff, PrefetchedTinkoff
 
-__all__ = ["Tinkoff"]
+__all__ = ["Tinkoff", "AsyncTinkoff", "PrefetchedTinkoff"]
 
 
 class Tinkoff:
     """Represents a Tinkoff broker."""
 
-    def __init__(self):
+    def __init__(
+        self,
+        pool_size: int = 10,
+        timeout: float | tuple[float, float] = (5, 30),
+        retries: int = 3,
+        snapshot_ttl: float = 1.0,
+        rate_limits: dict[str, float] | None = None,
+    ):
+        """
+        Args:
+            pool_size: Maximum number of kept-alive connections
+            timeout: Request timeout in seconds, or (connect, read) timeouts
+            retries: Number of retries on 429/5xx answers and connection errors
+            snapshot_ttl: Seconds portfolio and orders are shared between calls,
+              set by the first broker of the account, 0 disables caching
+            rate_limits: Requests per minute by API service, shared by all brokers
+              of the token, defaults to DEFAULT_RATE_LIMITS of rate_limit.py
+        """
         self.name = "Tinkoff"
+        load_dotenv()  # TINKOFF_* variables may come from .env
         self.token = os.getenv("TINKOFF_TOKEN")
         self.account_id = os.getenv("TINKOFF_ACCOUNT_ID")
         self.request_headers = {
@@ -27,6 +49,26 @@ class Tinkoff:
             "Authorization": f"Bearer {self.token}",
             "Content-Type": "application/json",
         }
+        self.session = TinkoffSession(
+            self.request_headers,
+            pool_size=pool_size,
+            timeout=timeout,
+            retries=retries,
+            rate_limiter=RateLimiter.for_token(self.token, rate_limits),
+        )
+        self.snapshot = AccountSnapshot.for_account(self.account_id, snapshot_ttl)
+
+    def get_latency_stats(self) -> dict[str, dict]:
+        """Returns latency statistics of the API calls per method"""
+        return self.session.latency_stats()
+
+    def get_rate_limit_stats(self) -> dict[str, dict]:
+        """Returns queue depth and waiting time of the API calls per service"""
+        return self.session.rate_limiter.stats()
+
+    def close(self) -> None:
+        """Closes pooled connections"""
+        self.session.close()
 
     def get_candles(
         self,
@@ -35,9 +77,16 @@ class Tinkoff:
         end_date: str,
         interval: str = "CANDLE_INTERVAL_5_MIN",
         is_complete: bool = True,
+        fixed_point: bool = False,
     ) -> pd.DataFrame:
         return get_candles(
-            self, instrument_id, start_date, end_date, interval, is_complete
+            self,
+            instrument_id,
+            start_date,
+            end_date,
+            interval,
+            is_complete,
+            fixed_point,
         )
 
     def get_positions(self):
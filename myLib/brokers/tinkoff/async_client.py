@@ -0,0 +1,203 @@
+"""Asyncio interface of the Tinkoff broker."""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable
+import pandas as pd
+
+__all__ = ["AsyncTinkoff", "PrefetchedTinkoff"]
+
+
+class AsyncTinkoff:
+    """
+    Tinkoff broker with coroutine methods.
+
+    Calls run on a dedicated thread pool and share the pooled keep-alive
+    session of the wrapped Tinkoff instance, so independent requests of one
+    strategy tick, and ticks of many instruments, overlap in one event loop.
+
+    Example:
+        broker = AsyncTinkoff(Tinkoff())
+        portfolio, orders = await asyncio.gather(
+            broker.get_portfolio(), broker.get_orders(figi)
+        )
+    """
+
+    def __init__(self, broker, max_workers: int | None = None) -> None:
+        """
+        Args:
+            broker: Tinkoff instance doing the requests
+            max_workers: Number of requests in flight, defaults to the
+              connection pool size of the broker session
+        """
+        self.broker = broker
+        self.name = broker.name
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers or broker.session.pool_size,
+            thread_name_prefix="tinkoff",
+        )
+
+    async def run_sync(self, func: Callable, *args, **kwargs) -> Any:
+        """Runs a blocking function on the broker thread pool"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor, partial(func, *args, **kwargs)
+        )
+
+    async def prefetch(self, figi: str, from_date: str) -> "PrefetchedTinkoff":
+        """
+        Downloads portfolio, orders and operations of the instrument concurrently.
+
+        Returns:
+            PrefetchedTinkoff: Broker answering these reads from the downloaded
+              data, other calls go to the wrapped broker
+        """
+        portfolio, orders, operations = await asyncio.gather(
+            self.get_portfolio(),
+            self.get_orders(figi),
+            self.get_operations(figi, from_date),
+        )
+        return PrefetchedTinkoff(
+            self.broker, figi, from_date, portfolio, orders, operations
+        )
+
+    def close(self) -> None:
+        """Stops the thread pool and closes pooled connections"""
+        self._executor.shutdown(wait=True)
+        self.broker.close()
+
+    async def get_candles(
+        self,
+        instrument_id: str,
+        start_date: str,
+        end_date: str,
+        interval: str = "CANDLE_INTERVAL_5_MIN",
+        is_complete: bool = True,
+        fixed_point: bool = False,
+    ) -> pd.DataFrame:
+        return await self.run_sync(
+            self.broker.get_candles,
+            instrument_id,
+            start_date,
+            end_date,
+            interval,
+            is_complete,
+            fixed_point,
+        )
+
+    async def get_positions(self):
+        return await self.run_sync(self.broker.get_positions)
+
+    async def get_orders(self, figi: str):
+        return await self.run_sync(self.broker.get_orders, figi)
+
+    async def get_portfolio(self):
+        return await self.run_sync(self.broker.get_portfolio)
+
+    async def get_operations(self, figi, from_date):
+        return await self.run_sync(self.broker.get_operations, figi, from_date)
+
+    async def create_limit_buy_order(
+        self, price: float, instrument_id: str, quantity: int
+    ):
+        return await self.run_sync(
+            self.broker.create_limit_buy_order,
+            price=price,
+            instrument_id=instrument_id,
+            quantity=quantity,
+        )
+
+    async def create_limit_sell_order(
+        self, price: float, instrument_id: str, quantity: int
+    ):
+        return await self.run_sync(
+            self.broker.create_limit_sell_order,
+            price=price,
+            instrument_id=instrument_id,
+            quantity=quantity,
+        )
+
+    async def create_market_buy_order(self, instrument_id: str, quantity: int):
+        return await self.run_sync(
+            self.broker.create_market_buy_order,
+            instrument_id=instrument_id,
+            quantity=quantity,
+        )
+
+    async def create_market_sell_order(self, instrument_id: str, quantity: int):
+        return await self.run_sync(
+            self.broker.create_market_sell_order,
+            instrument_id=instrument_id,
+            quantity=quantity,
+        )
+
+    async def replace_order(
+        self, order_id: str, price: float, instrument_id: str, quantity: int
+    ):
+        return await self.run_sync(
+            self.broker.replace_order,
+            order_id=order_id,
+            price=price,
+            instrument_id=instrument_id,
+            quantity=quantity,
+        )
+
+    async def cancel_order(self, order_id: str):
+        return await self.run_sync(self.broker.cancel_order, order_id=order_id)
+
+    async def create_long_stop_loss_order(
+        self, price: float, instrument_id: str, quantity: int
+    ):
+        return await self.run_sync(
+            self.broker.create_long_stop_loss_order,
+            price=price,
+            instrument_id=instrument_id,
+            quantity=quantity,
+        )
+
+    async def create_long_take_profit_order(
+        self, price: float, instrument_id: str, quantity: int
+    ):
+        return await self.run_sync(
+            self.broker.create_long_take_profit_order,
+            price=price,
+            instrument_id=instrument_id,
+            quantity=quantity,
+        )
+
+
+class PrefetchedTinkoff:
+    """
+    Synchronous broker view for one strategy tick.
+
+    get_portfolio, get_orders and get_operations of the prefetched instrument
+    return the data downloaded by AsyncTinkoff.prefetch, every other
+    attribute is taken from the wrapped Tinkoff broker.
+    """
+
+    def __init__(
+        self, broker, figi: str, from_date: str, portfolio, orders, operations
+    ) -> None:
+        self._broker = broker
+        self._figi = figi
+        self._from_date = from_date
+        self._portfolio = portfolio
+        self._orders = orders
+        self._operations = operations
+
+    def __getattr__(self, name: str):
+        return getattr(self._broker, name)
+
+    def get_portfolio(self):
+        return self._portfolio
+
+    def get_orders(self, figi: str):
+        if figi != self._figi:
+            return self._broker.get_orders(figi)
+        return self._orders
+
+    def get_operations(self, figi, from_date):
+        if figi != self._figi or from_date != self._from_date:
+            return self._broker.get_operations(figi, from_date)
+        return self._operations
@@ -1,6 +1,3 @@
-import requests
-
-
 def cancel_order(self, order_id: str):
     url = "https://invest-public-api.tinkoff.ru/rest/tinkoff.public.invest.api.contract.v1.OrdersService/CancelOrder"
 
@@ -9,6 +6,7 @@ def cancel_order(self, order_id: str):
         "orderId": order_id,
     }
 
-    response = requests.post(url, headers=self.request_headers, json=payload)
-    response.raise_for_status()
-    return response.json()
+    try:
+        return self.session.post(url, payload)
+    finally:
+        self.snapshot.invalidate()  # orders and positions have changed
@@ -1,6 +1,12 @@
+from datetime import timedelta, timezone
+import numpy as np
 import pandas as pd
-from datetime import datetime, timedelta
-import requests
+from ...types.price import quotations_to_nanos
+
+# Candles are returned in Moscow time
+MSK = timezone(timedelta(hours=3))
+
+PRICE_COLUMNS = {"OPEN": "open", "HIGH": "high", "LOW": "low", "CLOSE": "close"}
 
 
 def get_candles(
@@ -10,8 +16,15 @@ def get_candles(
     end_date: str,
     interval: str = "CANDLE_INTERVAL_5_MIN",
     is_complete: bool = True,
+    fixed_point: bool = False,
 ) -> pd.DataFrame:
+    """
+    Returns candles with DATE as datetime64 in Moscow time (naive),
+    OPEN, HIGH, LOW, CLOSE as float64 and VOLUME as int64.
 
+    With fixed_point the prices are exact int64 nano units, see
+    myLib.brokers.types.price.
+    """
     url = "https://invest-public-api.tinkoff.ru/rest/tinkoff.public.invest.api.contract.v1.MarketDataService/GetCandles"
 
     payload = {
@@ -22,31 +35,30 @@ def get_candles(
         "candleSourceType": "CANDLE_SOURCE_UNSPECIFIED",
     }
 
-    response = requests.post(url, headers=self.request_headers, json=payload)
-    response.raise_for_status()  # check for errors
-
     # Convert response to DataFrame
-    candles = response.json()["candles"]
-    data = []
-
-    for candle in candles:
-        if not is_complete or candle["isComplete"]:
-            data.append(
-                {
-                    "DATE": (
-                        datetime.strptime(candle["time"], "%Y-%m-%dT%H:%M:%SZ")
-                        + timedelta(hours=3)
-                    ).strftime("%Y-%m-%dT%H:%M:%SZ"),
-                    "OPEN": float(candle["open"]["units"])
-                    + float(candle["open"]["nano"]) / 1e9,
-                    "HIGH": float(candle["high"]["units"])
-                    + float(candle["high"]["nano"]) / 1e9,
-                    "LOW": float(candle["low"]["units"])
-                    + float(candle["low"]["nano"]) / 1e9,
-                    "CLOSE": float(candle["close"]["units"])
-                    + float(candle["close"]["nano"]) / 1e9,
-                    "VOLUME": candle["volume"],
-                }
-            )
+    candles = self.session.post(url, payload)["candles"]
+    if is_complete:
+        candles = [candle for candle in candles if candle["isComplete"]]
+
+    return decode_candles(candles, fixed_point)
+
+
+def decode_candles(candles: list[dict], fixed_point: bool = False) -> pd.DataFrame:
+    """Converts GetCandles JSON candles to a DataFrame column by column"""
+    dates = (
+        pd.to_datetime([candle["time"] for candle in candles], utc=True)
+        .tz_convert(MSK)
+        .tz_localize(None)
+    )
+    data = {"DATE": dates.as_unit("ns")}
+
+    for col, key in PRICE_COLUMNS.items():
+        units = np.array([candle[key]["units"] for candle in candles], dtype=np.int64)
+        nano = np.array([candle[key]["nano"] for candle in candles], dtype=np.int64)
+        if fixed_point:
+            data[col] = quotations_to_nanos(units, nano)
+        else:
+            data[col] = units.astype(np.float64) + nano.astype(np.float64) / 1e9
 
+    data["VOLUME"] = np.array([candle["volume"] for candle in candles], dtype=np.int64)
     return pd.DataFrame(data)
@@ -1,6 +1,3 @@
-import requests
-
-
 def get_operations(
     self,
     figi: str,
@@ -10,6 +7,4 @@ def get_operations(
 
     payload = {"accountId": self.account_id, "figi": figi, "from": from_date}
 
-    response = requests.post(url, headers=self.request_headers, json=payload)
-    response.raise_for_status()
-    return response.json()
+    return self.session.post(url, payload)
@@ -1,12 +1,11 @@
-import requests
-
-
-def get_orders(self, figi: str):
+def get_all_orders(self):
     url = "https://invest-public-api.tinkoff.ru/rest/tinkoff.public.invest.api.contract.v1.OrdersService/GetOrders"
 
     payload = {"accountId": self.account_id}
 
-    response = requests.post(url, headers=self.request_headers, json=payload)
-    response.raise_for_status()
-    result = response.json()["orders"]
-    return [order for order in result if order["figi"] == figi]
+    return self.session.post(url, payload)["orders"]
+
+
+def get_orders(self, figi: str):
+    # GetOrders can't filter by FIGI, all orders are downloaded once and shared
+    return self.snapshot.orders(figi, lambda: get_all_orders(self))
@@ -1,11 +1,10 @@
-import requests
-
-
-def get_portfolio(self):
+def download_portfolio(self):
     url = "https://invest-public-api.tinkoff.ru/rest/tinkoff.public.invest.api.contract.v1.OperationsService/GetPortfolio"
 
     payload = {"accountId": self.account_id}
 
-    response = requests.post(url, headers=self.request_headers, json=payload)
-    response.raise_for_status()
-    return response.json()
+    return self.session.post(url, payload)
+
+
+def get_portfolio(self):
+    return self.snapshot.portfolio(lambda: download_portfolio(self))
@@ -1,11 +1,6 @@
-import requests
-
-
 def get_positions(self):
     url = "https://invest-public-api.tinkoff.ru/rest/tinkoff.public.invest.api.contract.v1.OperationsService/GetPositions"
 
     payload = {"accountId": self.account_id}
 
-    response = requests.post(url, headers=self.request_headers, json=payload)
-    response.raise_for_status()
-    return response.json()
+    return self.session.post(url, payload)
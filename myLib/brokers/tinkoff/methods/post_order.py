@@ -1,7 +1,7 @@
-import requests
 import uuid
 from time import time
 from typing import Dict, Any
+from ...types.price import nanos_to_quotation, price_to_nanos
 
 
 def post_order(
@@ -33,11 +33,9 @@ def post_order(
 
     # Add price details for limit orders
     if price is not None:
-        payload["price"] = {
-            "units": int(price),
-            "nano": int((price - int(price)) * 1e9),
-        }
+        payload["price"] = nanos_to_quotation(price_to_nanos(price))
 
-    response = requests.post(url, headers=self.request_headers, json=payload)
-    response.raise_for_status()
-    return response.json()
+    try:
+        return self.session.post(url, payload)
+    finally:
+        self.snapshot.invalidate()  # orders and positions have changed
@@ -1,5 +1,5 @@
-import requests
 import uuid
+from ...types.price import nanos_to_quotation, price_to_nanos
 
 
 def post_stop_order(
@@ -14,7 +14,7 @@ def post_stop_order(
 
     payload = {
         "quantity": quantity,
-        "stop_price": {"units": int(price), "nano": int((price - int(price)) * 1e9)},
+        "stop_price": nanos_to_quotation(price_to_nanos(price)),
         "direction": direction,
         "accountId": self.account_id,
         "expirationType": "STOP_ORDER_EXPIRATION_TYPE_GOOD_TILL_CANCEL",
@@ -23,6 +23,4 @@ def post_stop_order(
         "orderId": str(uuid.uuid4()),
     }
 
-    response = requests.post(url, headers=self.request_headers, json=payload)
-    response.raise_for_status()
-    return response.json()
+    return self.session.post(url, payload)
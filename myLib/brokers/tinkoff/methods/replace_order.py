@@ -1,6 +1,6 @@
-import requests
 import uuid
 from time import time
+from ...types.price import nanos_to_quotation, price_to_nanos
 
 
 def replace_order(
@@ -17,9 +17,10 @@ def replace_order(
         "orderId": order_id,
         "idempotencyKey": f"{instrument_id}-{int(time())}-{uuid.uuid4().hex[:8]}",
         "quantity": quantity,
-        "price": {"units": int(price), "nano": int((price - int(price)) * 1e9)},
+        "price": nanos_to_quotation(price_to_nanos(price)),
     }
 
-    response = requests.post(url, headers=self.request_headers, json=payload)
-    response.raise_for_status()
-    return response.json()
+    try:
+        return self.session.post(url, payload)
+    finally:
+        self.snapshot.invalidate()  # orders and positions have changed
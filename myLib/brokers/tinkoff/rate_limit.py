@@ -0,0 +1,190 @@
+"""Rate limiting of Tinkoff API calls."""
+
+import heapq
+import itertools
+import threading
+import time
+from collections import deque
+
+__all__ = ["RateLimiter", "DEFAULT_RATE_LIMITS", "ORDER_METHODS"]
+
+# Requests per minute by service, check the limits of your tariff
+DEFAULT_RATE_LIMITS = {
+    "MarketDataService": 600,
+    "OrdersService": 300,
+    "OperationsService": 200,
+    "StopOrdersService": 50,
+}
+
+# Calls that change orders, they go ahead of queued reads
+ORDER_METHODS = frozenset(
+    {"PostOrder", "ReplaceOrder", "CancelOrder", "PostStopOrder", "CancelStopOrder"}
+)
+
+ORDER_PRIORITY = 0
+READ_PRIORITY = 1
+
+
+class _TokenBucket:
+    """Token bucket with a priority queue of waiting threads"""
+
+    def __init__(
+        self, per_minute: float, burst: int | None, window: float = 60
+    ) -> None:
+        quota = max(1, int(per_minute))
+        self.rate = per_minute / window  # refilled continuously
+        self.capacity = burst if burst is not None else max(1, quota // 10)
+        self.window = window
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        # Times of the last quota calls, a bucket alone lets capacity + quota
+        # calls into one window
+        self._granted: deque[float] = deque(maxlen=quota)
+        self._condition = threading.Condition()
+        self._waiting: list[tuple[int, int]] = []  # (priority, arrival) heap
+        self._arrival = itertools.count()
+        self.calls = 0
+        self.waited = 0.0
+        self.max_depth = 0
+
+    def acquire(self, priority: int) -> float:
+        """Blocks until a token is available, returns the waiting time"""
+        start = time.monotonic()
+        with self._condition:
+            ticket = (priority, next(self._arrival))
+            heapq.heappush(self._waiting, ticket)
+            self.max_depth = max(self.max_depth, len(self._waiting))
+
+            while True:
+                if self._waiting[0] != ticket:
+                    self._condition.wait()
+                    continue
+                delay = self._delay()
+                if delay <= 0:
+                    heapq.heappop(self._waiting)
+                    self._tokens -= 1
+                    self._granted.append(self._updated)
+                    self._condition.notify_all()  # next in line may proceed
+                    break
+                self._condition.wait(delay)
+
+            waited = time.monotonic() - start
+            self.calls += 1
+            self.waited += waited
+            return waited
+
+    def depth(self) -> int:
+        with self._condition:
+            return len(self._waiting)
+
+    def _delay(self) -> float:
+        """Refills the bucket, returns the time until the next call is allowed"""
+        now = time.monotonic()
+        self._tokens = min(
+            self.capacity, self._tokens + (now - self._updated) * self.rate
+        )
+        self._updated = now
+
+        delay = (1 - self._tokens) / self.rate if self._tokens < 1 else 0.0
+        if len(self._granted) == self._granted.maxlen:
+            delay = max(delay, self._granted[0] + self.window - now)
+        return delay
+
+
+class RateLimiter:
+    """
+    Token buckets per API service.
+
+    Calls of a service wait for a token of its bucket, so a burst of
+    strategy ticks is spread at the allowed rate instead of failing with 429.
+    A full bucket holds a tenth of the per-minute quota, so a fan-out of
+    concurrent reads goes out at once and later calls are spaced at the
+    per-minute rate. No more calls than the quota are let out in any 60
+    seconds, whatever the burst. Order calls go ahead of waiting reads of
+    the same service.
+
+    API limits are counted per token, RateLimiter.for_token returns the
+    limiter shared by all brokers using the token.
+
+    Example:
+        limiter = RateLimiter({"OrdersService": 300})
+        limiter.acquire(url)  # blocks until the call is allowed
+        limiter.stats()  # {"OrdersService": {"queued": 0, ...}}
+    """
+
+    _tokens: dict[str, "RateLimiter"] = {}
+    _tokens_lock = threading.Lock()
+
+    def __init__(
+        self,
+        limits: dict[str, float] | None = None,
+        default_limit: float = 100,
+        burst: int | None = None,
+    ) -> None:
+        """
+        Args:
+            limits: Requests per minute by service name, defaults to DEFAULT_RATE_LIMITS
+            default_limit: Requests per minute of services missing in limits
+            burst: Number of calls allowed at once, defaults to a tenth of the
+              per-minute quota of the service
+        """
+        self.limits = dict(DEFAULT_RATE_LIMITS if limits is None else limits)
+        self.default_limit = default_limit
+        self.burst = burst
+        self._buckets: dict[str, _TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def for_token(
+        cls, token: str, limits: dict[str, float] | None = None
+    ) -> "RateLimiter":
+        """Returns the limiter shared by all brokers of the token, limits of the first call are used"""
+        with cls._tokens_lock:
+            limiter = cls._tokens.get(token)
+            if limiter is None:
+                limiter = cls._tokens[token] = cls(limits)
+            return limiter
+
+    def acquire(self, url: str) -> float:
+        """Waits until the API method of the url may be called, returns the waiting time"""
+        service, method = _parse_url(url)
+        priority = ORDER_PRIORITY if method in ORDER_METHODS else READ_PRIORITY
+        return self._bucket(service).acquire(priority)
+
+    def stats(self) -> dict[str, dict]:
+        """
+        Returns queue metrics per service.
+
+        Returns:
+            dict: {service: {"queued", "max_queued", "calls", "mean_wait_ms"}}
+        """
+        with self._lock:
+            buckets = dict(self._buckets)
+        return {
+            service: {
+                "queued": bucket.depth(),
+                "max_queued": bucket.max_depth,
+                "calls": bucket.calls,
+                "mean_wait_ms": (
+                    round(bucket.waited / bucket.calls * 1000, 2)
+                    if bucket.calls
+                    else 0.0
+                ),
+            }
+            for service, bucket in buckets.items()
+        }
+
+    def _bucket(self, service: str) -> _TokenBucket:
+        with self._lock:
+            bucket = self._buckets.get(service)
+            if bucket is None:
+                bucket = self._buckets[service] = _TokenBucket(
+                    self.limits.get(service, self.default_limit), self.burst
+                )
+            return bucket
+
+
+def _parse_url(url: str) -> tuple[str, str]:
+    """Returns service and method names of an API url"""
+    service, method = url.rsplit("/", 2)[-2:]
+    return service.rsplit(".", 1)[-1], method
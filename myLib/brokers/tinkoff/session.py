@@ -0,0 +1,148 @@
+"""Pooled HTTP session for the Tinkoff REST API."""
+
+import logging
+import threading
+import time
+from collections import deque
+import numpy as np
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from .rate_limit import RateLimiter
+
+__all__ = ["TinkoffSession"]
+
+logger = logging.getLogger("TinkoffSession")
+
+# Statuses worth repeating: rate limit and temporary server errors
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
+class TinkoffSession:
+    """
+    Keep-alive session shared by all Tinkoff methods.
+
+    Connections are reused from a pool, so only the first call pays for the
+    TCP and TLS handshake. Answers with 429 and 5xx statuses are repeated with
+    exponential backoff, honouring Retry-After. The latency of every call is
+    recorded per API method.
+
+    Example:
+        session = TinkoffSession(headers)
+        portfolio = session.post(url, {"accountId": account_id})
+        session.latency_stats()  # {"GetPortfolio": {"calls": 1, ...}}
+    """
+
+    def __init__(
+        self,
+        headers: dict,
+        pool_size: int = 10,
+        timeout: float | tuple[float, float] = (5, 30),
+        retries: int = 3,
+        backoff_factor: float = 0.5,
+        stats_window: int = 1000,
+        rate_limiter: RateLimiter | None = None,
+    ) -> None:
+        """
+        Args:
+            headers: Headers sent with every request
+            pool_size: Maximum number of kept-alive connections
+            timeout: Request timeout in seconds, or (connect, read) timeouts
+            retries: Number of retries on 429/5xx answers and connection errors
+            backoff_factor: Base delay of the exponential backoff in seconds
+            stats_window: Number of last calls per method used for percentiles
+            rate_limiter: Limiter every call waits for, None sends calls at once
+        """
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self.rate_limiter = rate_limiter
+        self._session = requests.Session()
+        self._session.headers.update(headers)
+
+        retry = Retry(
+            total=retries,
+            connect=retries,
+            # A request that timed out may have reached the server, don't send it twice
+            read=0,
+            status=retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=RETRY_STATUSES,
+            allowed_methods=None,  # every API call is a POST
+            respect_retry_after_header=True,
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(
+            pool_connections=1, pool_maxsize=pool_size, max_retries=retry
+        )
+        self._session.mount("https://", adapter)
+        self._session.mount("http://", adapter)
+
+        self._stats_window = stats_window
+        self._latencies: dict[str, deque[float]] = {}
+        self._calls: dict[str, int] = {}
+        self._errors: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def post(self, url: str, payload: dict) -> dict:
+        """Sends a request to the API method and returns the decoded answer"""
+        method = url.rsplit("/", 1)[-1]
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire(url)  # waiting is not counted as latency
+        start = time.perf_counter()
+        try:
+            response = self._session.post(url, json=payload, timeout=self.timeout)
+            response.raise_for_status()
+        except requests.RequestException:
+            self._record(method, time.perf_counter() - start, failed=True)
+            raise
+        self._record(method, time.perf_counter() - start, failed=False)
+        return response.json()
+
+    def latency_stats(self) -> dict[str, dict]:
+        """
+        Returns latency statistics per API method.
+
+        Returns:
+            dict: {method: {"calls", "errors", "mean_ms", "p50_ms", "p95_ms", "max_ms"}},
+              percentiles are calculated over the last stats_window calls
+        """
+        with self._lock:
+            snapshot = {
+                method: (np.array(latencies), self._calls[method], self._errors[method])
+                for method, latencies in self._latencies.items()
+            }
+
+        return {
+            method: {
+                "calls": calls,
+                "errors": errors,
+                "mean_ms": round(float(latencies.mean()) * 1000, 2),
+                "p50_ms": round(float(np.percentile(latencies, 50)) * 1000, 2),
+                "p95_ms": round(float(np.percentile(latencies, 95)) * 1000, 2),
+                "max_ms": round(float(latencies.max()) * 1000, 2),
+            }
+            for method, (latencies, calls, errors) in snapshot.items()
+        }
+
+    def reset_stats(self) -> None:
+        """Forgets the recorded latencies"""
+        with self._lock:
+            self._latencies.clear()
+            self._calls.clear()
+            self._errors.clear()
+
+    def close(self) -> None:
+        """Closes pooled connections"""
+        self._session.close()
+
+    def _record(self, method: str, seconds: float, failed: bool) -> None:
+        with self._lock:
+            if method not in self._latencies:
+                self._latencies[method] = deque(maxlen=self._stats_window)
+                self._calls[method] = 0
+                self._errors[method] = 0
+            self._latencies[method].append(seconds)
+            self._calls[method] += 1
+            if failed:
+                self._errors[method] += 1
+                logger.error("%s failed after %.0f ms", method, seconds * 1000)
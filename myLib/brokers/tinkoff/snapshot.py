@@ -0,0 +1,93 @@
+"""Short-lived cache of the account portfolio and orders."""
+
+import threading
+import time
+from typing import Callable
+
+__all__ = ["AccountSnapshot"]
+
+
+class AccountSnapshot:
+    """
+    Portfolio and active orders of one account, shared by all strategies.
+
+    With many instruments on one account every strategy tick downloads the
+    same portfolio and the same order list. The snapshot keeps both for ttl
+    seconds and indexes the orders by FIGI, so one download serves all
+    strategies of the candle. Concurrent callers wait for the download that
+    is in flight instead of starting their own. Orders posted, replaced or
+    cancelled by this process invalidate the snapshot.
+
+    Example:
+        snapshot = AccountSnapshot.for_account(account_id, ttl=1.0)
+        orders = snapshot.orders(figi, fetch_all_orders)
+    """
+
+    _accounts: dict[str, "AccountSnapshot"] = {}
+    _accounts_lock = threading.Lock()
+
+    def __init__(self, ttl: float = 1.0) -> None:
+        """
+        Args:
+            ttl: Seconds the downloaded data is used, 0 disables caching
+        """
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        # Separate locks, portfolio and orders are downloaded concurrently
+        self._portfolio_lock = threading.Lock()
+        self._orders_lock = threading.Lock()
+        self._portfolio = None
+        self._portfolio_time = -float("inf")
+        self._orders: dict[str, list] | None = None
+        self._orders_time = -float("inf")
+        self._version = 0
+
+    @classmethod
+    def for_account(cls, account_id: str, ttl: float = 1.0) -> "AccountSnapshot":
+        """Returns the snapshot shared by all brokers of the account"""
+        with cls._accounts_lock:
+            snapshot = cls._accounts.get(account_id)
+            if snapshot is None:
+                snapshot = cls._accounts[account_id] = cls(ttl)
+            return snapshot
+
+    def portfolio(self, fetch: Callable[[], dict]) -> dict:
+        """Returns the cached portfolio, downloading it with fetch when stale"""
+        with self._portfolio_lock:
+            if time.monotonic() - self._portfolio_time < self.ttl:
+                self.hits += 1
+                return self._portfolio
+
+            self.misses += 1
+            version = self._version
+            portfolio = fetch()
+            if version == self._version:
+                self._portfolio = portfolio
+                self._portfolio_time = time.monotonic()
+            return portfolio
+
+    def orders(self, figi: str, fetch_all: Callable[[], list]) -> list:
+        """Returns active orders of the FIGI, downloading all orders with fetch_all when stale"""
+        with self._orders_lock:
+            if time.monotonic() - self._orders_time < self.ttl:
+                self.hits += 1
+                return list(self._orders.get(figi, ()))
+
+            self.misses += 1
+            version = self._version
+            orders: dict[str, list] = {}
+            for order in fetch_all():
+                orders.setdefault(order["figi"], []).append(order)
+            if version == self._version:
+                self._orders = orders
+                self._orders_time = time.monotonic()
+            return list(orders.get(figi, ()))
+
+    def invalidate(self) -> None:
+        """Forgets the cached data, the next call downloads it again"""
+        # Not under the locks: an order may be posted while another thread
+        # downloads, the version makes that download skip the cache
+        self._version += 1
+        self._portfolio_time = -float("inf")
+        self._orders_time = -float("inf")
@@ -0,0 +1,121 @@
+"""Column-wise decoding of GetCandles answers against the original per-candle loop."""
+
+import time
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+import numpy as np
+import pandas as pd
+import pytest
+from myLib.brokers.tinkoff.methods.get_candles import decode_candles, get_candles
+from myLib.brokers.types.price import quotations_to_nanos
+
+
+def canned_candles(n: int, seed: int) -> list[dict]:
+    """GetCandles JSON candles: Quotation prices, ISO UTC times, string volumes"""
+    rng = np.random.default_rng(seed)
+    start = datetime(2024, 1, 3, 7, 0)
+    close = 100 + np.cumsum(rng.normal(0, 0.5, n))
+    candles = []
+    for i in range(n):
+        prices = {}
+        for key, shift in [("open", 0.1), ("high", 0.6), ("low", -0.6), ("close", 0)]:
+            value = round(float(close[i]) + shift, 9)
+            units = int(np.floor(value))
+            prices[key] = {"units": str(units), "nano": round((value - units) * 1e9)}
+        candles.append(
+            {
+                **prices,
+                "volume": str(int(rng.integers(1, 10_000))),
+                "time": (start + timedelta(minutes=5 * i)).strftime(
+                    "%Y-%m-%dT%H:%M:%SZ"
+                ),
+                "isComplete": i < n - 1,
+            }
+        )
+    return candles
+
+
+def reference_decode(candles: list[dict], is_complete: bool = True) -> pd.DataFrame:
+    """Candles as get_candles decoded them before, one dict per candle"""
+    data = []
+    for candle in candles:
+        if not is_complete or candle["isComplete"]:
+            data.append(
+                {
+                    "DATE": (
+                        datetime.strptime(candle["time"], "%Y-%m-%dT%H:%M:%SZ")
+                        + timedelta(hours=3)
+                    ).strftime("%Y-%m-%dT%H:%M:%SZ"),
+                    "OPEN": float(candle["open"]["units"])
+                    + float(candle["open"]["nano"]) / 1e9,
+                    "HIGH": float(candle["high"]["units"])
+                    + float(candle["high"]["nano"]) / 1e9,
+                    "LOW": float(candle["low"]["units"])
+                    + float(candle["low"]["nano"]) / 1e9,
+                    "CLOSE": float(candle["close"]["units"])
+                    + float(candle["close"]["nano"]) / 1e9,
+                    "VOLUME": candle["volume"],
+                }
+            )
+    return pd.DataFrame(data)
+
+
+def as_before(df: pd.DataFrame) -> pd.DataFrame:
+    """Brings the reference to the new dtypes: DATE parsed, VOLUME int64"""
+    df = df.copy()
+    df["DATE"] = pd.to_datetime(df["DATE"].str.rstrip("Z")).astype("datetime64[ns]")
+    df["VOLUME"] = df["VOLUME"].astype(np.int64)
+    return df
+
+
+def fake_broker(candles: list[dict]) -> SimpleNamespace:
+    """A broker whose session answers every post with the canned candles"""
+    return SimpleNamespace(
+        session=SimpleNamespace(post=lambda url, payload: {"candles": candles})
+    )
+
+
+@pytest.mark.parametrize("is_complete", [True, False])
+def test_get_candles_matches_reference(is_complete):
+    candles = canned_candles(3000, 0)
+    result = get_candles(
+        fake_broker(candles), "FIGI", "from", "to", is_complete=is_complete
+    )
+    assert len(result) == (2999 if is_complete else 3000)
+    pd.testing.assert_frame_equal(
+        result, as_before(reference_decode(candles, is_complete))
+    )
+
+
+def test_fixed_point_prices_are_exact_nanos():
+    candles = canned_candles(500, 1)
+    result = decode_candles(candles, fixed_point=True)
+    for col in ["OPEN", "HIGH", "LOW", "CLOSE"]:
+        key = col.lower()
+        units = np.array([int(candle[key]["units"]) for candle in candles])
+        nano = np.array([candle[key]["nano"] for candle in candles])
+        assert result[col].dtype == np.int64
+        np.testing.assert_array_equal(
+            result[col].to_numpy(), quotations_to_nanos(units, nano)
+        )
+
+
+def test_empty_answer_keeps_columns():
+    result = decode_candles([])
+    assert list(result.columns) == ["DATE", "OPEN", "HIGH", "LOW", "CLOSE", "VOLUME"]
+    assert result.empty
+
+
+def test_decoding_is_faster_than_per_candle_loop():
+    candles = canned_candles(50_000, 2)
+
+    start = time.perf_counter()
+    result = decode_candles(candles)
+    current = time.perf_counter() - start
+
+    start = time.perf_counter()
+    reference = reference_decode(candles, is_complete=False)
+    before = time.perf_counter() - start
+
+    pd.testing.assert_frame_equal(result, as_before(reference))
+    assert before / current >= 2
@@ -0,0 +1,74 @@
+"""Token buckets of the Tinkoff rate limiter."""
+
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from myLib.brokers.tinkoff.rate_limit import (
+    DEFAULT_RATE_LIMITS,
+    READ_PRIORITY,
+    RateLimiter,
+    _TokenBucket,
+)
+
+URL = "https://invest-public-api.tinkoff.ru/rest/tinkoff.public.invest.api.contract.v1.OperationsService/GetPortfolio"
+
+# Longest time a call that found a token may spend on the lock
+NO_WAIT = 0.05
+
+
+def acquire_concurrently(limiter: RateLimiter, calls: int) -> list[float]:
+    """Sends calls at once from as many threads, returns their waiting times"""
+    with ThreadPoolExecutor(max_workers=calls) as executor:
+        return list(executor.map(lambda _: limiter.acquire(URL), range(calls)))
+
+
+# Tenth of the quota: 20 calls of OperationsService go out at once
+@pytest.mark.parametrize(
+    "calls", [1, 10, DEFAULT_RATE_LIMITS["OperationsService"] // 10]
+)
+def test_calls_within_burst_do_not_wait(calls):
+    waits = acquire_concurrently(RateLimiter(), calls)
+    assert max(waits) < NO_WAIT
+
+
+def test_calls_beyond_burst_are_spaced_at_the_rate():
+    # 600 per minute: a bucket of 60 calls, then one token every 0.1 s
+    limiter = RateLimiter({"OperationsService": 600})
+    waits = sorted(acquire_concurrently(limiter, 62))
+    assert max(waits[:60]) < NO_WAIT
+    assert waits[-1] >= 0.15
+    assert limiter.stats()["OperationsService"]["calls"] == 62
+
+
+@pytest.mark.parametrize("burst", [None, 5, 20])
+def test_calls_per_rolling_window_never_exceed_quota(burst):
+    # 20 calls per 0.5 s window instead of per minute
+    quota, window = 20, 0.5
+    bucket = _TokenBucket(quota, burst, window)
+    granted = []
+
+    class Recorded(deque):
+        """Keeps every grant time, not only the last quota"""
+
+        def append(self, value: float) -> None:
+            super().append(value)
+            granted.append(value)
+
+    bucket._granted = Recorded(maxlen=quota)
+    with ThreadPoolExecutor(max_workers=70) as executor:
+        list(executor.map(lambda _: bucket.acquire(READ_PRIORITY), range(70)))
+
+    granted.sort()
+    assert len(granted) == 70
+    # Any quota + 1 calls in a row span at least a window
+    for first, last in zip(granted, granted[quota:]):
+        assert last - first >= window
+    # and throughput stays close to the quota
+    assert granted[-1] - granted[0] < (70 / quota + 1) * window
+
+
+def test_burst_limits_calls_at_once():
+    limiter = RateLimiter({"OperationsService": 600}, burst=2)
+    waits = sorted(acquire_concurrently(limiter, 3))
+    assert max(waits[:2]) < NO_WAIT
+    assert waits[-1] >= 0.05
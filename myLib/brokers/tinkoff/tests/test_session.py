@@ -0,0 +1,169 @@
+"""Keep-alive, retries and latency stats of TinkoffSession against a local HTTP stand-in."""
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pytest
+import requests
+from myLib.brokers.tinkoff.session import TinkoffSession
+
+SERVICE = "/rest/tinkoff.public.invest.api.contract.v1.OperationsService"
+
+
+class TinkoffStandIn(ThreadingHTTPServer):
+    """
+    Answers POST requests with {"path": ...} and counts connections and requests.
+
+    answers maps a method name to the statuses to send before the first 200,
+    a status of None stalls the answer until the client gives up.
+    """
+
+    daemon_threads = True
+
+    def __init__(self) -> None:
+        super().__init__(("127.0.0.1", 0), _Handler)
+        self.answers: dict[str, list[int | None]] = {}
+        self.connections = 0
+        self.requests: list[str] = []
+        self.lock = threading.Lock()
+
+    def url(self, method: str) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}{SERVICE}/{method}"
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+    disable_nagle_algorithm = True
+
+    def setup(self) -> None:
+        super().setup()
+        with self.server.lock:
+            self.server.connections += 1
+
+    def log_message(self, *args) -> None:
+        pass
+
+    def do_POST(self) -> None:
+        self.rfile.read(int(self.headers["Content-Length"]))
+        method = self.path.rsplit("/", 1)[-1]
+        with self.server.lock:
+            self.server.requests.append(method)
+            statuses = self.server.answers.get(method)
+            status = statuses.pop(0) if statuses else 200
+
+        if status is None:
+            time.sleep(0.5)  # longer than the read timeout of the test
+            return
+
+        body = json.dumps({"path": self.path}).encode() if status == 200 else b""
+        self.send_response(status)
+        if status == 429:
+            self.send_header("Retry-After", "0")
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+@pytest.fixture
+def stand_in():
+    server = TinkoffStandIn()
+    thread = threading.Thread(
+        target=server.serve_forever, kwargs={"poll_interval": 0.01}, daemon=True
+    )
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def session():
+    session = TinkoffSession({"Authorization": "Bearer token"}, backoff_factor=0)
+    yield session
+    session.close()
+
+
+def test_calls_reuse_one_connection(stand_in, session):
+    url = stand_in.url("GetPortfolio")
+    for _ in range(20):
+        assert session.post(url, {"accountId": "1"}) == {
+            "path": f"{SERVICE}/GetPortfolio"
+        }
+    assert stand_in.connections == 1
+
+
+@pytest.mark.parametrize("statuses", [[429], [503, 502], [500, 504, 429]])
+def test_rate_limit_and_server_errors_are_retried(stand_in, session, statuses):
+    stand_in.answers["GetOrders"] = list(statuses)
+    assert session.post(stand_in.url("GetOrders"), {}) == {
+        "path": f"{SERVICE}/GetOrders"
+    }
+    assert stand_in.requests == ["GetOrders"] * (len(statuses) + 1)
+    assert session.latency_stats()["GetOrders"]["errors"] == 0
+
+
+def test_retries_are_limited(stand_in):
+    stand_in.answers["GetOrders"] = [503] * 5
+    session = TinkoffSession({}, retries=2, backoff_factor=0)
+    with pytest.raises(requests.HTTPError):
+        session.post(stand_in.url("GetOrders"), {})
+    assert len(stand_in.requests) == 3
+
+
+def test_client_errors_are_not_retried(stand_in, session):
+    stand_in.answers["PostOrder"] = [400]
+    with pytest.raises(requests.HTTPError):
+        session.post(stand_in.url("PostOrder"), {})
+    assert stand_in.requests == ["PostOrder"]
+
+
+def test_timed_out_order_is_not_sent_twice(stand_in):
+    # The order may have reached the exchange, repeating it could double it
+    stand_in.answers["PostOrder"] = [None]
+    session = TinkoffSession({}, timeout=(1, 0.1), backoff_factor=0)
+    with pytest.raises(requests.ConnectionError):
+        session.post(stand_in.url("PostOrder"), {})
+    assert stand_in.requests == ["PostOrder"]
+    assert session.latency_stats()["PostOrder"]["errors"] == 1
+
+
+def test_latency_stats_per_method(stand_in, session):
+    stand_in.answers["PostOrder"] = [400]
+    for _ in range(3):
+        session.post(stand_in.url("GetPortfolio"), {})
+    with pytest.raises(requests.HTTPError):
+        session.post(stand_in.url("PostOrder"), {})
+
+    stats = session.latency_stats()
+    assert set(stats) == {"GetPortfolio", "PostOrder"}
+    assert stats["GetPortfolio"]["calls"] == 3 and stats["GetPortfolio"]["errors"] == 0
+    assert stats["PostOrder"] == {**stats["PostOrder"], "calls": 1, "errors": 1}
+    portfolio = stats["GetPortfolio"]
+    assert 0 < portfolio["p50_ms"] <= portfolio["p95_ms"] <= portfolio["max_ms"]
+
+    session.reset_stats()
+    assert session.latency_stats() == {}
+
+
+def test_round_trips_are_faster_than_new_connections(stand_in, session):
+    url = stand_in.url("GetPortfolio")
+    calls = 200
+
+    start = time.perf_counter()
+    for _ in range(calls):
+        response = requests.post(url, json={"accountId": "1"}, timeout=5)
+        response.raise_for_status()
+        response.json()
+    per_call = time.perf_counter() - start
+    assert stand_in.connections == calls
+
+    start = time.perf_counter()
+    for _ in range(calls):
+        session.post(url, {"accountId": "1"})
+    pooled = time.perf_counter() - start
+
+    assert stand_in.connections == calls + 1
+    assert pooled < per_call
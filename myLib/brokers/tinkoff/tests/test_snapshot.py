@@ -0,0 +1,146 @@
+"""TTL, invalidation and sharing of the account snapshot."""
+
+import threading
+import time
+from types import SimpleNamespace
+from myLib.brokers.tinkoff.methods.cancel_order import cancel_order
+from myLib.brokers.tinkoff.methods.get_orders import get_orders
+from myLib.brokers.tinkoff.methods.post_order import post_order
+from myLib.brokers.tinkoff.snapshot import AccountSnapshot
+
+ORDERS = [
+    {"orderId": "1", "figi": "SBER"},
+    {"orderId": "2", "figi": "GAZP"},
+    {"orderId": "3", "figi": "SBER"},
+]
+
+
+class Fetch:
+    """Download stand-in counting its calls"""
+
+    def __init__(self, result) -> None:
+        self.result = result
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        return self.result
+
+
+def test_portfolio_is_downloaded_once_per_ttl():
+    snapshot = AccountSnapshot(ttl=0.2)
+    fetch = Fetch({"totalAmountPortfolio": 1})
+
+    for _ in range(5):
+        assert snapshot.portfolio(fetch) == {"totalAmountPortfolio": 1}
+    assert fetch.calls == 1
+    assert (snapshot.hits, snapshot.misses) == (4, 1)
+
+    time.sleep(0.25)
+    snapshot.portfolio(fetch)
+    assert fetch.calls == 2
+
+
+def test_orders_are_served_per_figi_from_one_download():
+    snapshot = AccountSnapshot(ttl=60)
+    fetch_all = Fetch(ORDERS)
+
+    assert snapshot.orders("SBER", fetch_all) == [ORDERS[0], ORDERS[2]]
+    assert snapshot.orders("GAZP", fetch_all) == [ORDERS[1]]
+    assert snapshot.orders("LKOH", fetch_all) == []
+    assert fetch_all.calls == 1
+
+    # Callers get their own lists
+    snapshot.orders("SBER", fetch_all).clear()
+    assert len(snapshot.orders("SBER", fetch_all)) == 2
+
+
+def test_zero_ttl_downloads_every_time():
+    snapshot = AccountSnapshot(ttl=0)
+    fetch = Fetch({})
+    for _ in range(3):
+        snapshot.portfolio(fetch)
+    assert fetch.calls == 3
+
+
+def test_invalidate_downloads_again():
+    snapshot = AccountSnapshot(ttl=60)
+    fetch, fetch_all = Fetch({}), Fetch(ORDERS)
+    snapshot.portfolio(fetch)
+    snapshot.orders("SBER", fetch_all)
+
+    snapshot.invalidate()
+    snapshot.portfolio(fetch)
+    snapshot.orders("SBER", fetch_all)
+    assert (fetch.calls, fetch_all.calls) == (2, 2)
+
+
+def test_download_overtaken_by_an_order_is_not_cached():
+    snapshot = AccountSnapshot(ttl=60)
+    versions = iter([ORDERS[:1], ORDERS])
+
+    def fetch_all():
+        orders = next(versions)
+        snapshot.invalidate()  # an order is posted while the list downloads
+        return orders
+
+    assert snapshot.orders("SBER", fetch_all) == ORDERS[:1]
+    assert snapshot.orders("SBER", fetch_all) == [ORDERS[0], ORDERS[2]]
+
+
+def test_concurrent_callers_share_one_download():
+    snapshot = AccountSnapshot(ttl=60)
+    calls = []
+
+    def slow_fetch():
+        calls.append(1)
+        time.sleep(0.05)
+        return {"totalAmountPortfolio": 1}
+
+    threads = [
+        threading.Thread(target=snapshot.portfolio, args=(slow_fetch,))
+        for _ in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(calls) == 1
+    assert (snapshot.hits, snapshot.misses) == (7, 1)
+
+
+def test_snapshot_is_shared_per_account():
+    first = AccountSnapshot.for_account("test-account-1")
+    assert AccountSnapshot.for_account("test-account-1") is first
+    assert AccountSnapshot.for_account("test-account-2") is not first
+
+
+class Session:
+    """TinkoffSession stand-in recording the called API methods"""
+
+    def __init__(self) -> None:
+        self.methods = []
+
+    def post(self, url: str, payload: dict) -> dict:
+        self.methods.append(url.rsplit("/", 1)[-1])
+        return {"orders": ORDERS}
+
+
+def test_broker_orders_invalidate_the_snapshot():
+    broker = SimpleNamespace(
+        account_id="1", session=Session(), snapshot=AccountSnapshot(ttl=60)
+    )
+
+    get_orders(broker, "SBER")
+    get_orders(broker, "GAZP")
+    post_order(broker, "ORDER_TYPE_LIMIT", "SBER", 1, "ORDER_DIRECTION_BUY", 250.5)
+    get_orders(broker, "SBER")
+    cancel_order(broker, "1")
+    get_orders(broker, "SBER")
+    assert broker.session.methods == [
+        "GetOrders",
+        "PostOrder",
+        "GetOrders",
+        "CancelOrder",
+        "GetOrders",
+    ]
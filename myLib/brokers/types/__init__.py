@@ -9,14 +9,44 @@ Classes:
 Type Definitions:
     LimitOrderTypedDict: TypedDict for limit order parameters
     MarketOrderTypedDict: TypedDict for market order parameters
+    Quotation: TypedDict for Tinkoff {units, nano} amounts
+
+Fixed-point prices:
+    int64 nano units (1e-9) with exact conversions from Quotation, see price.py
 """
 
 from .broker import BrokerAbstractClass
 from .orders import LimitOrderTypedDict, MarketOrderTypedDict, OrderType
+from .price import (
+    Quotation,
+    NANO,
+    CENT,
+    PRICE_DTYPE,
+    quotation_to_nanos,
+    nanos_to_quotation,
+    price_to_nanos,
+    nanos_to_price,
+    round_nanos,
+    quotations_to_nanos,
+    prices_to_nanos,
+    nanos_to_prices,
+)
 
 __all__ = [
     "BrokerAbstractClass",
     "LimitOrderTypedDict",
     "MarketOrderTypedDict",
     "OrderType",
+    "Quotation",
+    "NANO",
+    "CENT",
+    "PRICE_DTYPE",
+    "quotation_to_nanos",
+    "nanos_to_quotation",
+    "price_to_nanos",
+    "nanos_to_price",
+    "round_nanos",
+    "quotations_to_nanos",
+    "prices_to_nanos",
+    "nanos_to_prices",
 ]
@@ -5,7 +5,7 @@ along with an Enum for order type constants. This ensures type safety and clear
 of order structures throughout the trading system.
 """
 
-from typing import TypedDict, Literal
+from typing import TypedDict, Literal, NotRequired
 from enum import Enum
 
 
@@ -37,12 +37,14 @@ class BaseOrderTypedDict(TypedDict):
         strategy: Name of the strategy that generated this order
         signal: Trading signal that triggered this order
         size: Number of asset units to buy/sell
+        instrument_id: Instrument of the order, used by brokers trading many instruments
     """
 
     id: float
     strategy: str
     signal: str
     size: int
+    instrument_id: NotRequired[str]
 
 
 class LimitOrderTypedDict(BaseOrderTypedDict):
@@ -0,0 +1,103 @@
+"""Fixed-point prices.
+
+Prices are stored as int64 numbers of nano units (1e-9), the resolution of
+the Tinkoff Quotation type {"units": ..., "nano": ...}. Conversions between
+Quotation and fixed-point are exact, sums of fixed-point prices have no float
+error, so prices can be compared with == without rounding. int64 holds
+values up to about 9.2 billion units.
+"""
+
+from typing import TypedDict
+import numpy as np
+
+__all__ = [
+    "Quotation",
+    "NANO",
+    "CENT",
+    "PRICE_DTYPE",
+    "quotation_to_nanos",
+    "nanos_to_quotation",
+    "price_to_nanos",
+    "nanos_to_price",
+    "round_nanos",
+    "quotations_to_nanos",
+    "prices_to_nanos",
+    "nanos_to_prices",
+]
+
+NANO = 1_000_000_000  # nanos in one unit
+CENT = NANO // 100  # nanos in 0.01
+PRICE_DTYPE = np.dtype(np.int64)
+
+
+class Quotation(TypedDict):
+    """Tinkoff Quotation / MoneyValue amount.
+
+    Attributes:
+        units: Integer part, a string in REST answers
+        nano: Fractional part in 1e-9 units, has the sign of units
+    """
+
+    units: int | str
+    nano: int
+
+
+def quotation_to_nanos(value: Quotation) -> int:
+    """Returns the exact fixed-point value of a Quotation"""
+    return int(value["units"]) * NANO + int(value["nano"])
+
+
+def nanos_to_quotation(nanos: int) -> Quotation:
+    """Returns a Quotation for a fixed-point value, nano has the sign of units"""
+    nanos = int(nanos)
+    units = abs(nanos) // NANO
+    nano = abs(nanos) - units * NANO
+    if nanos < 0:
+        return {"units": -units, "nano": -nano}
+    return {"units": units, "nano": nano}
+
+
+def price_to_nanos(price: float, tick: int = 1) -> int:
+    """
+    Returns the fixed-point value of a float price.
+
+    Args:
+        price: Price in units
+        tick: Step to round to in nanos, for example CENT
+    """
+    return round_nanos(round(float(price) * NANO), tick)
+
+
+def nanos_to_price(nanos: int) -> float:
+    """Returns the float price of a fixed-point value"""
+    return int(nanos) / NANO
+
+
+def round_nanos(nanos: int, tick: int) -> int:
+    """Rounds a fixed-point value to the nearest multiple of tick, halves away from zero"""
+    if tick == 1:
+        return int(nanos)
+    steps, remainder = divmod(abs(int(nanos)), tick)
+    if 2 * remainder >= tick:
+        steps += 1
+    return steps * tick if nanos >= 0 else -steps * tick
+
+
+def quotations_to_nanos(units: np.ndarray, nano: np.ndarray) -> np.ndarray:
+    """Vectorized quotation_to_nanos for arrays of units and nano"""
+    return np.asarray(units, dtype=np.int64) * NANO + np.asarray(nano, dtype=np.int64)
+
+
+def prices_to_nanos(prices: np.ndarray, tick: int = 1) -> np.ndarray:
+    """Vectorized price_to_nanos, NaN prices are not allowed"""
+    nanos = np.rint(np.asarray(prices, dtype=np.float64) * NANO).astype(np.int64)
+    if tick == 1:
+        return nanos
+    # Round half away from zero, like round_nanos
+    steps = (np.abs(nanos) + tick // 2) // tick
+    return np.sign(nanos) * steps * tick
+
+
+def nanos_to_prices(nanos: np.ndarray) -> np.ndarray:
+    """Vectorized nanos_to_price"""
+    return np.asarray(nanos, dtype=np.int64) / NANO
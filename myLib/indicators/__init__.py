@@ -1,4 +1,21 @@
-from .price_chanel import price_chanel
-from .super_trend import super_trend
+from .cache import IndicatorCache
+from .join import join_indicators
+from .price_chanel import price_chanel, price_chanel_columns, PriceChanelStream
+from .super_trend import (
+    super_trend,
+    super_trend_columns,
+    super_trend_names,
+    SuperTrendStream,
+)
 
-__all__ = ["price_chanel", "super_trend"]
+__all__ = [
+    "price_chanel",
+    "price_chanel_columns",
+    "super_trend",
+    "super_trend_columns",
+    "super_trend_names",
+    "join_indicators",
+    "PriceChanelStream",
+    "SuperTrendStream",
+    "IndicatorCache",
+]
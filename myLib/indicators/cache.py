@@ -0,0 +1,200 @@
+"""
+Memoization of indicator results.
+
+Results are keyed by a fingerprint of the frame (length, index and DATE
+bounds, sampled OHLCV rows and column sums) plus the indicator name and
+parameters, kept in memory under a byte budget with LRU eviction and
+optionally persisted to disk as .npz files, one array per column.
+"""
+
+import hashlib
+import logging
+import os
+from collections import OrderedDict
+from typing import Callable
+import numpy as np
+import pandas as pd
+from .join import join_indicators
+
+__all__ = ["IndicatorCache"]
+
+logger = logging.getLogger("IndicatorCache")
+
+_FINGERPRINT_COLUMNS = ["OPEN", "HIGH", "LOW", "CLOSE", "VOLUME"]
+_TIME_COLUMN = "DATE"
+
+# Rows hashed by the fingerprint: evenly spaced ones and the last ones,
+# where live frames grow and get corrected
+_SAMPLE_SIZE = 256
+_TAIL_SIZE = 64
+
+
+class IndicatorCache:
+    """
+    LRU cache for indicator columns.
+
+    Only the columns an indicator adds are stored, so entries stay small even
+    for wide frames.
+
+    Example:
+        cache = IndicatorCache(max_bytes=512 * 2**20, directory="cache")
+        df = cache.compute(price_chanel, df, 20)
+        df = cache.compute(super_trend, df, [{"period": 10, "multiplier": 3}])
+        columns = cache.get_columns(price_chanel_columns, df, 20)
+    """
+
+    def __init__(self, max_bytes: int = 256 * 2**20, directory: str | None = None):
+        """
+        Args:
+            max_bytes: Memory budget for cached arrays
+            directory: Folder for persistent entries, None keeps them in memory only
+        """
+        self.max_bytes = max_bytes
+        self.directory = directory
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[str, dict[str, np.ndarray]] = OrderedDict()
+        self._size = 0
+
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+
+    @staticmethod
+    def fingerprint(df: pd.DataFrame) -> str:
+        """
+        Returns a fingerprint of the index, DATE and OHLCV columns of the frame.
+
+        Hashing every value costs as much as recalculating an indicator, so
+        only the length, sampled rows of the index and the columns, their
+        last rows and the sum of every OHLCV column are hashed. Frames with
+        other dates or prices get other fingerprints; an in-place edit that
+        keeps the sampled values and the column sums does not, call clear()
+        after such edits.
+        """
+        n = len(df)
+        positions = _sample_positions(n)
+        digest = hashlib.blake2b(str(n).encode(), digest_size=16)
+        digest.update(_values_bytes(df.index[positions].to_numpy()))
+
+        for col in [_TIME_COLUMN, *_FINGERPRINT_COLUMNS]:
+            if col not in df.columns:
+                continue
+            values = df[col].to_numpy()
+            digest.update(col.encode())
+            digest.update(_values_bytes(values[positions]))
+            if values.dtype.kind in "biuf":
+                digest.update(_values_bytes(values.sum(keepdims=True)))
+        return digest.hexdigest()
+
+    def get_columns(
+        self, func: Callable, df: pd.DataFrame, *params
+    ) -> dict[str, np.ndarray]:
+        """
+        Returns the columns func(df, *params) adds to the frame.
+
+        func is either an indicator returning a new frame (price_chanel) or
+        one returning only its columns (price_chanel_columns). It is called
+        on the DATE and OHLCV columns the fingerprint covers, so an entry holds
+        every column of the indicator, whatever else the frame has. The arrays
+        are read-only and shared between calls.
+        """
+        key = self._key(func, self.fingerprint(df), params)
+
+        columns = self._entries.get(key)
+        if columns is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return columns
+
+        columns = self._load(key)
+        if not columns:
+            self.misses += 1
+            base = df[
+                [col for col in [_TIME_COLUMN, *_FINGERPRINT_COLUMNS] if col in df]
+            ]
+            result = func(base, *params)
+            if isinstance(result, dict):
+                columns = {col: np.array(values) for col, values in result.items()}
+            else:
+                columns = {
+                    col: result[col].to_numpy(copy=True)
+                    for col in result.columns
+                    if col not in base.columns
+                }
+            if not columns:
+                return columns  # nothing to reuse, keep it out of the cache
+            self._save(key, columns)
+        else:
+            self.hits += 1
+
+        for values in columns.values():
+            values.setflags(write=False)
+        self._store(key, columns)
+        return columns
+
+    def compute(self, func: Callable, df: pd.DataFrame, *params) -> pd.DataFrame:
+        """Returns the same frame as func(df, *params), using cached columns"""
+        columns = self.get_columns(func, df, *params)
+        return join_indicators(df, columns)
+
+    def clear(self) -> None:
+        """Removes all entries from memory, persisted entries are kept"""
+        self._entries.clear()
+        self._size = 0
+
+    @staticmethod
+    def _key(func: Callable, fingerprint: str, params: tuple) -> str:
+        name = f"{func.__module__}.{func.__qualname__}"
+        return hashlib.blake2b(
+            f"{name}|{fingerprint}|{params!r}".encode(), digest_size=16
+        ).hexdigest()
+
+    def _store(self, key: str, columns: dict[str, np.ndarray]) -> None:
+        size = sum(values.nbytes for values in columns.values())
+        if size > self.max_bytes:
+            return
+
+        self._entries[key] = columns
+        self._size += size
+
+        # Evict least recently used entries
+        while self._size > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self._size -= sum(values.nbytes for values in evicted.values())
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.npz")
+
+    def _load(self, key: str) -> dict[str, np.ndarray] | None:
+        if self.directory is None or not os.path.exists(self._path(key)):
+            return None
+        try:
+            with np.load(self._path(key), allow_pickle=False) as data:
+                return {col: data[col] for col in data.files}
+        except (OSError, ValueError) as e:
+            logger.error("Failed to load cached indicator %s: %s", key, e)
+            return None
+
+    def _save(self, key: str, columns: dict[str, np.ndarray]) -> None:
+        if self.directory is None:
+            return
+        tmp_path = f"{self._path(key)}.tmp"
+        with open(tmp_path, "wb") as file:
+            np.savez(file, **columns)
+        os.replace(tmp_path, self._path(key))
+
+
+def _sample_positions(n: int) -> np.ndarray:
+    """Returns the row positions hashed by IndicatorCache.fingerprint"""
+    if n <= _SAMPLE_SIZE + _TAIL_SIZE:
+        return np.arange(n)
+    step = (n - 1) / (_SAMPLE_SIZE - 1)
+    sampled = (np.arange(_SAMPLE_SIZE) * step).astype(np.int64)
+    return np.concatenate((sampled, np.arange(n - _TAIL_SIZE, n)))
+
+
+def _values_bytes(values: np.ndarray) -> bytes:
+    """Returns the bytes of an array, with its dtype, for hashing"""
+    if values.dtype.kind in "biufcmM":
+        return values.dtype.str.encode() + np.ascontiguousarray(values).tobytes()
+    return repr(values.tolist()).encode()  # strings, timezone-aware dates
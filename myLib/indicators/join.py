@@ -0,0 +1,47 @@
+import numpy as np
+import pandas as pd
+
+
+def join_indicators(
+    df: pd.DataFrame, *columns: dict[str, np.ndarray], inplace: bool = False
+) -> pd.DataFrame:
+    """
+    Joins indicator columns to the frame at once.
+
+    Parameters:
+        df: Base DataFrame
+        columns: Dictionaries of column name -> values, as returned by the
+            *_columns indicator functions. Later names replace earlier ones
+            and columns already in the frame
+        inplace: Add the columns to df itself instead of building a new frame
+
+    Returns:
+        DataFrame with the indicator columns
+
+    Example:
+        df = join_indicators(
+            df,
+            price_chanel_columns(df, 20),
+            super_trend_columns(df, [{"period": 10, "multiplier": 3}]),
+        )
+    """
+    new_columns: dict[str, np.ndarray] = {}
+    for cols in columns:
+        new_columns.update(cols)
+
+    if inplace:
+        for col, values in new_columns.items():
+            df[col] = values
+        return df
+
+    # Build the new frame with a single concat. Columns left by a previous
+    # run are replaced in their places
+    added = {col: values for col, values in new_columns.items() if col not in df}
+    if added:
+        result = pd.concat([df, pd.DataFrame(added, index=df.index)], axis=1)
+    else:
+        result = df.copy()
+    for col, values in new_columns.items():
+        if col not in added:
+            result[col] = values
+    return result
@@ -1,13 +1,105 @@
+from collections import deque
+import numpy as np
 import pandas as pd
+from .join import join_indicators
 
 
-def price_chanel(df: pd.DataFrame, period: int) -> pd.DataFrame:
-    result_df = df.copy()
+def price_chanel(df: pd.DataFrame, period: int, inplace: bool = False) -> pd.DataFrame:
+    """
+    Calculates the Price Channel indicator.
 
-    result_df[f"PC_{period}_HIGH"] = result_df["HIGH"].rolling(window=period).max()
-    result_df[f"PC_{period}_LOW"] = result_df["LOW"].rolling(window=period).min()
-    result_df[f"PC_{period}_MID"] = round(
-        (result_df[f"PC_{period}_HIGH"] + result_df[f"PC_{period}_LOW"]) / 2, 2
-    )
+    Parameters:
+        df: DataFrame with columns ['HIGH', 'LOW']
+        period: Window of the channel
+        inplace: Add the columns to df instead of returning a new DataFrame
 
-    return result_df
+    Returns:
+        DataFrame with PC_{period}_HIGH, PC_{period}_LOW and PC_{period}_MID columns
+    """
+    return join_indicators(df, price_chanel_columns(df, period), inplace=inplace)
+
+
+def price_chanel_columns(df: pd.DataFrame, period: int) -> dict[str, np.ndarray]:
+    """
+    Calculates the Price Channel indicator without copying the input frame.
+
+    Returns:
+        Dictionary of PC_{period}_HIGH, PC_{period}_LOW and PC_{period}_MID arrays
+    """
+    pc_high = df["HIGH"].rolling(window=period).max().to_numpy()
+    pc_low = df["LOW"].rolling(window=period).min().to_numpy()
+
+    return {
+        f"PC_{period}_HIGH": pc_high,
+        f"PC_{period}_LOW": pc_low,
+        f"PC_{period}_MID": np.round((pc_high + pc_low) / 2, 2),
+    }
+
+
+class PriceChanelStream:
+    """
+    Incremental Price Channel for live trading.
+
+    Keeps the rolling maximum of HIGH and minimum of LOW in monotonic deques,
+    so every new candle costs O(1) amortized instead of recalculating the
+    whole history. Values are identical bar for bar to price_chanel().
+
+    Example:
+        stream = PriceChanelStream(period=20)
+        for candle in candles:
+            values = stream.update(candle)  # {"PC_20_HIGH": ..., ...}
+    """
+
+    def __init__(self, period: int) -> None:
+        self.period = period
+        self._index = 0
+        self._highs: deque[tuple[int, float]] = deque()  # decreasing HIGH values
+        self._lows: deque[tuple[int, float]] = deque()  # increasing LOW values
+        self._high_col = f"PC_{period}_HIGH"
+        self._low_col = f"PC_{period}_LOW"
+        self._mid_col = f"PC_{period}_MID"
+
+    def update(self, candle) -> dict[str, float]:
+        """
+        Adds a closed candle and returns the indicator values for it.
+
+        Args:
+            candle: Mapping (dict, pd.Series) with 'HIGH' and 'LOW' keys
+
+        Returns:
+            dict: PC_{period}_HIGH, PC_{period}_LOW and PC_{period}_MID values,
+              NaN until the window is filled
+        """
+        index = self._index
+        self._index += 1
+        high = float(candle["HIGH"])
+        low = float(candle["LOW"])
+
+        while self._highs and self._highs[-1][1] <= high:
+            self._highs.pop()
+        self._highs.append((index, high))
+        while self._lows and self._lows[-1][1] >= low:
+            self._lows.pop()
+        self._lows.append((index, low))
+
+        # Drop values that left the window
+        first_index = index - self.period + 1
+        if self._highs[0][0] < first_index:
+            self._highs.popleft()
+        if self._lows[0][0] < first_index:
+            self._lows.popleft()
+
+        if first_index < 0:
+            return {
+                self._high_col: np.nan,
+                self._low_col: np.nan,
+                self._mid_col: np.nan,
+            }
+
+        pc_high = self._highs[0][1]
+        pc_low = self._lows[0][1]
+        return {
+            self._high_col: pc_high,
+            self._low_col: pc_low,
+            self._mid_col: np.round((pc_high + pc_low) / 2, 2),
+        }
@@ -1,91 +1,294 @@
 import pandas as pd
 import talib
 import numpy as np
+from .join import join_indicators
 
+try:
+    from numba import njit
+except ImportError:  # numba is optional, the pure-Python loop is used instead
+    njit = None
 
-def super_trend(df: pd.DataFrame, config: list) -> pd.DataFrame:
+
+def _super_trend_loop(
+    close_arr: np.ndarray,
+    basic_upper_arr: np.ndarray,
+    basic_lower_arr: np.ndarray,
+    start_idx: int,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Runs the SuperTrend recursion over prepared basic bands.
+
+    Every row of the band arrays is an independent configuration, so all
+    multipliers sharing one ATR period are processed in a single sweep.
+
+    Parameters:
+        close_arr: CLOSE prices, shape (n,)
+        basic_upper_arr: hl2 + multiplier * ATR, shape (k, n)
+        basic_lower_arr: hl2 - multiplier * ATR, shape (k, n)
+        start_idx: First index with valid ATR
+
+    Returns:
+        Tuple of (st_upper, st_lower, trend) arrays of shape (k, n)
+    """
+    k, n = basic_upper_arr.shape
+    st_upper = np.full((k, n), np.nan)
+    st_lower = np.full((k, n), np.nan)
+    trend = np.zeros((k, n), dtype=np.int64)  # 1 = upper trend, -1 = lower trend
+
+    for j in range(k):
+        upper = st_upper[j]
+        lower = st_lower[j]
+        direction = trend[j]
+        basic_upper = basic_upper_arr[j]
+        basic_lower = basic_lower_arr[j]
+
+        # Initialize first value (start with lower trend)
+        upper[start_idx] = basic_upper[start_idx]
+        lower[start_idx] = basic_lower[start_idx]
+        direction[start_idx] = 1
+
+        for i in range(start_idx + 1, n):
+            # Skip NaN values
+            if np.isnan(basic_upper[i]) or np.isnan(basic_lower[i]):
+                continue
+
+            # Calculate lines BASED ON PREVIOUS TREND.
+            # Comparisons are spelled out to keep the NaN semantics of min()/max()
+            if direction[i - 1] == 1:  # Previous trend was upper
+                prev_upper = upper[i - 1]
+                upper[i] = prev_upper if prev_upper < basic_upper[i] else basic_upper[i]
+                lower[i] = basic_lower[i]
+            else:  # Previous trend was lower
+                prev_lower = lower[i - 1]
+                upper[i] = basic_upper[i]
+                lower[i] = prev_lower if prev_lower > basic_lower[i] else basic_lower[i]
+
+            # Determine current trend BASED ON CURRENT CANDLE CLOSE
+            if direction[i - 1] == 1 and close_arr[i] > upper[i]:
+                direction[i] = -1  # Switch to upper trend
+            elif direction[i - 1] == -1 and close_arr[i] < lower[i]:
+                direction[i] = 1  # Switch to lower trend
+            else:
+                direction[i] = direction[i - 1]  # Keep previous trend
+
+    return st_upper, st_lower, trend
+
+
+# Compiled kernel when numba is installed, otherwise the same loop in pure Python
+_super_trend_kernel = (
+    njit(cache=True, nogil=True)(_super_trend_loop) if njit else _super_trend_loop
+)
+
+
+def super_trend_names(period: int, multiplier: float) -> tuple[str, str]:
+    """
+    Returns the column names of a SuperTrend configuration.
+
+    The multiplier is normalized, so 3, 3.0 and np.float64(3.0) name the same
+    columns: whole multipliers are written without a fraction, others as the
+    shortest repr of the float.
+
+    Returns:
+        Tuple of (ST_UPPER_{period}_{multiplier}, ST_LOWER_{period}_{multiplier})
+    """
+    multiplier = float(multiplier)
+    label = str(int(multiplier)) if multiplier.is_integer() else repr(multiplier)
+    return f"ST_UPPER_{period}_{label}", f"ST_LOWER_{period}_{label}"
+
+
+def super_trend(df: pd.DataFrame, config: list, inplace: bool = False) -> pd.DataFrame:
     """
     Calculates the SuperTrend indicator for multiple configurations.
 
     Parameters:
         df: DataFrame with columns ['OPEN', 'HIGH', 'LOW', 'CLOSE']
         config: List of dictionaries with indicator parameters [{'period': int, 'multiplier': int}]
+        inplace: Add the columns to df instead of returning a new DataFrame
 
     Returns:
-        New DataFrame with added columns for each configuration
+        DataFrame with added columns for each configuration
     """
-    # Create a copy of DataFrame for safe column addition
-    df = df.copy()
+    return join_indicators(df, super_trend_columns(df, config), inplace=inplace)
 
-    # For each configuration in the list
-    for params in config:
-        period = params["period"]
-        multiplier = params["multiplier"]
 
-        # Calculate ATR
-        atr = talib.ATR(df["HIGH"], df["LOW"], df["CLOSE"], timeperiod=period)
+def super_trend_columns(df: pd.DataFrame, config: list) -> dict[str, np.ndarray]:
+    """
+    Calculates the SuperTrend indicator for multiple configurations.
+
+    Configurations are batched: ATR is calculated once per distinct period,
+    hl2 is shared and the recursion runs for all multipliers of a period in
+    one sweep. The recursion runs in a numba-compiled kernel when numba is installed
+    (pip install myLib[fast]) and falls back to pure Python otherwise.
+    Both paths give identical results.
+
+    Parameters:
+        df: DataFrame with columns ['OPEN', 'HIGH', 'LOW', 'CLOSE']
+        config: List of dictionaries with indicator parameters [{'period': int, 'multiplier': int}]
+
+    Returns:
+        Dictionary of ST_UPPER_{period}_{multiplier} and
+        ST_LOWER_{period}_{multiplier} arrays (see super_trend_names), the
+        input frame is not copied
+    """
+    n = len(df)
+    high = df["HIGH"].to_numpy(dtype=np.float64)
+    low = df["LOW"].to_numpy(dtype=np.float64)
+    close = np.ascontiguousarray(df["CLOSE"].to_numpy(dtype=np.float64))
 
-        # Basic lines
-        hl2 = (df["HIGH"] + df["LOW"]) / 2
-        basic_upper = hl2 + multiplier * atr
-        basic_lower = hl2 - multiplier * atr
+    # Basic line shared by all configurations
+    hl2 = (high + low) / 2
 
-        # Initialize result arrays
-        n = len(df)
-        st_upper = np.full(n, np.nan)
-        st_lower = np.full(n, np.nan)
-        trend = np.zeros(n, dtype=int)  # 1 = upper trend, -1 = lower trend
+    # Group multipliers by period, keeping the order of the config
+    multipliers_by_period: dict[int, list] = {}
+    for params in config:
+        multipliers = multipliers_by_period.setdefault(params["period"], [])
+        if params["multiplier"] not in multipliers:
+            multipliers.append(params["multiplier"])
 
+    bands: dict[tuple, tuple[np.ndarray, np.ndarray]] = {}
+    for period, multipliers in multipliers_by_period.items():
         # First index with valid ATR
         start_idx = period
         if start_idx >= n:
             # Add empty columns if not enough data
-            df[f"ST_UPPER_{period}_{multiplier}"] = np.nan
-            df[f"ST_LOWER_{period}_{multiplier}"] = np.nan
+            for multiplier in multipliers:
+                bands[(period, multiplier)] = (np.full(n, np.nan), np.full(n, np.nan))
             continue
 
-        # Convert to numpy arrays for speed
-        close_arr = df["CLOSE"].values
-        basic_upper_arr = basic_upper.values
-        basic_lower_arr = basic_lower.values
+        # Calculate ATR once for all multipliers of this period
+        atr = talib.ATR(high, low, close, timeperiod=period)
 
-        # Initialize first value (start with lower trend)
-        st_upper[start_idx] = basic_upper_arr[start_idx]
-        st_lower[start_idx] = basic_lower_arr[start_idx]
-        trend[start_idx] = 1  # Start with lower trend
+        # Basic lines, one row per multiplier
+        offsets = np.array(multipliers, dtype=np.float64)[:, None] * atr
+        basic_upper = hl2 + offsets
+        basic_lower = hl2 - offsets
 
         # Main calculation loop
-        for i in range(start_idx + 1, n):
-            # Skip NaN values
-            if np.isnan(basic_upper_arr[i]) or np.isnan(basic_lower_arr[i]):
-                continue
-
-            # Calculate lines BASED ON PREVIOUS TREND
-            if trend[i - 1] == 1:  # Previous trend was upper
-                st_upper[i] = min(basic_upper_arr[i], st_upper[i - 1])
-                st_lower[i] = basic_lower_arr[i]
-            else:  # Previous trend was lower
-                st_upper[i] = basic_upper_arr[i]
-                st_lower[i] = max(basic_lower_arr[i], st_lower[i - 1])
-
-            # Determine current trend BASED ON CURRENT CANDLE CLOSE
-            if trend[i - 1] == 1 and close_arr[i] > st_upper[i]:
-                trend[i] = -1  # Switch to upper trend
-            elif trend[i - 1] == -1 and close_arr[i] < st_lower[i]:
-                trend[i] = 1  # Switch to lower trend
-            else:
-                trend[i] = trend[i - 1]  # Keep previous trend
+        st_upper, st_lower, trend = _super_trend_kernel(
+            close, basic_upper, basic_lower, start_idx
+        )
 
         # Round values to 3 decimal places
         st_upper = np.round(st_upper, 3)
         st_lower = np.round(st_lower, 3)
 
         # Create columns based on current trend
-        upper_col = np.where(trend == 1, st_upper, np.nan)
-        lower_col = np.where(trend == -1, st_lower, np.nan)
+        upper_cols = np.where(trend == 1, st_upper, np.nan)
+        lower_cols = np.where(trend == -1, st_lower, np.nan)
+
+        for row, multiplier in enumerate(multipliers):
+            bands[(period, multiplier)] = (upper_cols[row], lower_cols[row])
+
+    columns: dict[str, np.ndarray] = {}
+    for params in config:
+        period = params["period"]
+        multiplier = params["multiplier"]
+        upper_name, lower_name = super_trend_names(period, multiplier)
+        columns[upper_name], columns[lower_name] = bands[(period, multiplier)]
+
+    return columns
+
+
+class SuperTrendStream:
+    """
+    Incremental SuperTrend for live trading.
+
+    Keeps the Wilder-smoothed ATR (the same recurrence talib.ATR uses), the
+    last bands and the trend state, so every new candle costs O(1) instead of
+    recalculating the whole history. Values are identical bar for bar to
+    super_trend() with the same period and multiplier.
+
+    Example:
+        stream = SuperTrendStream(period=10, multiplier=3)
+        for candle in candles:
+            values = stream.update(candle)  # {"ST_UPPER_10_3": ..., ...}
+    """
+
+    def __init__(self, period: int, multiplier: float) -> None:
+        self.period = period
+        self.multiplier = multiplier
+        self._index = 0
+        self._prev_close = np.nan
+        self._tr_sum = 0.0  # sum of true ranges until the first ATR value
+        self._atr = np.nan
+        self._st_upper = np.nan
+        self._st_lower = np.nan
+        self._trend = 0  # 1 = upper trend, -1 = lower trend
+        self._upper_col, self._lower_col = super_trend_names(period, multiplier)
+
+    def update(self, candle) -> dict[str, float]:
+        """
+        Adds a closed candle and returns the indicator values for it.
 
-        # Add results to DataFrame
-        df[f"ST_UPPER_{period}_{multiplier}"] = upper_col
-        df[f"ST_LOWER_{period}_{multiplier}"] = lower_col
+        Args:
+            candle: Mapping (dict, pd.Series) with 'HIGH', 'LOW' and 'CLOSE' keys
+
+        Returns:
+            dict: ST_UPPER_{period}_{multiplier} and ST_LOWER_{period}_{multiplier}
+              values, only the one of the current trend is not NaN
+        """
+        index = self._index
+        self._index += 1
+        high = float(candle["HIGH"])
+        low = float(candle["LOW"])
+        close = float(candle["CLOSE"])
+        prev_close = self._prev_close
+        self._prev_close = close
+
+        if index == 0:
+            return {self._upper_col: np.nan, self._lower_col: np.nan}
+
+        # True range, calculated in the same order as TA-Lib
+        true_range = high - low
+        true_range = max(abs(prev_close - high), true_range)
+        true_range = max(abs(low - prev_close), true_range)
+
+        if index < self.period:
+            self._tr_sum += true_range
+            return {self._upper_col: np.nan, self._lower_col: np.nan}
+        if index == self.period:
+            # First ATR value is a simple average of the true ranges
+            self._atr = (self._tr_sum + true_range) / self.period
+        else:
+            self._atr = (self._atr * (self.period - 1) + true_range) / self.period
+
+        hl2 = (high + low) / 2
+        offset = float(self.multiplier) * self._atr
+        basic_upper = hl2 + offset
+        basic_lower = hl2 - offset
+
+        if index == self.period:
+            # Initialize first value (start with lower trend)
+            self._st_upper = basic_upper
+            self._st_lower = basic_lower
+            self._trend = 1
+        elif not (np.isnan(basic_upper) or np.isnan(basic_lower)):
+            # Calculate lines BASED ON PREVIOUS TREND
+            if self._trend == 1:
+                if not self._st_upper < basic_upper:
+                    self._st_upper = basic_upper
+                self._st_lower = basic_lower
+            else:
+                self._st_upper = basic_upper
+                if not self._st_lower > basic_lower:
+                    self._st_lower = basic_lower
+
+            # Determine current trend BASED ON CURRENT CANDLE CLOSE
+            if self._trend == 1 and close > self._st_upper:
+                self._trend = -1
+            elif self._trend == -1 and close < self._st_lower:
+                self._trend = 1
+        else:
+            # The batch calculation leaves the bar empty and drops the trend
+            self._st_upper = np.nan
+            self._st_lower = np.nan
+            self._trend = 0
 
-    return df
+        return {
+            self._upper_col: (
+                np.round(self._st_upper, 3) if self._trend == 1 else np.nan
+            ),
+            self._lower_col: (
+                np.round(self._st_lower, 3) if self._trend == -1 else np.nan
+            ),
+        }
@@ -0,0 +1,92 @@
+"""Entries and keys of the indicator cache."""
+
+import numpy as np
+import pandas as pd
+import pytest
+from myLib.indicators import (
+    IndicatorCache,
+    price_chanel,
+    price_chanel_columns,
+    super_trend,
+)
+
+PC_COLUMNS = ["PC_20_HIGH", "PC_20_LOW", "PC_20_MID"]
+
+
+def random_candles(n: int, seed: int) -> pd.DataFrame:
+    """Random walk OHLCV candles"""
+    rng = np.random.default_rng(seed)
+    close = 100 + np.cumsum(rng.normal(0, 0.5, n))
+    open_ = np.concatenate(([close[0]], close[:-1]))
+    spread = rng.uniform(0.05, 1.0, n)
+    return pd.DataFrame(
+        {
+            "DATE": pd.date_range("2025-01-06 07:00", periods=n, freq="5min"),
+            "OPEN": open_,
+            "HIGH": np.maximum(open_, close) + spread,
+            "LOW": np.minimum(open_, close) - spread,
+            "CLOSE": close,
+            "VOLUME": rng.integers(1, 1000, n),
+        }
+    )
+
+
+@pytest.fixture(params=[None, "disk"])
+def cache(request, tmp_path):
+    directory = None if request.param is None else str(tmp_path)
+    return IndicatorCache(directory=directory)
+
+
+def test_compute_matches_indicator_and_hits(cache):
+    df = random_candles(1000, 0)
+    config = [{"period": 10, "multiplier": 3}]
+    pd.testing.assert_frame_equal(
+        cache.compute(price_chanel, df, 20), price_chanel(df, 20)
+    )
+    pd.testing.assert_frame_equal(
+        cache.compute(super_trend, df, config), super_trend(df, config)
+    )
+    cache.compute(price_chanel, df, 20)
+    assert (cache.hits, cache.misses) == (1, 2)
+
+
+def test_frame_with_indicator_columns_caches_all_of_them(cache):
+    df = random_candles(1000, 1)
+    with_pc = price_chanel(df, 20)
+
+    # Regression: the columns already in the frame were left out of the entry
+    assert list(cache.get_columns(price_chanel, with_pc, 20)) == PC_COLUMNS
+    pd.testing.assert_frame_equal(
+        cache.compute(price_chanel, df, 20), price_chanel(df, 20)
+    )
+    assert cache.hits == 1
+
+
+def test_other_candles_miss(cache):
+    df = random_candles(1000, 2)
+    cache.get_columns(price_chanel_columns, df, 20)
+
+    changed = df.copy()
+    changed.loc[500, "CLOSE"] += 1
+    columns = cache.get_columns(price_chanel_columns, changed, 20)
+    np.testing.assert_array_equal(
+        columns["PC_20_MID"], price_chanel_columns(changed, 20)["PC_20_MID"]
+    )
+    assert cache.misses == 2
+
+
+def test_entries_are_kept_on_disk(tmp_path):
+    df = random_candles(500, 3)
+    IndicatorCache(directory=str(tmp_path)).get_columns(price_chanel_columns, df, 20)
+
+    cache = IndicatorCache(directory=str(tmp_path))
+    columns = cache.get_columns(price_chanel_columns, df, 20)
+    assert (cache.hits, cache.misses) == (1, 0)
+    assert not columns["PC_20_HIGH"].flags.writeable
+
+
+def test_empty_result_is_not_cached(cache):
+    df = random_candles(100, 4)
+    assert cache.get_columns(lambda frame: {}, df) == {}
+    assert cache.get_columns(lambda frame: {}, df) == {}
+    assert cache.misses == 2
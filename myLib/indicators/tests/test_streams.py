@@ -0,0 +1,72 @@
+"""Parity of the streaming indicators with the batch functions."""
+
+import numpy as np
+import pandas as pd
+import pytest
+from myLib.indicators import (
+    price_chanel_columns,
+    super_trend_columns,
+    PriceChanelStream,
+    SuperTrendStream,
+)
+
+
+def random_candles(n: int, seed: int) -> pd.DataFrame:
+    """Random walk OHLC candles"""
+    rng = np.random.default_rng(seed)
+    close = 100 + np.cumsum(rng.normal(0, 0.5, n))
+    open_ = np.concatenate(([close[0]], close[:-1]))
+    spread = rng.uniform(0.05, 1.0, n)
+    return pd.DataFrame(
+        {
+            "OPEN": open_,
+            "HIGH": np.maximum(open_, close) + spread,
+            "LOW": np.minimum(open_, close) - spread,
+            "CLOSE": close,
+        }
+    )
+
+
+def stream_columns(stream, df: pd.DataFrame) -> dict[str, np.ndarray]:
+    """Feeds the candles one at a time, returns the values as columns"""
+    rows = [stream.update(candle) for candle in df.to_dict("records")]
+    return {col: np.array([row[col] for row in rows]) for col in rows[0]}
+
+
+def assert_columns_equal(actual: dict, expected: dict) -> None:
+    assert actual.keys() == expected.keys()
+    for col, values in expected.items():
+        np.testing.assert_array_equal(actual[col], values, err_msg=col)
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+@pytest.mark.parametrize("period", [1, 5, 20, 55])
+def test_price_chanel_stream_matches_batch(seed, period):
+    df = random_candles(1500, seed)
+    assert_columns_equal(
+        stream_columns(PriceChanelStream(period), df),
+        price_chanel_columns(df, period),
+    )
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+@pytest.mark.parametrize("period, multiplier", [(10, 3), (10, 1.5), (20, 5), (3, 2)])
+def test_super_trend_stream_matches_batch(seed, period, multiplier):
+    df = random_candles(1500, seed)
+    config = [{"period": period, "multiplier": multiplier}]
+    assert_columns_equal(
+        stream_columns(SuperTrendStream(period, multiplier), df),
+        super_trend_columns(df, config),
+    )
+
+
+@pytest.mark.parametrize("n", [1, 5, 11])
+def test_short_history_matches_batch(n):
+    df = random_candles(n, 3)
+    assert_columns_equal(
+        stream_columns(PriceChanelStream(10), df), price_chanel_columns(df, 10)
+    )
+    assert_columns_equal(
+        stream_columns(SuperTrendStream(10, 3), df),
+        super_trend_columns(df, [{"period": 10, "multiplier": 3}]),
+    )
@@ -0,0 +1,110 @@
+"""Parity of the SuperTrend kernel with the original pandas implementation."""
+
+import importlib
+import numpy as np
+import pandas as pd
+import pytest
+import talib
+from myLib.indicators import super_trend
+
+# The package exports the function under the module name
+super_trend_module = importlib.import_module("myLib.indicators.super_trend")
+
+CONFIG = [
+    {"period": 10, "multiplier": 3},
+    {"period": 10, "multiplier": 1.5},
+    {"period": 20, "multiplier": 5},
+]
+
+
+def reference_super_trend(df: pd.DataFrame, config: list) -> pd.DataFrame:
+    """SuperTrend as it was calculated before the kernel, one config at a time"""
+    df = df.copy()
+    for params in config:
+        period = params["period"]
+        multiplier = params["multiplier"]
+
+        atr = talib.ATR(df["HIGH"], df["LOW"], df["CLOSE"], timeperiod=period)
+        hl2 = (df["HIGH"] + df["LOW"]) / 2
+        basic_upper = (hl2 + multiplier * atr).values
+        basic_lower = (hl2 - multiplier * atr).values
+        close = df["CLOSE"].values
+
+        n = len(df)
+        st_upper = np.full(n, np.nan)
+        st_lower = np.full(n, np.nan)
+        trend = np.zeros(n, dtype=int)
+
+        start_idx = period
+        if start_idx >= n:
+            df[f"ST_UPPER_{period}_{multiplier}"] = np.nan
+            df[f"ST_LOWER_{period}_{multiplier}"] = np.nan
+            continue
+
+        st_upper[start_idx] = basic_upper[start_idx]
+        st_lower[start_idx] = basic_lower[start_idx]
+        trend[start_idx] = 1
+
+        for i in range(start_idx + 1, n):
+            if np.isnan(basic_upper[i]) or np.isnan(basic_lower[i]):
+                continue
+            if trend[i - 1] == 1:
+                st_upper[i] = min(basic_upper[i], st_upper[i - 1])
+                st_lower[i] = basic_lower[i]
+            else:
+                st_upper[i] = basic_upper[i]
+                st_lower[i] = max(basic_lower[i], st_lower[i - 1])
+
+            if trend[i - 1] == 1 and close[i] > st_upper[i]:
+                trend[i] = -1
+            elif trend[i - 1] == -1 and close[i] < st_lower[i]:
+                trend[i] = 1
+            else:
+                trend[i] = trend[i - 1]
+
+        st_upper = np.round(st_upper, 3)
+        st_lower = np.round(st_lower, 3)
+        df[f"ST_UPPER_{period}_{multiplier}"] = np.where(trend == 1, st_upper, np.nan)
+        df[f"ST_LOWER_{period}_{multiplier}"] = np.where(trend == -1, st_lower, np.nan)
+    return df
+
+
+def random_candles(n: int, seed: int) -> pd.DataFrame:
+    """Random walk OHLC candles"""
+    rng = np.random.default_rng(seed)
+    close = 100 + np.cumsum(rng.normal(0, 0.5, n))
+    open_ = np.concatenate(([close[0]], close[:-1]))
+    spread = rng.uniform(0.05, 1.0, n)
+    return pd.DataFrame(
+        {
+            "OPEN": open_,
+            "HIGH": np.maximum(open_, close) + spread,
+            "LOW": np.minimum(open_, close) - spread,
+            "CLOSE": close,
+        }
+    )
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_kernel_matches_reference(seed):
+    df = random_candles(2000, seed)
+    pd.testing.assert_frame_equal(
+        super_trend(df, CONFIG), reference_super_trend(df, CONFIG)
+    )
+
+
+def test_python_loop_matches_reference(monkeypatch):
+    monkeypatch.setattr(
+        super_trend_module, "_super_trend_kernel", super_trend_module._super_trend_loop
+    )
+    df = random_candles(2000, 3)
+    pd.testing.assert_frame_equal(
+        super_trend(df, CONFIG), reference_super_trend(df, CONFIG)
+    )
+
+
+def test_short_history_matches_reference():
+    df = random_candles(15, 4)
+    pd.testing.assert_frame_equal(
+        super_trend(df, CONFIG), reference_super_trend(df, CONFIG)
+    )
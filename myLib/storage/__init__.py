@@ -0,0 +1,19 @@
+"""
+Local storage of market data.
+
+Available classes:
+    - CandleStore: Columnar candle history partitioned by instrument, timeframe and month
+    - CandleSync: Downloads only the candles that are missing in a CandleStore
+"""
+
+from .candle_store import CandleStore, CANDLE_COLUMNS
+from .candle_sync import CandleSync, TINKOFF_MAX_WINDOWS, tinkoff_fetcher, alor_fetcher
+
+__all__ = [
+    "CandleStore",
+    "CANDLE_COLUMNS",
+    "CandleSync",
+    "TINKOFF_MAX_WINDOWS",
+    "tinkoff_fetcher",
+    "alor_fetcher",
+]
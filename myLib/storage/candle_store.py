@@ -0,0 +1,263 @@
+"""
+Local columnar storage of candle history.
+
+Candles of one instrument and timeframe are partitioned by month. Every
+partition is a folder with one memory-mappable .npy file per column:
+
+    root/<instrument>/<timeframe>/<YYYY-MM>/DATE.npy, OPEN.npy, ...
+
+DATE is stored as datetime64[ns] local exchange time, the way the strategies
+read it. coverage.json next to the partitions lists the [start, end) ranges
+that were already downloaded, including ranges without any candles.
+"""
+
+import json
+import os
+import shutil
+import numpy as np
+import pandas as pd
+
+__all__ = ["CandleStore", "CANDLE_COLUMNS"]
+
+CANDLE_COLUMNS = ["DATE", "OPEN", "HIGH", "LOW", "CLOSE", "VOLUME"]
+
+_DTYPES = {
+    "DATE": np.dtype("datetime64[ns]"),
+    "OPEN": np.dtype(np.float64),
+    "HIGH": np.dtype(np.float64),
+    "LOW": np.dtype(np.float64),
+    "CLOSE": np.dtype(np.float64),
+    "VOLUME": np.dtype(np.int64),
+}
+
+
+class CandleStore:
+    """
+    Append-only candle storage with fast range reads.
+
+    Example:
+        store = CandleStore("data/candles")
+        store.append("BBG004730N88", "CANDLE_INTERVAL_5_MIN", df)
+        df = store.read("BBG004730N88", "CANDLE_INTERVAL_5_MIN", "2025-01-01", "2025-02-01")
+    """
+
+    def __init__(self, root: str) -> None:
+        self.root = root
+
+    def append(self, instrument: str, timeframe: str | int, df: pd.DataFrame) -> int:
+        """
+        Adds candles to the store.
+
+        Candles with a DATE that is already stored replace the stored ones.
+        Only the partitions the new candles fall into are rewritten.
+
+        Args:
+            instrument: Ticker or FIGI
+            timeframe: Candle interval, for example 'CANDLE_INTERVAL_5_MIN' or 300
+            df: DataFrame with DATE, OPEN, HIGH, LOW, CLOSE and VOLUME columns
+
+        Returns:
+            int: Number of candles in the rewritten partitions that were not stored before
+        """
+        if len(df) == 0:
+            return 0
+
+        new = _normalize(df)
+        months = new["DATE"].astype("datetime64[M]")
+        added = 0
+
+        for month in np.unique(months):
+            mask = months == month
+            part = {col: values[mask] for col, values in new.items()}
+            path = self._partition_path(instrument, timeframe, month)
+            stored = _load_partition(path, mmap=False)
+            stored_count = 0 if stored is None else len(stored["DATE"])
+
+            if stored is not None:
+                part = {
+                    col: np.concatenate((stored[col], part[col]))
+                    for col in CANDLE_COLUMNS
+                }
+
+            # Keep the last candle for every DATE, sorted by DATE
+            dates = part["DATE"]
+            order = np.argsort(dates, kind="stable")[::-1]
+            _, first = np.unique(dates[order], return_index=True)
+            keep = order[first]
+            part = {col: values[keep] for col, values in part.items()}
+
+            _write_partition(path, part)
+            added += len(keep) - stored_count
+
+        return added
+
+    def read(
+        self,
+        instrument: str,
+        timeframe: str | int,
+        start: str | pd.Timestamp | None = None,
+        end: str | pd.Timestamp | None = None,
+    ) -> pd.DataFrame:
+        """
+        Reads candles with start <= DATE < end.
+
+        Args:
+            instrument: Ticker or FIGI
+            timeframe: Candle interval used when the candles were appended
+            start: First DATE to return, None reads from the beginning
+            end: DATE to stop before, None reads to the end
+
+        Returns:
+            pd.DataFrame: DATE, OPEN, HIGH, LOW, CLOSE and VOLUME columns
+        """
+        start = None if start is None else np.datetime64(pd.Timestamp(start), "ns")
+        end = None if end is None else np.datetime64(pd.Timestamp(end), "ns")
+
+        chunks = []
+        for month in self.partitions(instrument, timeframe):
+            month_start = np.datetime64(month, "M").astype("datetime64[ns]")
+            month_end = (np.datetime64(month, "M") + 1).astype("datetime64[ns]")
+            if (start is not None and month_end <= start) or (
+                end is not None and month_start >= end
+            ):
+                continue
+
+            columns = _load_partition(
+                self._partition_path(instrument, timeframe, month), mmap=True
+            )
+            if columns is None:
+                continue
+
+            dates = columns["DATE"]
+            lo = 0 if start is None else np.searchsorted(dates, start, "left")
+            hi = len(dates) if end is None else np.searchsorted(dates, end, "left")
+            if lo < hi:
+                chunks.append({col: values[lo:hi] for col, values in columns.items()})
+
+        if not chunks:
+            return pd.DataFrame(
+                {col: np.empty(0, dtype=_DTYPES[col]) for col in CANDLE_COLUMNS}
+            )
+
+        return pd.DataFrame(
+            {
+                col: np.concatenate([chunk[col] for chunk in chunks])
+                for col in CANDLE_COLUMNS
+            }
+        )
+
+    def bounds(
+        self, instrument: str, timeframe: str | int
+    ) -> tuple[pd.Timestamp, pd.Timestamp] | None:
+        """Returns the first and the last stored DATE, None if nothing is stored"""
+        months = self.partitions(instrument, timeframe)
+        if not months:
+            return None
+
+        first = _load_partition(
+            self._partition_path(instrument, timeframe, months[0]), mmap=True
+        )
+        last = _load_partition(
+            self._partition_path(instrument, timeframe, months[-1]), mmap=True
+        )
+        return pd.Timestamp(first["DATE"][0]), pd.Timestamp(last["DATE"][-1])
+
+    def coverage(
+        self, instrument: str, timeframe: str | int
+    ) -> list[tuple[pd.Timestamp, pd.Timestamp]]:
+        """Returns sorted, non-overlapping [start, end) ranges that were downloaded"""
+        path = self._coverage_path(instrument, timeframe)
+        if not os.path.exists(path):
+            return []
+        with open(path, encoding="utf-8") as file:
+            return [
+                (pd.Timestamp(start), pd.Timestamp(end))
+                for start, end in json.load(file)
+            ]
+
+    def add_coverage(
+        self,
+        instrument: str,
+        timeframe: str | int,
+        start: str | pd.Timestamp,
+        end: str | pd.Timestamp,
+    ) -> None:
+        """Marks [start, end) as downloaded, merging it with touching ranges"""
+        start, end = pd.Timestamp(start), pd.Timestamp(end)
+        if start >= end:
+            return
+
+        merged = []
+        for range_start, range_end in sorted(
+            self.coverage(instrument, timeframe) + [(start, end)]
+        ):
+            if merged and range_start <= merged[-1][1]:
+                merged[-1] = (merged[-1][0], max(merged[-1][1], range_end))
+            else:
+                merged.append((range_start, range_end))
+
+        path = self._coverage_path(instrument, timeframe)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(f"{path}.tmp", "w", encoding="utf-8") as file:
+            json.dump([[a.isoformat(), b.isoformat()] for a, b in merged], file)
+        os.replace(f"{path}.tmp", path)
+
+    def partitions(self, instrument: str, timeframe: str | int) -> list[str]:
+        """Returns sorted names (YYYY-MM) of the stored monthly partitions"""
+        path = os.path.join(self.root, instrument, str(timeframe))
+        if not os.path.isdir(path):
+            return []
+        return sorted(
+            name
+            for name in os.listdir(path)
+            if not name.endswith((".tmp", ".old"))
+            and os.path.exists(os.path.join(path, name, "DATE.npy"))
+        )
+
+    def _coverage_path(self, instrument: str, timeframe: str | int) -> str:
+        return os.path.join(self.root, instrument, str(timeframe), "coverage.json")
+
+    def _partition_path(
+        self, instrument: str, timeframe: str | int, month: np.datetime64 | str
+    ) -> str:
+        return os.path.join(self.root, instrument, str(timeframe), str(month))
+
+
+def _normalize(df: pd.DataFrame) -> dict[str, np.ndarray]:
+    """Converts a candle frame to typed column arrays"""
+    dates = pd.to_datetime(df["DATE"])
+    if dates.dt.tz is not None:
+        dates = dates.dt.tz_localize(None)  # keep the local exchange time
+
+    columns = {"DATE": dates.to_numpy(dtype=_DTYPES["DATE"])}
+    for col in CANDLE_COLUMNS[1:]:
+        columns[col] = pd.to_numeric(df[col]).to_numpy(dtype=_DTYPES[col])
+    return columns
+
+
+def _load_partition(path: str, mmap: bool) -> dict[str, np.ndarray] | None:
+    if not os.path.exists(os.path.join(path, "DATE.npy")):
+        return None
+    return {
+        col: np.load(os.path.join(path, f"{col}.npy"), mmap_mode="r" if mmap else None)
+        for col in CANDLE_COLUMNS
+    }
+
+
+def _write_partition(path: str, columns: dict[str, np.ndarray]) -> None:
+    """Writes a partition next to the old one and swaps the folders"""
+    tmp_path = f"{path}.tmp"
+    old_path = f"{path}.old"
+    shutil.rmtree(tmp_path, ignore_errors=True)
+    os.makedirs(tmp_path)
+
+    for col in CANDLE_COLUMNS:
+        np.save(os.path.join(tmp_path, f"{col}.npy"), columns[col])
+
+    if os.path.exists(path):
+        shutil.rmtree(old_path, ignore_errors=True)
+        os.replace(path, old_path)
+        os.replace(tmp_path, path)
+        shutil.rmtree(old_path, ignore_errors=True)
+    else:
+        os.replace(tmp_path, path)
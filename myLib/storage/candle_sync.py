@@ -0,0 +1,257 @@
+"""
+Incremental download of candle history into a CandleStore.
+
+CandleSync compares the requested range with the ranges already downloaded,
+splits the gaps into chunks no longer than the broker allows per request,
+fetches the chunks concurrently under a rate limit and appends them to the store.
+"""
+
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import timedelta, timezone
+from typing import Callable
+import pandas as pd
+from .candle_store import CandleStore
+
+__all__ = ["CandleSync", "TINKOFF_MAX_WINDOWS", "tinkoff_fetcher", "alor_fetcher"]
+
+logger = logging.getLogger("CandleSync")
+
+# Exchange time of the stored candles
+MSK = timezone(timedelta(hours=3))
+
+# Longest range a single GetCandles request may cover
+TINKOFF_MAX_WINDOWS = {
+    "CANDLE_INTERVAL_1_MIN": pd.Timedelta(days=1),
+    "CANDLE_INTERVAL_2_MIN": pd.Timedelta(days=1),
+    "CANDLE_INTERVAL_3_MIN": pd.Timedelta(days=1),
+    "CANDLE_INTERVAL_5_MIN": pd.Timedelta(days=1),
+    "CANDLE_INTERVAL_10_MIN": pd.Timedelta(days=1),
+    "CANDLE_INTERVAL_15_MIN": pd.Timedelta(days=1),
+    "CANDLE_INTERVAL_30_MIN": pd.Timedelta(days=2),
+    "CANDLE_INTERVAL_HOUR": pd.Timedelta(weeks=1),
+    "CANDLE_INTERVAL_2_HOUR": pd.Timedelta(days=30),
+    "CANDLE_INTERVAL_4_HOUR": pd.Timedelta(days=30),
+    "CANDLE_INTERVAL_DAY": pd.Timedelta(days=365),
+    "CANDLE_INTERVAL_WEEK": pd.Timedelta(days=730),
+    "CANDLE_INTERVAL_MONTH": pd.Timedelta(days=3650),
+}
+
+Fetcher = Callable[[str, pd.Timestamp, pd.Timestamp], pd.DataFrame]
+
+
+class CandleSync:
+    """
+    Downloads only the candles that are missing in the store.
+
+    Example:
+        sync = CandleSync(
+            store=CandleStore("data/candles"),
+            fetch=tinkoff_fetcher(Tinkoff(), "CANDLE_INTERVAL_5_MIN"),
+            max_window=TINKOFF_MAX_WINDOWS["CANDLE_INTERVAL_5_MIN"],
+        )
+        sync.sync("BBG004730N88", "CANDLE_INTERVAL_5_MIN", "2024-01-01")
+    """
+
+    def __init__(
+        self,
+        store: CandleStore,
+        fetch: Fetcher,
+        max_window: pd.Timedelta | None = None,
+        max_workers: int = 4,
+        requests_per_minute: int = 300,
+    ) -> None:
+        """
+        Args:
+            store: Local candle store
+            fetch: Function (instrument, start, end) -> candle DataFrame for
+              [start, end) in exchange time
+            max_window: Longest range of one request, None fetches every gap at once
+            max_workers: Number of concurrent requests
+            requests_per_minute: Request rate limit shared by all workers
+        """
+        self.store = store
+        self.fetch = fetch
+        self.max_window = max_window
+        self.max_workers = max_workers
+        self._interval = 60 / requests_per_minute
+        self._lock = threading.Lock()
+        self._next_request = 0.0
+
+    def missing(
+        self,
+        instrument: str,
+        timeframe: str | int,
+        start: str | pd.Timestamp,
+        end: str | pd.Timestamp,
+    ) -> list[tuple[pd.Timestamp, pd.Timestamp]]:
+        """
+        Returns the parts of [start, end) that were not downloaded yet.
+
+        Naive times are taken as exchange time, aware ones are converted to it.
+        """
+        start, end = _to_exchange_time(start), _to_exchange_time(end)
+        gaps = []
+        cursor = start
+        for covered_start, covered_end in self.store.coverage(instrument, timeframe):
+            if covered_end <= cursor:
+                continue
+            if covered_start >= end:
+                break
+            if covered_start > cursor:
+                gaps.append((cursor, covered_start))
+            cursor = max(cursor, covered_end)
+        if cursor < end:
+            gaps.append((cursor, end))
+        return gaps
+
+    def chunks(
+        self, gaps: list[tuple[pd.Timestamp, pd.Timestamp]]
+    ) -> list[tuple[pd.Timestamp, pd.Timestamp]]:
+        """Splits gaps into ranges no longer than max_window"""
+        if self.max_window is None:
+            return list(gaps)
+
+        result = []
+        for gap_start, gap_end in gaps:
+            chunk_start = gap_start
+            while chunk_start < gap_end:
+                chunk_end = min(chunk_start + self.max_window, gap_end)
+                result.append((chunk_start, chunk_end))
+                chunk_start = chunk_end
+        return result
+
+    def sync(
+        self,
+        instrument: str,
+        timeframe: str | int,
+        start: str | pd.Timestamp,
+        end: str | pd.Timestamp | None = None,
+    ) -> int:
+        """
+        Downloads the missing candles of [start, end) and stores them.
+
+        Naive times are taken as exchange time, aware ones are converted to
+        it. When end is None the range ends now. The range after the last
+        received candle is then left uncovered, so the candle that is still
+        forming is requested again by the next sync.
+
+        Returns:
+            int: Number of new candles
+        """
+        open_ended = end is None
+        start = _to_exchange_time(start)
+        end = _to_exchange_time(pd.Timestamp.now(tz=MSK) if open_ended else end)
+
+        chunks = self.chunks(self.missing(instrument, timeframe, start, end))
+        if not chunks:
+            return 0
+
+        added = 0
+        cancelled = threading.Event()
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {
+                executor.submit(
+                    self._fetch, instrument, chunk_start, chunk_end, cancelled
+                ): (chunk_start, chunk_end)
+                for chunk_start, chunk_end in chunks
+            }
+            try:
+                # Store results from the main thread, the store is not thread-safe
+                for future in as_completed(futures):
+                    chunk_start, chunk_end = futures[future]
+                    candles = future.result()
+                    if len(candles):
+                        added += self.store.append(instrument, timeframe, candles)
+
+                    if open_ended and chunk_end == end:
+                        chunk_end = (
+                            pd.Timestamp(pd.to_datetime(candles["DATE"]).max())
+                            if len(candles)
+                            else chunk_start
+                        )
+                        if chunk_end.tzinfo is not None:
+                            chunk_end = chunk_end.tz_localize(None)
+                    self.store.add_coverage(
+                        instrument, timeframe, chunk_start, chunk_end
+                    )
+            except BaseException:
+                # Don't spend the request budget on chunks that will be thrown
+                # away: queued chunks are cancelled, waiting ones are skipped
+                cancelled.set()
+                executor.shutdown(wait=False, cancel_futures=True)
+                raise
+
+        logger.info("%s %s: %d new candles", instrument, timeframe, added)
+        return added
+
+    def _fetch(
+        self,
+        instrument: str,
+        start: pd.Timestamp,
+        end: pd.Timestamp,
+        cancelled: threading.Event,
+    ) -> pd.DataFrame | None:
+        self._wait_rate_limit()
+        if cancelled.is_set():
+            return None  # another chunk failed, the sync is aborted
+        return self.fetch(instrument, start, end)
+
+    def _wait_rate_limit(self) -> None:
+        with self._lock:
+            now = time.monotonic()
+            wait = self._next_request - now
+            self._next_request = max(now, self._next_request) + self._interval
+        if wait > 0:
+            time.sleep(wait)
+
+
+def tinkoff_fetcher(broker, interval: str = "CANDLE_INTERVAL_5_MIN") -> Fetcher:
+    """Returns a fetch function for CandleSync backed by Tinkoff.get_candles"""
+
+    def fetch(instrument: str, start: pd.Timestamp, end: pd.Timestamp) -> pd.DataFrame:
+        return broker.get_candles(
+            instrument_id=instrument,
+            start_date=_to_utc_string(start),
+            end_date=_to_utc_string(end),
+            interval=interval,
+        )
+
+    return fetch
+
+
+def alor_fetcher(downloader, tf: int) -> Fetcher:
+    """
+    Returns a fetch function for CandleSync backed by AlorDownloader.get_quotes.
+
+    Alor returns everything from the start date, so candles at or after the
+    end of the range are dropped.
+    """
+
+    def fetch(instrument: str, start: pd.Timestamp, end: pd.Timestamp) -> pd.DataFrame:
+        start, end = _to_exchange_time(start), _to_exchange_time(end)
+        df = downloader.get_quotes(ticker=instrument, start_date=_to_msk(start), tf=tf)
+        dates = pd.to_datetime(df["DATE"])
+        if dates.dt.tz is not None:
+            dates = dates.dt.tz_convert(MSK).dt.tz_localize(None)
+        return df[(dates >= start) & (dates < end)]
+
+    return fetch
+
+
+def _to_msk(value: pd.Timestamp) -> pd.Timestamp:
+    """Returns the timestamp in exchange time, naive timestamps are taken as exchange time"""
+    if value.tzinfo is not None:
+        return value.tz_convert(MSK)
+    return value.tz_localize(MSK)
+
+
+def _to_exchange_time(value: str | pd.Timestamp) -> pd.Timestamp:
+    """Returns the naive exchange time the store keeps, see _to_msk"""
+    return _to_msk(pd.Timestamp(value)).tz_localize(None)
+
+
+def _to_utc_string(value: pd.Timestamp) -> str:
+    return _to_msk(value).tz_convert("UTC").strftime("%Y-%m-%dT%H:%M:%SZ")
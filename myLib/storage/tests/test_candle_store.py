@@ -0,0 +1,103 @@
+"""Round trips, appends and coverage of the columnar candle store."""
+
+import numpy as np
+import pandas as pd
+import pytest
+from myLib.storage import CANDLE_COLUMNS, CandleStore
+
+TICKER = "SBER"
+TIMEFRAME = "CANDLE_INTERVAL_HOUR"
+
+
+def candles(start: str, periods: int, price: float = 100.0) -> pd.DataFrame:
+    """Hourly candles with prices growing by 1 from price"""
+    close = price + np.arange(periods, dtype=np.float64)
+    return pd.DataFrame(
+        {
+            "DATE": pd.date_range(start, periods=periods, freq="h").as_unit("ns"),
+            "OPEN": close,
+            "HIGH": close + 0.5,
+            "LOW": close - 0.5,
+            "CLOSE": close,
+            "VOLUME": np.arange(periods, dtype=np.int64),
+        }
+    )
+
+
+@pytest.fixture
+def store(tmp_path):
+    return CandleStore(str(tmp_path))
+
+
+def test_round_trip_across_months(store):
+    df = candles("2025-01-30", 24 * 5)  # January and February
+    assert store.append(TICKER, TIMEFRAME, df) == len(df)
+    assert store.partitions(TICKER, TIMEFRAME) == ["2025-01", "2025-02"]
+
+    pd.testing.assert_frame_equal(store.read(TICKER, TIMEFRAME), df)
+    assert store.bounds(TICKER, TIMEFRAME) == (df["DATE"].iloc[0], df["DATE"].iloc[-1])
+
+
+def test_read_range(store):
+    df = candles("2025-01-30", 24 * 5)
+    store.append(TICKER, TIMEFRAME, df)
+
+    result = store.read(TICKER, TIMEFRAME, "2025-01-31 12:00", "2025-02-01 03:00")
+    expected = df[
+        (df["DATE"] >= "2025-01-31 12:00") & (df["DATE"] < "2025-02-01 03:00")
+    ].reset_index(drop=True)
+    pd.testing.assert_frame_equal(result, expected)
+
+
+def test_nothing_stored(store):
+    result = store.read(TICKER, TIMEFRAME)
+    assert list(result.columns) == CANDLE_COLUMNS and len(result) == 0
+    assert store.bounds(TICKER, TIMEFRAME) is None
+    assert store.coverage(TICKER, TIMEFRAME) == []
+
+
+def test_overlapping_append_keeps_the_newest_candles(store):
+    first = candles("2025-01-31 00:00", 10)
+    second = candles("2025-01-31 05:00", 30, price=500.0)  # into February
+    store.append(TICKER, TIMEFRAME, first)
+    assert store.append(TICKER, TIMEFRAME, second) == 25
+
+    expected = pd.concat([first.iloc[:5], second], ignore_index=True)
+    pd.testing.assert_frame_equal(store.read(TICKER, TIMEFRAME), expected)
+
+    # The same candles again add nothing
+    assert store.append(TICKER, TIMEFRAME, second) == 0
+    pd.testing.assert_frame_equal(store.read(TICKER, TIMEFRAME), expected)
+
+
+def test_append_sorts_and_dedupes_within_a_frame(store):
+    df = candles("2025-03-01", 6)
+    shuffled = pd.concat([df.iloc[::-1], df.iloc[[2]].assign(CLOSE=1.0)])
+    assert store.append(TICKER, TIMEFRAME, shuffled) == 6
+
+    expected = df.copy()
+    expected.loc[2, "CLOSE"] = 1.0  # the last row for a DATE wins
+    pd.testing.assert_frame_equal(store.read(TICKER, TIMEFRAME), expected)
+
+
+def test_timezone_aware_dates_keep_the_local_time(store):
+    df = candles("2025-03-01 10:00", 3)
+    aware = df.assign(DATE=df["DATE"].dt.tz_localize("Europe/Moscow"))
+    store.append(TICKER, TIMEFRAME, aware)
+    pd.testing.assert_frame_equal(store.read(TICKER, TIMEFRAME), df)
+
+
+def test_coverage_merges_overlapping_and_touching_ranges(store):
+    store.add_coverage(TICKER, TIMEFRAME, "2025-01-10", "2025-01-20")
+    store.add_coverage(TICKER, TIMEFRAME, "2025-01-01", "2025-01-05")
+    store.add_coverage(TICKER, TIMEFRAME, "2025-02-01", "2025-02-01")  # empty
+    assert store.coverage(TICKER, TIMEFRAME) == [
+        (pd.Timestamp("2025-01-01"), pd.Timestamp("2025-01-05")),
+        (pd.Timestamp("2025-01-10"), pd.Timestamp("2025-01-20")),
+    ]
+
+    store.add_coverage(TICKER, TIMEFRAME, "2025-01-05", "2025-01-12")
+    store.add_coverage(TICKER, TIMEFRAME, "2025-01-15", "2025-01-25")
+    assert store.coverage(TICKER, TIMEFRAME) == [
+        (pd.Timestamp("2025-01-01"), pd.Timestamp("2025-01-25")),
+    ]
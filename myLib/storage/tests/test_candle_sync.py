@@ -0,0 +1,161 @@
+"""Gaps, chunks and time zones of the incremental candle download."""
+
+import threading
+import numpy as np
+import pandas as pd
+import pytest
+from myLib.storage import CandleStore, CandleSync, alor_fetcher
+
+TICKER = "SBER"
+TIMEFRAME = "CANDLE_INTERVAL_HOUR"
+
+# Hourly candles in naive exchange time, the source every fake fetch reads
+HISTORY = pd.DataFrame(
+    {
+        "DATE": pd.date_range(
+            "2025-01-01", "2025-03-01", freq="h", inclusive="left"
+        ).as_unit("ns"),
+    }
+)
+HISTORY["CLOSE"] = 100 + np.arange(len(HISTORY), dtype=np.float64)
+HISTORY["OPEN"] = HISTORY["CLOSE"]
+HISTORY["HIGH"] = HISTORY["CLOSE"] + 0.5
+HISTORY["LOW"] = HISTORY["CLOSE"] - 0.5
+HISTORY["VOLUME"] = np.arange(len(HISTORY), dtype=np.int64)
+HISTORY = HISTORY[["DATE", "OPEN", "HIGH", "LOW", "CLOSE", "VOLUME"]]
+
+
+class FakeFetch:
+    """Returns HISTORY candles of [start, end) and records the requested ranges"""
+
+    def __init__(self, fail_from: pd.Timestamp | None = None) -> None:
+        self.fail_from = fail_from
+        self.requests = []
+        self._lock = threading.Lock()
+
+    def __call__(self, instrument, start, end) -> pd.DataFrame:
+        assert start.tzinfo is None and end.tzinfo is None
+        with self._lock:
+            self.requests.append((start, end))
+        if self.fail_from is not None and start >= self.fail_from:
+            raise ConnectionError("broker is down")
+        dates = HISTORY["DATE"]
+        return HISTORY[(dates >= start) & (dates < end)]
+
+
+def expected(start: str, end: str) -> pd.DataFrame:
+    dates = HISTORY["DATE"]
+    return HISTORY[(dates >= start) & (dates < end)].reset_index(drop=True)
+
+
+@pytest.fixture
+def store(tmp_path):
+    return CandleStore(str(tmp_path))
+
+
+def make_sync(store: CandleStore, fetch: FakeFetch, **kwargs) -> CandleSync:
+    kwargs.setdefault("max_window", pd.Timedelta(days=7))
+    kwargs.setdefault("requests_per_minute", 60_000)
+    return CandleSync(store, fetch, **kwargs)
+
+
+def test_sync_downloads_the_range_in_chunks(store):
+    fetch = FakeFetch()
+    sync = make_sync(store, fetch)
+
+    assert sync.sync(TICKER, TIMEFRAME, "2025-01-01", "2025-01-31") == 30 * 24
+    assert len(fetch.requests) == 5  # 4 weeks and 2 days
+    assert max(end - start for start, end in fetch.requests) == pd.Timedelta(days=7)
+    pd.testing.assert_frame_equal(
+        store.read(TICKER, TIMEFRAME), expected("2025-01-01", "2025-01-31")
+    )
+    assert store.coverage(TICKER, TIMEFRAME) == [
+        (pd.Timestamp("2025-01-01"), pd.Timestamp("2025-01-31"))
+    ]
+
+
+def test_second_sync_fetches_only_the_gaps(store):
+    fetch = FakeFetch()
+    sync = make_sync(store, fetch)
+    sync.sync(TICKER, TIMEFRAME, "2025-01-10", "2025-01-20")
+    fetch.requests.clear()
+
+    assert sync.missing(TICKER, TIMEFRAME, "2025-01-05", "2025-01-25") == [
+        (pd.Timestamp("2025-01-05"), pd.Timestamp("2025-01-10")),
+        (pd.Timestamp("2025-01-20"), pd.Timestamp("2025-01-25")),
+    ]
+    assert sync.sync(TICKER, TIMEFRAME, "2025-01-05", "2025-01-25") == 10 * 24
+    assert sorted(fetch.requests) == [
+        (pd.Timestamp("2025-01-05"), pd.Timestamp("2025-01-10")),
+        (pd.Timestamp("2025-01-20"), pd.Timestamp("2025-01-25")),
+    ]
+
+    fetch.requests.clear()
+    assert sync.sync(TICKER, TIMEFRAME, "2025-01-06", "2025-01-24") == 0
+    assert fetch.requests == []
+
+
+def test_timezone_aware_range_is_taken_in_exchange_time(store):
+    fetch = FakeFetch()
+    sync = make_sync(store, fetch)
+    sync.sync(TICKER, TIMEFRAME, "2025-01-10", "2025-01-12")
+
+    # 2025-01-09 21:00 UTC is midnight of 2025-01-10 in Moscow
+    start = pd.Timestamp("2025-01-09 21:00", tz="UTC")
+    end = pd.Timestamp("2025-01-14", tz="Europe/Moscow")
+    assert sync.missing(TICKER, TIMEFRAME, start, end) == [
+        (pd.Timestamp("2025-01-12"), pd.Timestamp("2025-01-14"))
+    ]
+    assert sync.sync(TICKER, TIMEFRAME, start, end) == 2 * 24
+    pd.testing.assert_frame_equal(
+        store.read(TICKER, TIMEFRAME), expected("2025-01-10", "2025-01-14")
+    )
+
+
+def test_open_ended_sync_leaves_the_forming_candle_uncovered(store):
+    fetch = FakeFetch()
+    sync = make_sync(store, fetch, max_window=None)
+
+    # HISTORY ends before now, the last candle stands for the forming one
+    assert sync.sync(TICKER, TIMEFRAME, "2025-02-20") == 9 * 24
+    last = HISTORY["DATE"].iloc[-1]
+    assert store.coverage(TICKER, TIMEFRAME) == [(pd.Timestamp("2025-02-20"), last)]
+
+
+def test_failed_chunk_aborts_without_covering_it(store):
+    fetch = FakeFetch(fail_from=pd.Timestamp("2025-01-15"))
+    # Chunks start 0.1 s apart, the failure is seen before the next one
+    sync = make_sync(store, fetch, max_workers=1, requests_per_minute=600)
+
+    with pytest.raises(ConnectionError):
+        sync.sync(TICKER, TIMEFRAME, "2025-01-01", "2025-02-01")
+    assert len(fetch.requests) == 3  # the chunks after the failed one are skipped
+    assert store.coverage(TICKER, TIMEFRAME) == [
+        (pd.Timestamp("2025-01-01"), pd.Timestamp("2025-01-15"))
+    ]
+
+
+class FakeDownloader:
+    """AlorDownloader.get_quotes returning the whole history"""
+
+    def __init__(self, history: pd.DataFrame) -> None:
+        self.history = history
+        self.start_dates = []
+
+    def get_quotes(self, ticker, start_date, tf):
+        self.start_dates.append(start_date)
+        return self.history
+
+
+@pytest.mark.parametrize("aware", [False, True])
+def test_alor_fetcher_keeps_the_range(aware):
+    history = HISTORY.iloc[:100]
+    if aware:
+        history = history.assign(DATE=history["DATE"].dt.tz_localize("Europe/Moscow"))
+    downloader = FakeDownloader(history)
+    fetch = alor_fetcher(downloader, tf=3600)
+
+    start = pd.Timestamp("2025-01-01 07:00:00+00:00")  # 10:00 in Moscow
+    result = fetch(TICKER, start, pd.Timestamp("2025-01-02"))
+    assert len(result) == 14
+    assert pd.Timestamp(downloader.start_dates[0]) == start
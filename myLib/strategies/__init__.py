@@ -11,16 +11,28 @@ Usage:
     from myLib.strategies import Strategies
     strategies = Strategies()
     double_trend = strategies.double_super_trend
+
+The strategy types are imported eagerly, the strategies themselves on first
+access: they pull in pandas, numba, the indicators and the brokers.
 """
 
-from .withDoubleTrend import WithDoubleTrend
-from .price_chanel import PriceChanelGrid
+from typing import TYPE_CHECKING
+from myLib._lazy import lazy_exports
 from .strategy import StrategyAbstractClass
 from .types.plot_data import PlotDataTypedDict
 
+if TYPE_CHECKING:
+    from .withDoubleTrend import WithDoubleTrend
+    from .price_chanel import PriceChanelGrid
+
 __all__ = [
     "StrategyAbstractClass",
     "PlotDataTypedDict",
     "WithDoubleTrend",
     "PriceChanelGrid",
 ]
+
+__getattr__, __dir__ = lazy_exports(
+    __name__,
+    {"WithDoubleTrend": ".withDoubleTrend", "PriceChanelGrid": ".price_chanel"},
+)
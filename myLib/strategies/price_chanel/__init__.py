@@ -1,8 +1,12 @@
 from myLib.brokers import BrokerAbstractClass
 from .methods.plot_data import plot_data
 from .methods.calculate import calculate
+from .methods.optimize import optimize
 from .methods.run import run
+from .methods.run_async import run_async
+from .methods.stream import run_stream
 from ..strategy import StrategyAbstractClass
+from typing import AsyncIterable, Callable
 import pandas as pd
 
 __all__ = ["PriceChanelGrid"]
@@ -27,9 +31,35 @@ class PriceChanelGrid(StrategyAbstractClass):
     def run(self, df: pd.DataFrame) -> pd.DataFrame:
         return run(self, df)
 
+    async def run_async(self, df: pd.DataFrame, broker) -> pd.DataFrame:
+        return await run_async(self, df, broker)
+
+    async def run_stream(
+        self,
+        bars: AsyncIterable[dict],
+        history: pd.DataFrame | None = None,
+        window: int = 100,
+        on_error: Callable[[dict, Exception], None] | None = None,
+    ) -> None:
+        return await run_stream(self, bars, history, window, on_error)
+
     def calculate(self, data: pd.DataFrame) -> pd.DataFrame:
         return calculate(data, self._config["indicators"])
 
+    def optimize(
+        self,
+        data: pd.DataFrame,
+        pc_periods: list[int],
+        st_periods: list[int],
+        st_multipliers: list[float],
+        n_iter: int | None = None,
+        processes: int | None = None,
+        seed: int | None = None,
+    ) -> pd.DataFrame:
+        return optimize(
+            data, pc_periods, st_periods, st_multipliers, n_iter, processes, seed
+        )
+
     def get_config(self) -> dict:
         return self._config
 
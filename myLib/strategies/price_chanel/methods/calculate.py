@@ -1,17 +1,46 @@
 import pandas as pd
 import numpy as np
+from myLib.indicators import super_trend_names
+
+RESULT_COLUMNS = [
+    "BUY_PRICE",
+    "SELL_PRICE",
+    "SL_PRICE",
+    "CT_PRICE",
+    "CE_PRICE",
+    "COMMISSION",
+    "BALANCE",
+    "POSITION",  # New column for position
+    "TRADE_PROFIT",  # New column for trade profit
+]
+
+# Event type codes. Events of one bar are processed in this order
+EVENT_BUY = 0
+EVENT_IMPROVE = 1
+EVENT_SELL = 2
+EVENT_STOP_LOSS = 3
+EVENT_CLOSE_TIME = 4
+EVENT_CLOSE_END = 5
+
+EVENT_DTYPE = np.dtype([("index", np.int64), ("type", np.int8), ("price", np.float64)])
 
 
 def calculate(data: pd.DataFrame, indicators: list[dict]) -> pd.DataFrame:
+    """
+    Backtests the strategy on prepared data.
+
+    The event loop works on positions in preallocated NumPy arrays and the
+    result columns are written back to the DataFrame once at the end.
+    """
     # Initialize columns
-    _initialize_columns(data)
+    results = _initialize_columns(len(data))
 
-    # Vectorized time calculations
+    # Vectorized time calculations, as time elapsed since midnight
     data["DATE"] = pd.to_datetime(data["DATE"])
-    times = data["DATE"].dt.time
-    open_time = pd.Timestamp("07:00:00").time()
-    close_time = pd.Timestamp("23:00:00").time()
-    stop_time = pd.Timestamp("23:40:00").time()
+    times = (data["DATE"] - data["DATE"].dt.normalize()).to_numpy()
+    open_time = np.timedelta64(pd.Timedelta("07:00:00"))
+    close_time = np.timedelta64(pd.Timedelta("23:00:00"))
+    stop_time = np.timedelta64(pd.Timedelta("23:40:00"))
 
     pc_period = indicators[0]["period"]
     st_period = indicators[1]["period"]
@@ -20,7 +49,7 @@ def calculate(data: pd.DataFrame, indicators: list[dict]) -> pd.DataFrame:
     # Generation of names of columns
     pc_low_col = f"PC_{pc_period}_LOW"
     pc_high_col = f"PC_{pc_period}_HIGH"
-    st_lower_col = f"ST_LOWER_{st_period}_{st_multiplier}"
+    _, st_lower_col = super_trend_names(st_period, st_multiplier)
 
     prev_pc_low_col = f"prev_{pc_low_col}"
     prev_pc_high_col = f"prev_{pc_high_col}"
@@ -47,6 +76,8 @@ def calculate(data: pd.DataFrame, indicators: list[dict]) -> pd.DataFrame:
     )
 
     # Create and sort events
+    low = data["LOW"].to_numpy(dtype=np.float64)
+    high = data["HIGH"].to_numpy(dtype=np.float64)
     events = _create_events(
         data,
         times,
@@ -57,7 +88,13 @@ def calculate(data: pd.DataFrame, indicators: list[dict]) -> pd.DataFrame:
         prev_pc_high_col,
         prev_st_lower_col,
     )
-    events.sort(key=lambda x: x["index"])
+    # Stable sort keeps the type order of events within one bar
+    events = events[np.argsort(events["index"], kind="stable")]
+
+    balance_col = results["BALANCE"]
+    position_col = results["POSITION"]
+    trade_profit_col = results["TRADE_PROFIT"]
+    commission_col = results["COMMISSION"]
 
     # Process events
     position = 0
@@ -69,9 +106,10 @@ def calculate(data: pd.DataFrame, indicators: list[dict]) -> pd.DataFrame:
     trade_start_balance = 0  # Balance at trade opening
     in_trade = False  # Trade flag
 
-    for event in events:
-        idx = event["index"]
-        if idx == last_event_index and event["type"] == "IMPROVE":
+    for idx, event_type, event_price in zip(
+        events["index"].tolist(), events["type"].tolist(), events["price"]
+    ):
+        if idx == last_event_index and event_type == EVENT_IMPROVE:
             continue
 
         # Initialize variables for balance changes and commissions
@@ -80,15 +118,15 @@ def calculate(data: pd.DataFrame, indicators: list[dict]) -> pd.DataFrame:
         trade_profit = 0
 
         # Handle position opening
-        if event["type"] == "BUY" and position == 0:
-            (position, best_price, last_event_index, delta_balance, commission) = (
-                _open_position(data, idx, event["price"], position_prices)
+        if event_type == EVENT_BUY and position == 0:
+            position, best_price, last_event_index, delta_balance, commission = (
+                _open_position(results, low, idx, event_price, position_prices)
             )
             commission_event = commission
             in_trade = True
 
         # Handle position improvement
-        elif event["type"] == "IMPROVE" and position > 0:
+        elif event_type == EVENT_IMPROVE and position > 0:
             (
                 position,
                 position_prices,
@@ -96,11 +134,13 @@ def calculate(data: pd.DataFrame, indicators: list[dict]) -> pd.DataFrame:
                 last_event_index,
                 delta_balance,
                 commission,
-            ) = _try_improve_position(data, idx, position, position_prices, best_price)
+            ) = _try_improve_position(
+                results, low, high, idx, position, position_prices, best_price
+            )
             commission_event = commission
 
         # Handle stop loss
-        elif event["type"] == "STOP_LOSS" and position > 0:
+        elif event_type == EVENT_STOP_LOSS and position > 0:
             (
                 position,
                 position_prices,
@@ -108,7 +148,7 @@ def calculate(data: pd.DataFrame, indicators: list[dict]) -> pd.DataFrame:
                 last_event_index,
                 delta_balance,
                 commission,
-            ) = _close_position(data, idx, event["price"], position, "STOP_LOSS")
+            ) = _close_position(results, idx, event_price, position, "STOP_LOSS")
             commission_event = commission
             if position == 0 and in_trade:
                 balance = round(current_balance + delta_balance, 2)
@@ -117,7 +157,10 @@ def calculate(data: pd.DataFrame, indicators: list[dict]) -> pd.DataFrame:
                 in_trade = False
 
         # Handle position closing
-        elif event["type"] in ["SELL", "CLOSE_TIME", "CLOSE_END"] and position > 0:
+        elif (
+            event_type in (EVENT_SELL, EVENT_CLOSE_TIME, EVENT_CLOSE_END)
+            and position > 0
+        ):
             (
                 position,
                 position_prices,
@@ -125,7 +168,7 @@ def calculate(data: pd.DataFrame, indicators: list[dict]) -> pd.DataFrame:
                 last_event_index,
                 delta_balance,
                 commission,
-            ) = _close_position(data, idx, event["price"], position, "LONG_SELL")
+            ) = _close_position(results, idx, event_price, position, "LONG_SELL")
             commission_event = commission
             if position == 0 and in_trade:
                 balance = round(current_balance + delta_balance, 2)
@@ -135,18 +178,18 @@ def calculate(data: pd.DataFrame, indicators: list[dict]) -> pd.DataFrame:
 
         # Update cumulative balance
         current_balance += delta_balance
-        data.loc[idx, "BALANCE"] = round(current_balance, 2)
-        data.loc[idx, "POSITION"] = position
+        balance_col[idx] = round(current_balance, 2)
+        position_col[idx] = position
 
         # Record trade profit
         if trade_profit != 0:
-            data.loc[idx, "TRADE_PROFIT"] = round(trade_profit, 2)
+            trade_profit_col[idx] = round(trade_profit, 2)
 
         # Update commission
-        if pd.isna(data.loc[idx, "COMMISSION"]):
-            data.loc[idx, "COMMISSION"] = commission_event
+        if np.isnan(commission_col[idx]):
+            commission_col[idx] = commission_event
         else:
-            data.loc[idx, "COMMISSION"] += commission_event
+            commission_col[idx] += commission_event
 
     # Remove temporary columns
     columns_to_drop = [
@@ -160,24 +203,16 @@ def calculate(data: pd.DataFrame, indicators: list[dict]) -> pd.DataFrame:
     ]
     data.drop(columns=columns_to_drop, inplace=True, errors="ignore")
 
+    # Write results back at once
+    for col, values in results.items():
+        data[col] = values
+
     return data
 
 
-def _initialize_columns(data):
-    """Initialize result columns with NaN values"""
-    cols_to_init = [
-        "BUY_PRICE",
-        "SELL_PRICE",
-        "SL_PRICE",
-        "CT_PRICE",
-        "CE_PRICE",
-        "COMMISSION",
-        "BALANCE",
-        "POSITION",  # New column for position
-        "TRADE_PROFIT",  # New column for trade profit
-    ]
-    for col in cols_to_init:
-        data[col] = np.nan
+def _initialize_columns(n: int) -> dict[str, np.ndarray]:
+    """Initialize result arrays with NaN values"""
+    return {col: np.full(n, np.nan) for col in RESULT_COLUMNS}
 
 
 def _create_events(
@@ -189,80 +224,80 @@ def _create_events(
     prev_pc_low_col,
     prev_pc_high_col,
     prev_st_lower_col,
-):
-    """Create all event types for processing"""
-    events = []
-    last_idx = data.index[-1]
-
-    # Function to add events based on mask
-    def add_events(mask, event_type, price_func=None):
-        for idx in data.index[mask]:
-            event = {"index": idx, "type": event_type}
-            if price_func:
-                event["price"] = price_func(idx)
-            events.append(event)
-
-    # Add BUY events
-    buy_mask = (times > open_time) & (times < close_time) & data["open_condition"]
-    add_events(buy_mask, "BUY", lambda idx: data.loc[idx, prev_pc_low_col])
+) -> np.ndarray:
+    """
+    Create all event types for processing.
 
-    # Add IMPROVE events
-    add_events(data["improve_condition"], "IMPROVE")
+    Returns a structured array of (index, type, price) records, where index is
+    the row position. Records are grouped by type in processing order.
+    """
+    close = data["CLOSE"].to_numpy(dtype=np.float64)
+    last_idx = len(data) - 1
 
-    # Add SELL events
+    buy_mask = (times > open_time) & (times < close_time) & data["open_condition"]
     sell_mask = (times > open_time) & (times < stop_time) & data["close_condition"]
-    add_events(sell_mask, "SELL", lambda idx: data.loc[idx, prev_pc_high_col])
+    close_time_mask = times == stop_time
 
-    # Add STOP_LOSS events
-    stop_loss_mask = data["stop_loss_condition"]
-    add_events(
-        stop_loss_mask, "STOP_LOSS", lambda idx: data.loc[idx, prev_st_lower_col]
-    )
+    sources = [
+        (buy_mask, EVENT_BUY, data[prev_pc_low_col].to_numpy(dtype=np.float64)),
+        (data["improve_condition"], EVENT_IMPROVE, None),
+        (sell_mask, EVENT_SELL, data[prev_pc_high_col].to_numpy(dtype=np.float64)),
+        (
+            data["stop_loss_condition"],
+            EVENT_STOP_LOSS,
+            data[prev_st_lower_col].to_numpy(dtype=np.float64),
+        ),
+        (close_time_mask, EVENT_CLOSE_TIME, close),
+    ]
 
-    # Add time-based closing events
-    close_time_mask = times == stop_time
-    add_events(close_time_mask, "CLOSE_TIME", lambda idx: data.loc[idx, "CLOSE"])
+    indices = [np.flatnonzero(np.asarray(mask)) for mask, _, _ in sources]
+    total = sum(len(index) for index in indices) + 1  # + end-of-data closing event
+    events = np.empty(total, dtype=EVENT_DTYPE)
+
+    start = 0
+    for index, (_, event_type, prices) in zip(indices, sources):
+        end = start + len(index)
+        events["index"][start:end] = index
+        events["type"][start:end] = event_type
+        events["price"][start:end] = np.nan if prices is None else prices[index]
+        start = end
 
     # Add end-of-data closing event
-    events.append(
-        {
-            "index": last_idx,
-            "type": "CLOSE_END",
-            "price": data.loc[last_idx, "CLOSE"],
-        }
-    )
+    events[-1] = (last_idx, EVENT_CLOSE_END, close[last_idx])
 
     return events
 
 
-def _open_position(data, idx, price, position_prices):
+def _open_position(results, low, idx, price, position_prices):
     """Open a new position and return balance change and commission"""
     commission = round(price * 0.0005, 2)
-    data.loc[idx, "BUY_PRICE"] = price
+    results["BUY_PRICE"][idx] = price
 
     position_prices.append(price + commission)
-    best_price = data.loc[idx, "LOW"]
+    best_price = low[idx]
     delta_balance = -price - commission
     return 1, best_price, idx, delta_balance, commission
 
 
-def _close_position(data, idx, price, position, close_type):
+def _close_position(results, idx, price, position, close_type):
     """Close a position and return balance change and commission"""
     commission = round(price * 0.0005 * position, 2)
     if close_type == "STOP_LOSS":
-        data.loc[idx, "SL_PRICE"] = price
+        results["SL_PRICE"][idx] = price
     elif close_type == "CLOSE_TIME":
-        data.loc[idx, "CT_PRICE"] = price
+        results["CT_PRICE"][idx] = price
     elif close_type == "CLOSE_END":
-        data.loc[idx, "CE_PRICE"] = price
+        results["CE_PRICE"][idx] = price
     else:  # LONG_SELL
-        data.loc[idx, "SELL_PRICE"] = price
+        results["SELL_PRICE"][idx] = price
 
     delta_balance = price * position - commission
     return 0, [], 0, idx, delta_balance, commission
 
 
-def _try_improve_position(data, idx, position, position_prices, best_price):
+def _try_improve_position(
+    results, low, high, idx, position, position_prices, best_price
+):
     """Attempt to improve position and return total balance changes and commissions"""
     total_delta = 0
     total_commission = 0
@@ -271,8 +306,8 @@ def _try_improve_position(data, idx, position, position_prices, best_price):
     if position > 1:
         for prev_price in position_prices[:-1]:
             price_with_comm = round(prev_price + prev_price * 0.001, 2)
-            if data.loc[idx, "LOW"] <= price_with_comm <= data.loc[idx, "HIGH"]:
-                data.loc[idx, "SELL_PRICE"] = price_with_comm
+            if low[idx] <= price_with_comm <= high[idx]:
+                results["SELL_PRICE"][idx] = price_with_comm
                 commission_sell = round(price_with_comm * 0.0005, 2)
                 total_delta += price_with_comm - commission_sell
                 total_commission += commission_sell
@@ -280,14 +315,14 @@ def _try_improve_position(data, idx, position, position_prices, best_price):
                 position_prices.remove(prev_price)
                 break
 
-    if data.loc[idx, "LOW"] <= best_price <= data.loc[idx, "HIGH"]:
-        data.loc[idx, "BUY_PRICE"] = best_price
+    if low[idx] <= best_price <= high[idx]:
+        results["BUY_PRICE"][idx] = best_price
         commission_buy = round(best_price * 0.0005, 2)
         total_delta += -best_price - commission_buy
         total_commission += commission_buy
         position_prices.append(best_price)
         position += 1
-        best_price = data.loc[idx, "LOW"]
+        best_price = low[idx]
         last_event_index = idx
 
     return (
@@ -0,0 +1,217 @@
+"""
+Parameter sweep for the PriceChanelGrid strategy.
+
+Parameter sets are spread across a process pool. The OHLC history is put in
+shared memory once, every worker attaches to it instead of receiving a pickled
+DataFrame, and indicator columns are cached per worker for each distinct period.
+"""
+
+import itertools
+import math
+import os
+from multiprocessing import Pool, shared_memory
+import numpy as np
+import pandas as pd
+from myLib.indicators import (
+    join_indicators,
+    price_chanel_columns,
+    super_trend_columns,
+    super_trend_names,
+)
+from .calculate import calculate
+
+__all__ = ["optimize"]
+
+_SHARED_COLUMNS = ["DATE", "OPEN", "HIGH", "LOW", "CLOSE"]
+
+# State of a worker process, filled by _init_worker
+_worker: dict = {}
+
+
+def optimize(
+    data: pd.DataFrame,
+    pc_periods: list[int],
+    st_periods: list[int],
+    st_multipliers: list[float],
+    n_iter: int | None = None,
+    processes: int | None = None,
+    seed: int | None = None,
+) -> pd.DataFrame:
+    """
+    Backtests many indicator configurations and ranks them by final balance.
+
+    Args:
+        data: DataFrame with DATE, OPEN, HIGH, LOW and CLOSE columns
+        pc_periods: Price Channel periods to try
+        st_periods: SuperTrend periods to try
+        st_multipliers: SuperTrend multipliers to try
+        n_iter: Number of random parameter sets to draw from the grid,
+          None runs the full grid search
+        processes: Number of worker processes, defaults to the number of CPUs
+        seed: Seed for the random search
+
+    Returns:
+        pd.DataFrame: One row per parameter set with pc_period, st_period,
+          st_multiplier, balance, trades, commission and max_drawdown columns,
+          sorted from the best final balance to the worst
+    """
+    # 3 and 3.0 are one column name and one parameter set
+    params = list(
+        dict.fromkeys(itertools.product(pc_periods, st_periods, st_multipliers))
+    )
+    if n_iter is not None and n_iter < len(params):
+        rng = np.random.default_rng(seed)
+        chosen = rng.choice(len(params), size=n_iter, replace=False)
+        params = [params[i] for i in chosen]
+
+    # Neighbouring tasks share periods, so worker caches are hit more often
+    params.sort(key=lambda p: (p[1], p[0], p[2]))
+
+    processes = processes or os.cpu_count() or 1
+    blocks = _share_columns(data)
+    try:
+        with Pool(
+            processes=processes,
+            initializer=_init_worker,
+            initargs=(
+                {col: (shm.name, dtype) for col, (shm, dtype) in blocks.items()},
+                len(data),
+                sorted(set(st_multipliers)),
+            ),
+        ) as pool:
+            chunksize = max(1, math.ceil(len(params) / (4 * processes)))
+            rows = list(pool.imap_unordered(_run_params, params, chunksize=chunksize))
+    finally:
+        for shm, _ in blocks.values():
+            shm.close()
+            shm.unlink()
+
+    return (
+        pd.DataFrame(
+            rows,
+            columns=[
+                "pc_period",
+                "st_period",
+                "st_multiplier",
+                "balance",
+                "trades",
+                "commission",
+                "max_drawdown",
+            ],
+        )
+        .sort_values(
+            ["balance", "pc_period", "st_period", "st_multiplier"],
+            ascending=[False, True, True, True],
+        )
+        .reset_index(drop=True)
+    )
+
+
+def _share_columns(data: pd.DataFrame) -> dict:
+    """Copy OHLC and DATE columns to shared memory blocks"""
+    dates = pd.to_datetime(data["DATE"])
+    if dates.dt.tz is not None:
+        dates = dates.dt.tz_localize(None)  # keep the local trading time
+
+    arrays = {"DATE": dates.to_numpy(dtype="datetime64[ns]").view(np.int64)}
+    for col in _SHARED_COLUMNS[1:]:
+        arrays[col] = data[col].to_numpy(dtype=np.float64)
+
+    blocks = {}
+    try:
+        for col, values in arrays.items():
+            shm = shared_memory.SharedMemory(create=True, size=max(values.nbytes, 1))
+            blocks[col] = (shm, values.dtype.str)
+            np.ndarray(values.shape, dtype=values.dtype, buffer=shm.buf)[:] = values
+    except Exception:
+        for shm, _ in blocks.values():
+            shm.close()
+            shm.unlink()
+        raise
+    return blocks
+
+
+def _init_worker(blocks: dict, length: int, st_multipliers: list[float]) -> None:
+    """Attach the worker to the shared history"""
+    columns = {}
+    handles = []
+    for col, (name, dtype) in blocks.items():
+        shm = shared_memory.SharedMemory(name=name)
+        handles.append(shm)
+        columns[col] = np.ndarray(length, dtype=dtype, buffer=shm.buf)
+    columns["DATE"] = columns["DATE"].view("datetime64[ns]")
+
+    _worker["handles"] = handles  # keep the blocks mapped
+    _worker["base"] = pd.DataFrame(columns)
+    _worker["st_multipliers"] = st_multipliers
+    _worker["pc_cache"] = {}
+    _worker["st_cache"] = {}
+
+
+def _indicator_columns(pc_period: int, st_period: int) -> tuple[dict, dict]:
+    """Return cached indicator columns for the given periods"""
+    base = _worker["base"]
+
+    pc_cache = _worker["pc_cache"]
+    if pc_period not in pc_cache:
+        pc_cache[pc_period] = price_chanel_columns(base, pc_period)
+
+    st_cache = _worker["st_cache"]
+    if st_period not in st_cache:
+        config = [
+            {"period": st_period, "multiplier": multiplier}
+            for multiplier in _worker["st_multipliers"]
+        ]
+        st_cache[st_period] = super_trend_columns(base, config)
+
+    return pc_cache[pc_period], st_cache[st_period]
+
+
+def _run_params(params: tuple) -> tuple:
+    """Backtest one parameter set and return its metrics"""
+    pc_period, st_period, st_multiplier = params
+    pc_columns, st_columns = _indicator_columns(pc_period, st_period)
+
+    data = join_indicators(
+        _worker["base"],
+        pc_columns,
+        {col: st_columns[col] for col in super_trend_names(st_period, st_multiplier)},
+    )
+
+    result = calculate(
+        data,
+        [{"period": pc_period}, {"period": st_period, "multiplier": st_multiplier}],
+    )
+
+    balance = result["BALANCE"].dropna()
+    closed = _closed_trades(result)
+    # Break-even trades have no TRADE_PROFIT and leave the curve flat
+    trade_profit = result["TRADE_PROFIT"].dropna().to_numpy()
+
+    # Drawdown of the closed trades equity curve, starting from zero
+    equity = np.concatenate(([0.0], np.cumsum(trade_profit)))
+    max_drawdown = float(np.max(np.maximum.accumulate(equity) - equity))
+
+    return (
+        pc_period,
+        st_period,
+        st_multiplier,
+        float(balance.iloc[-1]) if len(balance) else 0.0,
+        int(np.count_nonzero(closed)),
+        float(np.nansum(result["COMMISSION"].to_numpy())),
+        round(max_drawdown, 2),
+    )
+
+
+def _closed_trades(result: pd.DataFrame) -> np.ndarray:
+    """
+    Mask of the bars where a trade was closed.
+
+    POSITION is written only on bars with events, a trade is closed where it
+    becomes 0 after a long position. A trade opened and closed on one bar has
+    no long POSITION before it, but a BUY_PRICE on that bar.
+    """
+    position = result["POSITION"]
+    before = position.ffill().shift(1, fill_value=0)
+    closed = (position == 0) & ((before > 0) | result["BUY_PRICE"].notna())
+    return closed.to_numpy()
@@ -1,4 +1,5 @@
 # УДАЛЕНО: импорт PriceChanelGridSignals
+from myLib.indicators import super_trend_names
 
 
 def plot_data(self) -> dict:
@@ -10,8 +11,7 @@ def plot_data(self) -> dict:
     pc_high = f"PC_{pc_period}_HIGH"
     pc_low = f"PC_{pc_period}_LOW"
     pc_mid = f"PC_{pc_period}_MID"
-    st_upper = f"ST_UPPER_{st_period}_{st_multiplier}"
-    st_lower = f"ST_LOWER_{st_period}_{st_multiplier}"
+    st_upper, st_lower = super_trend_names(st_period, st_multiplier)
 
     return {
         "legend": "PriceChanelGrid",
@@ -0,0 +1,26 @@
+import pandas as pd
+from .run import run
+
+
+async def run_async(self, data: pd.DataFrame, broker) -> pd.DataFrame:
+    """
+    Async version of run for one tick.
+
+    Portfolio, orders and operations are downloaded concurrently, then the
+    decision logic runs on the broker thread pool with the prefetched data,
+    so ticks of many instruments can be gathered in one event loop:
+
+        await asyncio.gather(*(s.run_async(df, broker) for s, df in ticks))
+
+    Args:
+        data: Candles with indicator columns, as for run
+        broker: AsyncTinkoff wrapping the broker of the strategy
+    """
+    prefetched = await broker.prefetch(self._figi, self._from_date)
+
+    sync_broker = self._broker
+    self._broker = prefetched
+    try:
+        return await broker.run_sync(run, self, data)
+    finally:
+        self._broker = sync_broker
@@ -0,0 +1,79 @@
+import asyncio
+import logging
+from collections import deque
+from typing import AsyncIterable, Callable
+import numpy as np
+import pandas as pd
+from myLib.indicators import PriceChanelStream, SuperTrendStream
+
+logger = logging.getLogger("PriceChanelGrid")
+
+
+async def run_stream(
+    self,
+    bars: AsyncIterable[dict],
+    history: pd.DataFrame | None = None,
+    window: int = 100,
+    on_error: Callable[[dict, Exception], None] | None = None,
+) -> None:
+    """
+    Runs the strategy on every completed bar of a live stream.
+
+    Indicators are updated incrementally, so a new bar costs O(1) instead of
+    downloading and recalculating the whole history. run() works with pandas
+    and the broker API, it is called in a worker thread to keep the event
+    loop responsive. Bars before the indicators are warmed up only update
+    them. A bar that fails is logged and passed to on_error, the stream goes
+    on with the next bar.
+
+    Args:
+        bars: Async iterable of completed candles with DATE, OPEN, HIGH, LOW,
+          CLOSE and VOLUME keys, for example AlorDownloader.stream_bars(...)
+        history: Completed candles before the stream, used to warm up the indicators
+        window: Number of last candles passed to run
+        on_error: Called with the bar and the exception when a bar fails,
+          raise from it to stop the stream
+    """
+    pc_period, st_period, st_multiplier = self.get_indicators_params()
+    pc = PriceChanelStream(pc_period)
+    st = SuperTrendStream(st_period, st_multiplier)
+    rows = deque(maxlen=window)
+    # The channel has a value from bar pc_period, SuperTrend from bar st_period + 1
+    warm_up = max(pc_period, st_period + 1)
+    added = 0
+
+    def add(candle) -> None:
+        nonlocal added
+        # Convert first, a malformed bar must not reach the indicators
+        row = {
+            "DATE": candle["DATE"],
+            "OPEN": float(candle["OPEN"]),
+            "HIGH": float(candle["HIGH"]),
+            "LOW": float(candle["LOW"]),
+            "CLOSE": float(candle["CLOSE"]),
+            "VOLUME": candle["VOLUME"],
+        }
+        row.update(pc.update(row))
+        row.update(st.update(row))
+        rows.append(row)
+        added += 1
+
+    def tick(window_rows: list[dict]) -> None:
+        # run() reads the last completed candle at iloc[-2], the empty
+        # last row stands for the candle that is forming now
+        self.run(pd.DataFrame(window_rows + [{"DATE": np.nan}]))
+
+    if history is not None:
+        for candle in history.to_dict("records"):
+            add(candle)
+
+    async for candle in bars:
+        try:
+            add(candle)
+            if added < warm_up:
+                continue
+            await asyncio.to_thread(tick, list(rows))
+        except Exception as error:
+            logger.exception("Bar %s failed", candle.get("DATE"))
+            if on_error is not None:
+                on_error(candle, error)
@@ -1,3 +1,13 @@
+from myLib.brokers.types import (
+    CENT,
+    nanos_to_price,
+    price_to_nanos,
+    quotation_to_nanos,
+    round_nanos,
+)
+from myLib.indicators import super_trend_names
+
+
 def get_open_position(self):
     portfolio = self._broker.get_portfolio()
     long_position = None
@@ -18,8 +28,7 @@ def get_indicator_name(self):
     pc_period, st_period, st_multiplier = self.get_indicators_params()
 
     # Indicator name constants
-    ST_LOWER = f"ST_LOWER_{st_period}_{st_multiplier}"
-    ST_UPPER = f"ST_UPPER_{st_period}_{st_multiplier}"
+    ST_UPPER, ST_LOWER = super_trend_names(st_period, st_multiplier)
     PC_LOW = f"PC_{pc_period}_LOW"
     PC_HIGH = f"PC_{pc_period}_HIGH"
 
@@ -36,8 +45,9 @@ def replace_order_if_needed(self, order, new_price):
     """Replace order if price has changed"""
     if order is None:
         return None
-    current_price = extract_price_from_dict(order["initialSecurityPrice"])
-    if round(current_price, 2) != round(new_price, 2):
+    # Compare in whole cents of fixed-point prices, exact unlike rounded floats
+    current_price = round_nanos(quotation_to_nanos(order["initialSecurityPrice"]), CENT)
+    if current_price != price_to_nanos(new_price, CENT):
         return self._broker.replace_order(
             order_id=order["orderId"],
             instrument_id=order["instrumentUid"],
@@ -48,4 +58,4 @@ def replace_order_if_needed(self, order, new_price):
 
 
 def extract_price_from_dict(value: dict) -> float:
-    return round(float(value["units"]) + float(value["nano"]) / 1e9, 2)
+    return nanos_to_price(round_nanos(quotation_to_nanos(value), CENT))
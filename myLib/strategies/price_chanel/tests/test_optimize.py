@@ -0,0 +1,50 @@
+"""Metrics and parameter sets of the PriceChanelGrid parameter sweep."""
+
+import numpy as np
+import pandas as pd
+import pytest
+from myLib.indicators import price_chanel, super_trend
+from myLib.strategies.price_chanel.methods.calculate import calculate
+from myLib.strategies.price_chanel.methods.optimize import optimize
+
+
+def random_candles(n: int, seed: int) -> pd.DataFrame:
+    """Random walk 5 minute candles on a 0.1 price step"""
+    rng = np.random.default_rng(seed)
+    close = np.round(100 + np.cumsum(rng.normal(0, 0.3, n)), 1)
+    return pd.DataFrame(
+        {
+            "DATE": pd.date_range("2025-01-06 07:00", periods=n, freq="5min"),
+            "OPEN": close,
+            "HIGH": close + 0.2,
+            "LOW": close - 0.2,
+            "CLOSE": close,
+        }
+    )
+
+
+def opened_trades(df: pd.DataFrame, pc_period: int, st_period: int, multiplier) -> int:
+    """Number of trades opened from a flat position, each is closed by the end of data"""
+    data = price_chanel(
+        super_trend(df, [{"period": st_period, "multiplier": multiplier}]), pc_period
+    )
+    result = calculate(
+        data, [{"period": pc_period}, {"period": st_period, "multiplier": multiplier}]
+    )
+    before = result["POSITION"].ffill().shift(1, fill_value=0)
+    return int(((before == 0) & result["BUY_PRICE"].notna()).sum())
+
+
+@pytest.mark.parametrize("seed", [0, 9])  # seed 9 has a break-even trade
+def test_trades_count_every_closed_trade(seed):
+    df = random_candles(3000, seed)
+    result = optimize(df, [20, 30], [10], [3], processes=1)
+    for row in result.itertuples():
+        assert row.trades == opened_trades(df, row.pc_period, row.st_period, 3)
+
+
+def test_equal_multipliers_are_one_parameter_set():
+    df = random_candles(1000, 2)
+    result = optimize(df, [20, 20], [10], [3, 3.0, 1.5], processes=1)
+    assert len(result) == 2
+    assert sorted(result["st_multiplier"]) == [1.5, 3]
@@ -7,8 +7,12 @@ strategy analysis on financial market data.
 """
 
 from abc import ABC, abstractmethod
-import pandas as pd
-from .types.plot_data import PlotDataTypedDict
+from typing import TYPE_CHECKING
+
+# Annotations only: the package imports this module without pandas
+if TYPE_CHECKING:
+    import pandas as pd
+    from .types.plot_data import PlotDataTypedDict
 
 __all__ = ["StrategyAbstractClass"]
 
@@ -23,9 +27,9 @@ class StrategyAbstractClass(ABC):
     """
 
     @abstractmethod
-    def run(self, previous: pd.DataFrame, current: pd.DataFrame) -> None:
+    def run(self, previous: "pd.DataFrame", current: "pd.DataFrame") -> None:
         pass
 
     @abstractmethod
-    def get_plot_data(self) -> PlotDataTypedDict:
+    def get_plot_data(self) -> "PlotDataTypedDict":
         pass
@@ -1,5 +1,9 @@
-from typing import TypedDict, List, Literal
-from myLib.strategies.withDoubleTrend.types import DoubleTrendSignals
+from typing import TYPE_CHECKING, TypedDict, List, Literal
+
+# Annotations only: importing withDoubleTrend.types runs the package of the
+# strategy, which imports this module
+if TYPE_CHECKING:
+    from myLib.strategies.withDoubleTrend.types import DoubleTrendSignals
 
 
 class PlotConfig(TypedDict):
@@ -16,7 +20,7 @@ class ActionConfig(TypedDict):
 
 
 class SignalConfig(TypedDict):
-    name: DoubleTrendSignals
+    name: "DoubleTrendSignals"
     price_col: str
     offset: int
     color: str
@@ -2,6 +2,7 @@ import pandas as pd
 from myLib.brokers import BrokerAbstractClass
 from ..strategy import StrategyAbstractClass
 from ..types.plot_data import PlotDataTypedDict
+from .methods.calculate import calculate
 from .methods.manage_long import manage_long
 from .methods.plot_data import plot_data
 from .methods.manage_long_sl import manage_long_sl
@@ -43,6 +44,10 @@ class WithDoubleTrend(StrategyAbstractClass):
             orders=orders,
         )
 
+    def calculate(self, data: pd.DataFrame) -> pd.DataFrame:
+        """Backtests the strategy on the whole data at once, see methods/calculate.py"""
+        return calculate(data)
+
     def get_plot_data(self) -> PlotDataTypedDict:
         """Returns data for visualization"""
         return plot_data()
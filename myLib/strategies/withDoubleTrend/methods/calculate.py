@@ -0,0 +1,310 @@
+"""
+Batch backtest of the WithDoubleTrend strategy.
+
+Gives the same result as running WithDoubleTrend bar by bar against the
+DemoBroker (myLib.brokers.demo.backtest), without order dicts or broker
+calls: entry conditions, take profit levels and exit signals are computed
+as whole columns and the fills are resolved in one pass over the bars.
+"""
+
+import numpy as np
+import pandas as pd
+from ..types import DoubleTrendSignals
+
+__all__ = ["calculate", "RESULT_COLUMNS"]
+
+RESULT_COLUMNS = ["SIGNAL", "BUY_PRICE", "TAKE_PROFIT", "STOP_LOSS", "SELL_PRICE"]
+
+FAST_UP = "ST 10 3 UP"
+FAST_LOW = "ST 10 3 LOW"
+SLOW_UP = "ST 20 5 UP"
+SLOW_LOW = "ST 20 5 LOW"
+EMA = "EMA 50"
+
+# Signal codes of the SIGNAL column
+SIGNAL_NONE = 0
+SIGNAL_BUY = 1
+SIGNAL_TP = 2
+SIGNAL_SL = 3
+SIGNAL_STOP_MARKET = 4
+
+SIGNALS = {
+    SIGNAL_BUY: DoubleTrendSignals.LONG_BUY,
+    SIGNAL_TP: DoubleTrendSignals.LONG_TP,
+    SIGNAL_SL: DoubleTrendSignals.LONG_SL,
+    SIGNAL_STOP_MARKET: DoubleTrendSignals.STOP_MARKET,
+}
+
+# Orders of the strategy, at most one of each is active
+ORDER_BUY = 0
+ORDER_TP = 1
+ORDER_SL = 2
+ORDER_MARKET_SELL = 3
+
+
+def _double_trend_loop(
+    low: np.ndarray,
+    high: np.ndarray,
+    close: np.ndarray,
+    take_profit_level: np.ndarray,
+    fast_low: np.ndarray,
+    entry_price: np.ndarray,
+    entry_stop_loss: np.ndarray,
+    exit_condition: np.ndarray,
+):
+    """
+    Replays the broker fills and the strategy decisions bar by bar.
+
+    Every bar the broker first fills the orders crossed by it in creation
+    order, then the strategy updates take profit, stop loss and entry orders,
+    exactly like DemoBroker.run and WithDoubleTrend.run.
+
+    Parameters:
+        low, high, close: Bar prices
+        take_profit_level: EMA 50 + 1.5
+        fast_low: ST 10 3 LOW, the stop loss level
+        entry_price: Price of the buy order placed on the bar, NaN without an entry signal
+        entry_stop_loss: round(entry_price * 1.0001, 2), the break-even stop loss
+        exit_condition: Both trends are upper or it is the closing time
+
+    Returns:
+        Tuple of (signal, buy_price, take_profit, stop_loss, sell_price, error_index),
+        error_index is the bar where the position became negative or -1
+    """
+    n = len(low)
+    signal = np.zeros(n, dtype=np.int8)
+    buy_price = np.full(n, np.nan)
+    take_profit = np.full(n, np.nan)
+    stop_loss = np.full(n, np.nan)
+    sell_price = np.full(n, np.nan)
+
+    # Active orders: flag, creation sequence, price and size by order kind
+    active = np.zeros(4, dtype=np.bool_)
+    sequence = np.zeros(4, dtype=np.int64)
+    price = np.full(4, np.nan)
+    quantity = np.zeros(4, dtype=np.int64)
+    next_sequence = 0
+    buy_stop_loss = np.nan  # break-even stop loss of the active buy order
+
+    size = 0
+    average_price = 0.0
+    average_stop_loss = np.nan  # round(average_price * 1.0001, 2)
+    order = np.empty(4, dtype=np.int64)
+
+    for i in range(n):
+        # Broker: take profit and stop loss levels resting at the start of the bar
+        if active[ORDER_TP]:
+            take_profit[i] = price[ORDER_TP]
+        if active[ORDER_SL]:
+            stop_loss[i] = price[ORDER_SL]
+
+        # Broker: crossed orders sorted by creation sequence
+        count = 0
+        for kind in range(4):
+            if not active[kind]:
+                continue
+            if kind != ORDER_MARKET_SELL and not (
+                low[i] <= price[kind] and price[kind] <= high[i]
+            ):
+                continue
+            position = count
+            while position > 0 and sequence[order[position - 1]] > sequence[kind]:
+                order[position] = order[position - 1]
+                position -= 1
+            order[position] = kind
+            count += 1
+
+        for position in range(count):
+            kind = order[position]
+            active[kind] = False
+            if kind == ORDER_BUY:
+                fill_price = price[kind]
+                delta = quantity[kind]
+                signal[i] = SIGNAL_BUY
+                buy_price[i] = fill_price
+            else:
+                fill_price = close[i] if kind == ORDER_MARKET_SELL else price[kind]
+                delta = -quantity[kind]
+                if kind == ORDER_TP:
+                    signal[i] = SIGNAL_TP
+                elif kind == ORDER_SL:
+                    signal[i] = SIGNAL_SL
+                else:
+                    signal[i] = SIGNAL_STOP_MARKET
+                sell_price[i] = fill_price
+
+            # Positions.trade
+            new_size = size + delta
+            if size == 0:
+                average_price = fill_price
+                average_stop_loss = (
+                    buy_stop_loss
+                    if kind == ORDER_BUY
+                    else np.round(fill_price * 1.0001, 2)
+                )
+            elif new_size == 0:
+                average_price = 0.0
+                average_stop_loss = np.nan
+            elif (size > 0) == (delta > 0):
+                # Not reached by this strategy: buys are one lot placed when flat
+                average_price = (size * average_price + delta * fill_price) / new_size
+                average_stop_loss = np.round(average_price * 1.0001, 2)
+            elif (size > 0) != (new_size > 0):
+                average_price = fill_price
+                average_stop_loss = np.round(fill_price * 1.0001, 2)
+            size = new_size
+
+        if i == 0:
+            continue
+
+        # Strategy: manage_long_tp
+        if size == 0:
+            active[ORDER_TP] = False
+        else:
+            level = take_profit_level[i]
+            from_average = average_price + 1.5
+            target = from_average if from_average > level else level
+            if np.isnan(target):
+                active[ORDER_TP] = False
+            elif not active[ORDER_TP] or price[ORDER_TP] != target:
+                active[ORDER_TP] = True
+                sequence[ORDER_TP] = next_sequence
+                next_sequence += 1
+                price[ORDER_TP] = target
+                quantity[ORDER_TP] = size
+
+        # Strategy: manage_long_sl
+        if size == 0:
+            active[ORDER_SL] = False
+        else:
+            target = fast_low[i]
+            if average_price * 1.0001 < low[i]:
+                target = average_stop_loss
+            if np.isnan(target):
+                active[ORDER_SL] = False
+            elif not active[ORDER_SL] or price[ORDER_SL] != target:
+                active[ORDER_SL] = True
+                sequence[ORDER_SL] = next_sequence
+                next_sequence += 1
+                price[ORDER_SL] = target
+                quantity[ORDER_SL] = size
+
+        # Strategy: manage_long
+        if size < 0:
+            return signal, buy_price, take_profit, stop_loss, sell_price, i
+
+        if size == 0:
+            if active[ORDER_BUY]:
+                if np.isnan(fast_low[i]):
+                    active[ORDER_BUY] = False
+            elif not np.isnan(entry_price[i]):
+                active[ORDER_BUY] = True
+                sequence[ORDER_BUY] = next_sequence
+                next_sequence += 1
+                price[ORDER_BUY] = entry_price[i]
+                quantity[ORDER_BUY] = 1
+                buy_stop_loss = entry_stop_loss[i]
+            continue
+
+        active[ORDER_BUY] = False
+        if exit_condition[i]:
+            active[:] = False
+            active[ORDER_MARKET_SELL] = True
+            sequence[ORDER_MARKET_SELL] = next_sequence
+            next_sequence += 1
+            quantity[ORDER_MARKET_SELL] = size
+
+    return signal, buy_price, take_profit, stop_loss, sell_price, -1
+
+
+# Resolved by the first calculate() call, importing numba takes longer than
+# the whole backtest of a short history
+_kernel = None
+
+
+def _double_trend_kernel():
+    """Returns the loop compiled by numba when it is installed, otherwise the pure-Python loop"""
+    global _kernel
+    if _kernel is None:
+        try:
+            from numba import njit
+        except ImportError:  # numba is optional, the pure-Python loop is used instead
+            _kernel = _double_trend_loop
+        else:
+            _kernel = njit(cache=True, nogil=True)(_double_trend_loop)
+    return _kernel
+
+
+def calculate(data: pd.DataFrame) -> pd.DataFrame:
+    """
+    Backtests the strategy on prepared data.
+
+    Args:
+        data: Candles with DATE, LOW, HIGH, CLOSE and the ST 10 3 UP/LOW,
+          ST 20 5 UP/LOW and EMA 50 columns
+
+    Returns:
+        pd.DataFrame: data with a positional index and the SIGNAL, BUY_PRICE,
+          TAKE_PROFIT, STOP_LOSS and SELL_PRICE columns of the orders log
+
+    Raises:
+        ValueError: If the position becomes negative, like the bar by bar run
+    """
+    low = data["LOW"].to_numpy(dtype=np.float64)
+    high = data["HIGH"].to_numpy(dtype=np.float64)
+    close = data["CLOSE"].to_numpy(dtype=np.float64)
+    fast_low = data[FAST_LOW].to_numpy(dtype=np.float64)
+    slow_low = data[SLOW_LOW].to_numpy(dtype=np.float64)
+    prev_fast_up = data[FAST_UP].shift(1).to_numpy(dtype=np.float64)
+    prev_slow_up = data[SLOW_UP].shift(1).to_numpy(dtype=np.float64)
+
+    # Entry conditions of manage_long, condition_1 has priority
+    lower_trends = ~np.isnan(fast_low) & ~np.isnan(slow_low)
+    condition_1 = lower_trends & ~np.isnan(prev_slow_up)
+    condition_2 = lower_trends & ~np.isnan(prev_fast_up)
+    entry_price = np.where(
+        condition_1, prev_slow_up, np.where(condition_2, prev_fast_up, np.nan)
+    )
+
+    # Break-even stop loss of every possible entry, rounded like manage_long_sl
+    entry_stop_loss = np.full(len(data), np.nan)
+    entries = np.flatnonzero(~np.isnan(entry_price))
+    entry_stop_loss[entries] = [
+        round(value * 1.0001, 2) for value in entry_price[entries].tolist()
+    ]
+
+    # Exit condition of manage_long: no lower trend or closing time
+    dates = pd.to_datetime(data["DATE"])
+    is_close_time = (
+        (dates.dt.hour == 23)
+        & (dates.dt.minute == 40)
+        & (dates.dt.second == 0)
+        & (dates.dt.microsecond == 0)
+    ).to_numpy()
+    exit_condition = (np.isnan(fast_low) & np.isnan(slow_low)) | is_close_time
+
+    kernel = _double_trend_kernel()
+    signal, buy_price, take_profit, stop_loss, sell_price, error_index = kernel(
+        low,
+        high,
+        close,
+        data[EMA].to_numpy(dtype=np.float64) + 1.5,
+        fast_low,
+        entry_price,
+        entry_stop_loss,
+        exit_condition,
+    )
+    if error_index >= 0:
+        raise ValueError("Position size cannot be negative.")
+
+    signals = np.full(len(data), np.nan, dtype=object)
+    for code, name in SIGNALS.items():
+        signals[signal == code] = name
+
+    result = data.reset_index(drop=True).drop(columns=RESULT_COLUMNS, errors="ignore")
+    result["SIGNAL"] = signals
+    result["BUY_PRICE"] = buy_price
+    result["TAKE_PROFIT"] = take_profit
+    result["STOP_LOSS"] = stop_loss
+    result["SELL_PRICE"] = sell_price
+    return result
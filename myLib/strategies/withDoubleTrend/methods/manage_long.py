@@ -1,4 +1,4 @@
-from datetime import datetime
+from datetime import datetime, time
 import pandas as pd
 from myLib.brokers import (
     BrokerAbstractClass,
@@ -8,6 +8,16 @@ from myLib.brokers import (
 )
 from myLib.strategies.withDoubleTrend.types import DoubleTrendSignals
 
+OPEN_TIME = time(9, 30)
+CLOSE_TIME = time(23, 40)
+
+
+def bar_time(value) -> time:
+    """Returns the time of a bar DATE, without parsing it again if it is a datetime"""
+    if isinstance(value, datetime):
+        return value.time()
+    return pd.to_datetime(value).time()
+
 
 def manage_long(
     broker: BrokerAbstractClass,
@@ -42,12 +52,9 @@ def manage_long(
         and pd.notna(prev.get("ST 10 3 UP"))
     )
 
-    is_close_time = (
-        pd.to_datetime(curr.get("DATE")).time() == pd.Timestamp("23:40:00").time()
-    )
-    is_open_time = (
-        pd.to_datetime(curr.get("DATE")).time() == pd.Timestamp("09:30:00").time()
-    )
+    current_time = bar_time(curr.get("DATE"))
+    is_close_time = current_time == CLOSE_TIME
+    is_open_time = current_time == OPEN_TIME
 
     def create_buy_order(price: float) -> None:
         broker.create_order(
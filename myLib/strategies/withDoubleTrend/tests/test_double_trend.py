@@ -0,0 +1,96 @@
+"""WithDoubleTrend.calculate against the bar by bar run on the DemoBroker."""
+
+import importlib
+import numpy as np
+import pandas as pd
+import pytest
+import talib
+from myLib.brokers.demo import DemoBroker
+from myLib.brokers.demo.backtest import backtest
+from myLib.indicators import super_trend_columns
+from myLib.strategies.withDoubleTrend import WithDoubleTrend
+
+calculate_module = importlib.import_module(
+    "myLib.strategies.withDoubleTrend.methods.calculate"
+)
+
+
+def random_candles(n: int, seed: int) -> pd.DataFrame:
+    """5-minute random walk candles around the clock with the strategy indicators"""
+    rng = np.random.default_rng(seed)
+    close = 100 + np.cumsum(rng.normal(0, 0.2, n))
+    df = pd.DataFrame(
+        {
+            "DATE": pd.date_range("2024-01-01 07:00", periods=n, freq="5min").strftime(
+                "%Y-%m-%dT%H:%M:%SZ"
+            ),
+            "OPEN": np.round(close + rng.normal(0, 0.1, n), 2),
+            "HIGH": np.round(close + rng.random(n) * 0.5, 2),
+            "LOW": np.round(close - rng.random(n) * 0.5, 2),
+            "CLOSE": np.round(close, 2),
+            "VOLUME": rng.integers(1, 1000, n),
+        }
+    )
+    columns = super_trend_columns(
+        df, [{"period": 10, "multiplier": 3}, {"period": 20, "multiplier": 5}]
+    )
+    df["ST 10 3 UP"] = columns["ST_UPPER_10_3"]
+    df["ST 10 3 LOW"] = columns["ST_LOWER_10_3"]
+    df["ST 20 5 UP"] = columns["ST_UPPER_20_5"]
+    df["ST 20 5 LOW"] = columns["ST_LOWER_20_5"]
+    df["EMA 50"] = np.round(talib.EMA(df["CLOSE"].to_numpy(dtype=float), 50), 2)
+    return df
+
+
+def bar_by_bar(df: pd.DataFrame) -> pd.DataFrame:
+    broker = DemoBroker()
+    return backtest(WithDoubleTrend(broker), broker, df.copy())
+
+
+def assert_same_log(result: pd.DataFrame, reference: pd.DataFrame) -> None:
+    for col in calculate_module.RESULT_COLUMNS:
+        if col not in reference:  # never logged by the broker
+            assert result[col].isna().all(), col
+            continue
+        expected = reference[col].astype(result[col].dtype)
+        pd.testing.assert_series_equal(result[col], expected, check_names=False)
+
+
+@pytest.fixture(params=["numba", "python"])
+def kernel(request, monkeypatch):
+    """Runs calculate with the numba kernel or with the pure-Python loop"""
+    if request.param == "python":
+        loop = calculate_module._double_trend_loop
+    else:
+        pytest.importorskip("numba")
+        monkeypatch.setattr(calculate_module, "_kernel", None)
+        loop = calculate_module._double_trend_kernel()
+        assert loop is not calculate_module._double_trend_loop
+    monkeypatch.setattr(calculate_module, "_kernel", loop)
+    return request.param
+
+
+@pytest.mark.parametrize("seed", [3, 4, 5])
+def test_calculate_matches_bar_by_bar(kernel, seed):
+    df = random_candles(5000, seed)
+    reference = bar_by_bar(df)
+    result = WithDoubleTrend(DemoBroker()).calculate(df)
+
+    assert_same_log(result, reference)
+    # Every kind of fill is covered
+    signals = set(result["SIGNAL"].dropna().map(str))
+    assert {
+        str(signal) for signal in calculate_module.SIGNALS.values()
+    } <= signals, signals
+
+
+def test_negative_position_raises_like_bar_by_bar(kernel):
+    # Wide bars cross the take profit and the stop loss on the same bar
+    df = random_candles(5000, 7)
+    df["HIGH"] += 1.5
+    df["LOW"] -= 1.5
+
+    with pytest.raises(ValueError, match="Position size cannot be negative"):
+        bar_by_bar(df)
+    with pytest.raises(ValueError, match="Position size cannot be negative"):
+        WithDoubleTrend(DemoBroker()).calculate(df)
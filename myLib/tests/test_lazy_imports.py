@@ -0,0 +1,53 @@
+"""Importing the packages must not load heavy dependencies or do I/O."""
+
+import json
+import subprocess
+import sys
+from pathlib import Path
+import pytest
+
+ROOT = Path(__file__).resolve().parents[2]
+
+HEAVY_MODULES = ["pandas", "numba", "talib", "websockets", "requests", "dotenv"]
+
+
+def loaded_after(statement: str) -> list[str]:
+    """Runs the import in a fresh interpreter, returns the heavy modules it loaded"""
+    code = (
+        "import json, sys\n"
+        f"{statement}\n"
+        f"print(json.dumps([m for m in {HEAVY_MODULES!r} if m in sys.modules]))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(result.stdout)
+
+
+@pytest.mark.parametrize(
+    "statement",
+    [
+        "import myLib",
+        "import myLib.brokers",
+        "from myLib.brokers import BrokerAbstractClass, OrderType",
+        "import myLib.strategies",
+        "from myLib.strategies import StrategyAbstractClass, PlotDataTypedDict",
+    ],
+)
+def test_import_loads_no_heavy_modules(statement):
+    assert loaded_after(statement) == []
+
+
+def test_strategies_are_imported_on_first_access():
+    import myLib.strategies as strategies
+    from myLib.strategies.withDoubleTrend import WithDoubleTrend
+
+    assert "WithDoubleTrend" in dir(strategies)
+    assert strategies.WithDoubleTrend is WithDoubleTrend
+    assert vars(strategies)["WithDoubleTrend"] is WithDoubleTrend  # cached
+    with pytest.raises(AttributeError):
+        strategies.Missing
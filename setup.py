@@ -23,6 +23,9 @@ setup(
         "urllib3==2.3.0",
         "websockets==15.0.1",
     ],
+    extras_require={
+        "fast": ["numba==0.61.2"],
+    },
     python_requires=">=3.13.2",
 )
 